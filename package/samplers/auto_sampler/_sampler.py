@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from collections.abc import Sequence
+import os
 import threading
+import types
 from typing import Any
 from typing import TYPE_CHECKING
 
@@ -18,6 +20,7 @@ from optuna.samplers._base import _process_constraints_after_trial
 from optuna.samplers._lazy_random_state import LazyRandomState
 from optuna.search_space import IntersectionSearchSpace
 from optuna.trial import TrialState
+import optunahub
 
 
 if TYPE_CHECKING:
@@ -50,6 +53,57 @@ class ThreadLocalSampler(threading.local):
     sampler: BaseSampler | None = None
 
 
+def _load_simple() -> types.ModuleType:
+    # ``samplers/simple`` provides ``TrialCursor``. It is loaded from the registry this package is
+    # loaded from if it is there, e.g., in a clone of the registry.
+    registry_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if os.path.isfile(os.path.join(registry_root, "samplers", "simple", "__init__.py")):
+        return optunahub.load_local_module("samplers/simple", registry_root=registry_root)
+    return optunahub.load_module("samplers/simple")
+
+
+TrialCursor = _load_simple().TrialCursor
+
+
+class _IncrementalSearchSpaceTracker:
+    """Running statistics of a study that are used to determine the sampler.
+
+    Every quantity is updated only with the trials finished since the last call, so that each
+    finished trial is counted exactly once.
+    """
+
+    def __init__(self) -> None:
+        self._cursor = TrialCursor()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._param_key: set[str] | None = None
+        self._search_space_calculator = IntersectionSearchSpace()
+        self.n_complete_trials = 0
+        self.has_conditional_param = False
+
+    def update(self, study: Study) -> None:
+        finished_trials, restarted = self._cursor.update(study)
+        if restarted:
+            self._reset()
+
+        for trial in finished_trials:
+            if trial.state == TrialState.COMPLETE:
+                self.n_complete_trials += 1
+            elif trial.state != TrialState.PRUNED:
+                continue
+
+            if self.has_conditional_param:
+                continue
+            if self._param_key is None:
+                self._param_key = set(trial.params)
+            elif self._param_key != set(trial.params):
+                self.has_conditional_param = True
+
+    def calculate_search_space(self, study: Study) -> dict[str, BaseDistribution]:
+        return self._search_space_calculator.calculate(study)
+
+
 class AutoSampler(BaseSampler):
     _N_COMPLETE_TRIALS_FOR_CMAES = 250
 
@@ -103,15 +157,19 @@ class AutoSampler(BaseSampler):
         self._rng = LazyRandomState(seed)
         self._thread_local_sampler = ThreadLocalSampler()
         self._constraints_func = constraints_func
+        self._tracker = _IncrementalSearchSpaceTracker()
+        self._tracker_lock = threading.Lock()
 
     def __getstate__(self) -> dict[Any, Any]:
         state = self.__dict__.copy()
         del state["_thread_local_sampler"]
+        del state["_tracker_lock"]
         return state
 
     def __setstate__(self, state: dict[Any, Any]) -> None:
         self.__dict__.update(state)
         self._thread_local_sampler = ThreadLocalSampler()
+        self._tracker_lock = threading.Lock()
 
     @property
     def _sampler(self) -> BaseSampler:
@@ -133,14 +191,8 @@ class AutoSampler(BaseSampler):
         self._sampler.reseed_rng()
 
     def _include_conditional_param(self, study: Study) -> bool:
-        trials = study._get_trials(
-            deepcopy=False, states=(TrialState.COMPLETE, TrialState.PRUNED), use_cache=True
-        )
-        if len(trials) == 0:
-            return False
-
-        param_key = set(trials[0].params)
-        return any(param_key != set(t.params) for t in trials)
+        # NOTE: ``self._tracker`` is already updated in ``before_trial``.
+        return self._tracker.has_conditional_param
 
     def _determine_multi_objective_sampler(
         self, study: Study, trial: FrozenTrial, search_space: dict[str, BaseDistribution]
@@ -174,10 +226,7 @@ class AutoSampler(BaseSampler):
                 constant_liar=True,
             )
 
-        complete_trials = study._get_trials(
-            deepcopy=False, states=(TrialState.COMPLETE,), use_cache=True
-        )
-        if len(complete_trials) < self._N_COMPLETE_TRIALS_FOR_CMAES:
+        if self._tracker.n_complete_trials < self._N_COMPLETE_TRIALS_FOR_CMAES:
             # Use ``GPSampler`` if search space is numerical and
             # len(complete_trials) < _N_COMPLETE_TRIALS_FOR_CMAES.
             if not isinstance(self._sampler, GPSampler):
@@ -187,6 +236,9 @@ class AutoSampler(BaseSampler):
                 # Use ``CmaEsSampler`` if search space is numerical and
                 # len(complete_trials) > _N_COMPLETE_TRIALS_FOR_CMAES.
                 # Warm start CMA-ES with the first _N_COMPLETE_TRIALS_FOR_CMAES complete trials.
+                complete_trials = study._get_trials(
+                    deepcopy=False, states=(TrialState.COMPLETE,), use_cache=True
+                )
                 complete_trials.sort(key=lambda trial: trial.datetime_complete)
                 warm_start_trials = complete_trials[: self._N_COMPLETE_TRIALS_FOR_CMAES]
                 return CmaEsSampler(
@@ -234,12 +286,11 @@ class AutoSampler(BaseSampler):
         # NOTE(nabenabe): Sampler must be updated in this method. If, for example, it is updated in
         # infer_relative_search_space, the sampler for before_trial and that for sample_relative,
         # after_trial might be different, meaning that the sampling routine could be incompatible.
-        if (
-            len(study._get_trials(deepcopy=False, states=(TrialState.COMPLETE,), use_cache=True))
-            != 0
-        ):
-            search_space = IntersectionSearchSpace().calculate(study)
-            self._sampler = self._determine_sampler(study, trial, search_space)
+        with self._tracker_lock:
+            self._tracker.update(study)
+            if self._tracker.n_complete_trials != 0:
+                search_space = self._tracker.calculate_search_space(study)
+                self._sampler = self._determine_sampler(study, trial, search_space)
 
         sampler_name = self._sampler.__class__.__name__
         _logger.debug(f"Sample trial#{trial.number} with {sampler_name}.")
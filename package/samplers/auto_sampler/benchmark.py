@@ -0,0 +1,58 @@
+"""Measure the per-trial overhead of ``AutoSampler.before_trial``.
+
+The overhead should stay flat as the number of trials in the study grows, because the sampler
+only looks at the trials added since the last call.
+
+    $ python package/samplers/auto_sampler/benchmark.py
+"""
+
+from __future__ import annotations
+
+import time
+
+import optuna
+from optuna.distributions import FloatDistribution
+import optunahub
+
+
+def _create_study(n_trials: int) -> optuna.Study:
+    auto_sampler = optunahub.load_local_module(
+        package="samplers/auto_sampler", registry_root="package/"
+    ).AutoSampler(seed=0)
+    # Keep the sampler in GPSampler mode so that only the overhead of the sampler choice is
+    # measured.
+    auto_sampler._N_COMPLETE_TRIALS_FOR_CMAES = 10**9
+    study = optuna.create_study(sampler=auto_sampler)
+    distributions = {"x": FloatDistribution(-5, 5), "y": FloatDistribution(-5, 5)}
+    study.add_trials(
+        [
+            optuna.trial.create_trial(
+                params={"x": 0.1 * (i % 10), "y": 0.0}, distributions=distributions, value=i
+            )
+            for i in range(n_trials)
+        ]
+    )
+    return study
+
+
+def _measure_before_trial(study: optuna.Study, n_repeats: int) -> float:
+    elapsed = 0.0
+    for _ in range(n_repeats):
+        trial = study.ask()
+        frozen_trial = study._storage.get_trial(trial._trial_id)
+        start = time.perf_counter()
+        study.sampler.before_trial(study, frozen_trial)
+        elapsed += time.perf_counter() - start
+        study.tell(trial, state=optuna.trial.TrialState.FAIL)
+    return elapsed / n_repeats
+
+
+if __name__ == "__main__":
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    n_repeats = 100
+    for n_trials in [1_000, 10_000, 50_000]:
+        study = _create_study(n_trials)
+        # The first call scans the existing trials once.
+        _measure_before_trial(study, n_repeats=1)
+        overhead = _measure_before_trial(study, n_repeats)
+        print(f"n_trials={n_trials:>6}: {overhead * 1e3:.3f} ms/trial")
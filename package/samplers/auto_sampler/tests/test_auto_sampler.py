@@ -172,3 +172,37 @@ def test_multi_thread() -> None:
 
 def test_picklize() -> None:
     pickle.loads(pickle.dumps(AutoSampler()))
+
+
+def test_incremental_tracker_with_unfinished_trials() -> None:
+    auto_sampler = AutoSampler()
+    study = optuna.create_study(sampler=auto_sampler)
+    running_trial = study.ask()
+    running_trial.suggest_float("x", -5, 5)
+    for _ in range(5):
+        trial = study.ask()
+        study.tell(trial, trial.suggest_float("x", -5, 5))
+
+    # The tracker is updated in before_trial.
+    study.ask()
+    assert auto_sampler._tracker.n_complete_trials == 5
+    assert not auto_sampler._include_conditional_param(study)
+    # The trial that was running during the previous scans must be taken into account.
+    running_trial.suggest_float("y", -5, 5)
+    study.tell(running_trial, 0.0)
+    study.ask()
+    assert auto_sampler._tracker.n_complete_trials == 6
+    assert auto_sampler._include_conditional_param(study)
+
+
+def test_reuse_for_another_study() -> None:
+    auto_sampler = AutoSampler()
+    study = optuna.create_study(sampler=auto_sampler)
+    study.optimize(objective_with_conditional, n_trials=20)
+    assert auto_sampler._tracker.has_conditional_param
+
+    # Every study of ``InMemoryStorage`` has the same ID.
+    other_study = optuna.create_study(sampler=auto_sampler)
+    other_study.optimize(objective, n_trials=5)
+    assert auto_sampler._tracker.n_complete_trials == 4
+    assert not auto_sampler._include_conditional_param(other_study)
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import base64
 import copy
+import io
 import math
+import os
 import pickle
+import threading
+import types
 from typing import Any
 from typing import Callable
 from typing import Dict
@@ -27,6 +32,7 @@ from optuna.search_space import IntersectionSearchSpace
 from optuna.study._study_direction import StudyDirection
 from optuna.trial import FrozenTrial
 from optuna.trial import TrialState
+import optunahub
 
 
 if TYPE_CHECKING:
@@ -36,11 +42,74 @@ if TYPE_CHECKING:
 else:
     cmaes = _LazyImport("cmaes")
 
+
+def _load_simple() -> types.ModuleType:
+    # ``samplers/simple`` provides ``TrialCursor``. It is loaded from the registry this package is
+    # loaded from if it is there, e.g., in a clone of the registry.
+    registry_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if os.path.isfile(os.path.join(registry_root, "samplers", "simple", "__init__.py")):
+        return optunahub.load_local_module("samplers/simple", registry_root=registry_root)
+    return optunahub.load_module("samplers/simple")
+
+
+TrialCursor = _load_simple().TrialCursor
+
 _logger = logging.get_logger(__name__)
 
 _EPS = 1e-10
 # The value of system_attrs must be less than 2046 characters on RDBStorage.
 _SYSTEM_ATTR_MAX_LENGTH = 2045
+# The attributes of cmaes.CatCMA updated by `tell`. The others are determined by the arguments of
+# the constructor, so they are not stored.
+_OPTIMIZER_STATE_ATTRS = (
+    "_mean",
+    "_sigma",
+    "_p_sigma",
+    "_pc",
+    "_q",
+    "_s",
+    "_gamma",
+    "_Delta",
+    "_delta",
+    "_eps",
+    "_g",
+    "_funhist_values",
+)
+# The base64 encoding of the magic string of the NPY format, i.e., b"\x93NUMPY".
+_NPY_BASE64_PREFIX = "k05VTVBZ"
+
+
+def _serialize_optimizer(optimizer: "CmaClass") -> str:
+    # The state is stored as a flat float64 array in the NPY format. Only the upper triangle of the
+    # covariance matrix is stored since it is symmetric.
+    n = len(optimizer._C)
+    state = np.concatenate(
+        [np.ravel(getattr(optimizer, name)) for name in _OPTIMIZER_STATE_ATTRS]
+        + [optimizer._C[np.triu_indices(n)]]
+    ).astype(np.float64)
+    buffer = io.BytesIO()
+    np.save(buffer, state)
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def _deserialize_optimizer(optimizer_str: str, optimizer: "CmaClass") -> None:
+    # `optimizer` must be created with the same arguments as the serialized one.
+    state = np.load(io.BytesIO(base64.b64decode(optimizer_str)))
+    start = 0
+    for name in _OPTIMIZER_STATE_ATTRS:
+        value = getattr(optimizer, name)
+        size = np.size(value)
+        if isinstance(value, np.ndarray):
+            setattr(optimizer, name, state[start : start + size].reshape(value.shape))
+        else:
+            setattr(optimizer, name, type(value)(state[start]))
+        start += size
+
+    n = len(optimizer._C)
+    C = np.zeros((n, n))
+    C[np.triu_indices(n)] = state[start:]
+    optimizer._C = C + np.triu(C, 1).T
+    optimizer._B, optimizer._D = None, None
 
 
 class _CmaEsAttrKeys(NamedTuple):
@@ -52,6 +121,9 @@ class _CmaEsAttrKeys(NamedTuple):
 class CatCmaSampler(BaseSampler):
     """A sampler to solve mixed-categorical optimization using `cmaes <https://github.com/CyberAgentAILab/cmaes>`__ as the backend.
 
+    The optimizer is cached in memory and restored from the storage only when another worker
+    advances its generation.
+
     Args:
         search_space:
             A dictionary of :class:`~optuna.distributions.BaseDistribution` that defines the search space.
@@ -122,6 +194,27 @@ class CatCmaSampler(BaseSampler):
         self._margin = margin
         self._min_eigenvalue = min_eigenvalue
 
+        self._optimizer: Optional["CmaClass"] = None
+        self._cursor = TrialCursor()
+        self._reset_trials()
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[Any, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[Any, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _reset_trials(self) -> None:
+        # The completed trials of each generation, the completed trial with the largest number,
+        # and the completed trial with the largest number among those storing the optimizer.
+        self._solution_trials: Dict[int, List[FrozenTrial]] = {}
+        self._latest_trial: Optional[FrozenTrial] = None
+        self._optimizer_trial: Optional[FrozenTrial] = None
+
     def reseed_rng(self) -> None:
         # _cma_rng doesn't require reseeding because the relative sampling reseeds in each trial.
         self._independent_sampler.reseed_rng()
@@ -152,8 +245,6 @@ class CatCmaSampler(BaseSampler):
         if len(search_space) == 0:
             return {}
 
-        completed_trials = self._get_trials(study)
-
         if len(search_space) == 1:
             _logger.warning(
                 "`CatCmaSampler` only supports two or more dimensional continuous "
@@ -182,21 +273,37 @@ class CatCmaSampler(BaseSampler):
         if self._initial_popsize is None:
             self._initial_popsize = 4 + math.floor(3 * math.log(len(trans.bounds)))
 
-        popsize: int = self._initial_popsize
-        if len(completed_trials) != 0:
-            latest_trial = completed_trials[-1]
+        with self._lock:
+            return self._sample_relative(
+                study, trial, trans, numerical_search_space, categorical_search_space, cat_num
+            )
 
+    def _sample_relative(
+        self,
+        study: "optuna.Study",
+        trial: "optuna.trial.FrozenTrial",
+        trans: _SearchSpaceTransform,
+        numerical_search_space: Dict[str, BaseDistribution],
+        categorical_search_space: Dict[str, CategoricalDistribution],
+        cat_num: np.ndarray,
+    ) -> Dict[str, Any]:
+        self._sync_trials(study)
+
+        assert self._initial_popsize is not None
+        popsize: int = self._initial_popsize
+        if self._latest_trial is not None:
             popsize_attr_key = self._attr_keys.popsize()
-            if popsize_attr_key in latest_trial.system_attrs:
-                popsize = latest_trial.system_attrs[popsize_attr_key]
+            if popsize_attr_key in self._latest_trial.system_attrs:
+                popsize = self._latest_trial.system_attrs[popsize_attr_key]
             else:
                 popsize = self._initial_popsize
 
-        optimizer = self._restore_optimizer(completed_trials)
+        optimizer = self._restore_optimizer(trans, cat_num)
         if optimizer is None:
             optimizer = self._init_optimizer(trans, cat_num, population_size=self._initial_popsize)
+        self._optimizer = optimizer
 
-        solution_trials = self._get_solution_trials(completed_trials, optimizer.generation)
+        solution_trials = self._get_solution_trials(optimizer.generation)
 
         if len(solution_trials) >= popsize:
             # Calculate the number of categorical variables and maximum number of choices
@@ -235,7 +342,7 @@ class CatCmaSampler(BaseSampler):
             optimizer.tell(solutions)
 
             # Store optimizer.
-            optimizer_str = pickle.dumps(optimizer).hex()
+            optimizer_str = _serialize_optimizer(optimizer)
             optimizer_attrs = self._split_optimizer_str(optimizer_str)
             for key in optimizer_attrs:
                 study._storage.set_trial_system_attr(trial._trial_id, key, optimizer_attrs[key])
@@ -299,22 +406,33 @@ class CatCmaSampler(BaseSampler):
         return attrs
 
     def _restore_optimizer(
-        self,
-        completed_trials: "List[optuna.trial.FrozenTrial]",
+        self, trans: _SearchSpaceTransform, cat_num: np.ndarray
     ) -> Optional["CmaClass"]:
-        # Restore a previous CatCma object.
-        for trial in reversed(completed_trials):
-            optimizer_attrs = {
-                key: value
-                for key, value in trial.system_attrs.items()
-                if key.startswith(self._attr_keys.optimizer())
-            }
-            if len(optimizer_attrs) == 0:
-                continue
-
-            optimizer_str = self._concat_optimizer_attrs(optimizer_attrs)
+        if self._optimizer_trial is None:
+            return self._optimizer
+
+        # The optimizer is restored from the storage only if another worker advanced the
+        # generation of the optimizer.
+        generation = self._optimizer_trial.system_attrs[self._attr_keys.generation()]
+        if self._optimizer is not None and self._optimizer.generation >= generation:
+            return self._optimizer
+
+        optimizer_attrs = {
+            key: value
+            for key, value in self._optimizer_trial.system_attrs.items()
+            if key.startswith(self._attr_keys.optimizer())
+        }
+        optimizer_str = self._concat_optimizer_attrs(optimizer_attrs)
+        if not optimizer_str.startswith(_NPY_BASE64_PREFIX):
+            # The optimizer stored by the previous versions is a hex string of a pickle.
             return pickle.loads(bytes.fromhex(optimizer_str))
-        return None
+
+        # The random seed does not matter since the optimizer is reseeded before `ask`.
+        optimizer = self._init_optimizer(
+            trans, cat_num, population_size=self._initial_popsize, seed=0
+        )
+        _deserialize_optimizer(optimizer_str, optimizer)
+        return optimizer
 
     def _init_optimizer(
         self,
@@ -322,6 +440,7 @@ class CatCmaSampler(BaseSampler):
         cat_num: np.ndarray,
         population_size: Optional[int] = None,
         randomize_start_point: bool = False,
+        seed: Optional[int] = None,
     ) -> "CmaClass":
         lower_bounds = trans.bounds[:, 0]
         upper_bounds = trans.bounds[:, 1]
@@ -352,7 +471,7 @@ class CatCmaSampler(BaseSampler):
             cat_num=cat_num,
             bounds=trans.bounds,
             n_max_resampling=10 * n_dimension,
-            seed=self._cma_rng.rng.randint(1, 2**31 - 2),
+            seed=self._cma_rng.rng.randint(1, 2**31 - 2) if seed is None else seed,
             population_size=population_size,
             cov=cov,
             cat_param=self._cat_param,
@@ -373,30 +492,48 @@ class CatCmaSampler(BaseSampler):
             study, trial, param_name, param_distribution
         )
 
-    def _get_trials(self, study: "optuna.Study") -> List[FrozenTrial]:
-        complete_trials = []
-        for t in study._get_trials(deepcopy=False, use_cache=True):
-            if t.state == TrialState.COMPLETE:
-                complete_trials.append(t)
-            elif (
-                t.state == TrialState.PRUNED
-                and len(t.intermediate_values) > 0
-                and self._consider_pruned_trials
-            ):
-                _, value = max(t.intermediate_values.items())
-                if value is None:
-                    continue
-                # We rewrite the value of the trial `t` for sampling, so we need a deepcopy.
-                copied_t = copy.deepcopy(t)
-                copied_t.value = value
-                complete_trials.append(copied_t)
-        return complete_trials
-
-    def _get_solution_trials(
-        self, trials: List[FrozenTrial], generation: int
-    ) -> List[FrozenTrial]:
-        generation_attr_key = self._attr_keys.generation()
-        return [t for t in trials if generation == t.system_attrs.get(generation_attr_key, -1)]
+    def _sync_trials(self, study: "optuna.Study") -> None:
+        finished_trials, restarted = self._cursor.update(study)
+        if restarted:
+            # The optimizer and the solutions of another study must not be used.
+            self._optimizer = None
+            self._reset_trials()
+
+        for t in finished_trials:
+            completed_trial = self._to_completed_trial(t)
+            if completed_trial is None:
+                continue
+            generation = completed_trial.system_attrs.get(self._attr_keys.generation(), -1)
+            self._solution_trials.setdefault(generation, []).append(completed_trial)
+            if self._latest_trial is None or t.number > self._latest_trial.number:
+                self._latest_trial = completed_trial
+            if any(
+                key.startswith(self._attr_keys.optimizer()) for key in t.system_attrs.keys()
+            ) and (self._optimizer_trial is None or t.number > self._optimizer_trial.number):
+                self._optimizer_trial = completed_trial
+
+    def _to_completed_trial(self, t: FrozenTrial) -> Optional[FrozenTrial]:
+        if t.state == TrialState.COMPLETE:
+            return t
+        elif (
+            t.state == TrialState.PRUNED
+            and len(t.intermediate_values) > 0
+            and self._consider_pruned_trials
+        ):
+            _, value = max(t.intermediate_values.items())
+            if value is None:
+                return None
+            # We rewrite the value of the trial `t` for sampling, so we need a deepcopy.
+            copied_t = copy.deepcopy(t)
+            copied_t.value = value
+            return copied_t
+        return None
+
+    def _get_solution_trials(self, generation: int) -> List[FrozenTrial]:
+        # The trials of the previous generations are no longer used.
+        for g in [g for g in self._solution_trials if g < generation]:
+            del self._solution_trials[g]
+        return sorted(self._solution_trials.get(generation, []), key=lambda t: t.number)
 
     def before_trial(self, study: optuna.Study, trial: FrozenTrial) -> None:
         self._independent_sampler.before_trial(study, trial)
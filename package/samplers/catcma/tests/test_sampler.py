@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import pickle
+from typing import Any
+
+import numpy as np
+import optuna
+from optuna._transform import _SearchSpaceTransform
+import optunahub
+import pytest
+
+
+catcma = optunahub.load_local_module(package="samplers/catcma", registry_root="package/")
+
+_NUMERICAL_SEARCH_SPACE = {
+    "x": optuna.distributions.FloatDistribution(-5, 5),
+    "y": optuna.distributions.IntDistribution(-5, 5),
+    "z": optuna.distributions.FloatDistribution(1e-3, 1, log=True),
+}
+_CAT_NUM = np.array([3, 2])
+
+
+def _create_optimizer(sampler: Any) -> Any:
+    trans = _SearchSpaceTransform(_NUMERICAL_SEARCH_SPACE, transform_step=True, transform_0_1=True)
+    optimizer = sampler._init_optimizer(trans, _CAT_NUM, population_size=6)
+
+    # Proceed a few generations so that the distribution parameters are updated.
+    rng = np.random.RandomState(0)
+    for _ in range(3):
+        solutions = []
+        for _ in range(optimizer.population_size):
+            x, c = optimizer.ask()
+            solutions.append(((x, c), float(np.sum((x - 0.3) ** 2) + c[0, 0] + rng.rand())))
+        optimizer.tell(solutions)
+    return optimizer
+
+
+def _assert_same_optimizer(a: Any, b: Any) -> None:
+    # NOTE: ``cmaes.CatCMA`` also stores only a triangle of the covariance matrix on pickling,
+    # so that the optimizer is compared with its pickled copy to be exact.
+    b = pickle.loads(pickle.dumps(b))
+    assert vars(a).keys() == vars(b).keys()
+    for name, value in vars(a).items():
+        # The eigen decomposition of the covariance matrix is cached and recomputed lazily.
+        if name in ("_rng", "_B", "_D"):
+            continue
+        np.testing.assert_equal(getattr(b, name), value, err_msg=name)
+
+    # The optimizers also sample the same solutions for the same seed.
+    for optimizer in (a, b):
+        optimizer._B, optimizer._D = None, None
+        optimizer._rng.seed(1)
+    for _ in range(3):
+        np.testing.assert_equal(a.ask(), b.ask())
+
+
+def _create_optimizer_trial(sampler: Any, optimizer_str: str, generation: int) -> Any:
+    system_attrs: dict[str, Any] = sampler._split_optimizer_str(optimizer_str)
+    system_attrs[sampler._attr_keys.generation()] = generation
+    return optuna.trial.create_trial(value=0.0, system_attrs=system_attrs)
+
+
+def test_serialize_and_deserialize_optimizer() -> None:
+    sampler = catcma.CatCmaSampler(seed=0, popsize=6)
+    optimizer = _create_optimizer(sampler)
+    optimizer_str = catcma.catcma._serialize_optimizer(optimizer)
+
+    trans = _SearchSpaceTransform(_NUMERICAL_SEARCH_SPACE, transform_step=True, transform_0_1=True)
+    restored_optimizer = sampler._init_optimizer(trans, _CAT_NUM, population_size=6, seed=0)
+    catcma.catcma._deserialize_optimizer(optimizer_str, restored_optimizer)
+    _assert_same_optimizer(restored_optimizer, optimizer)
+    # The serialized state is smaller than the hex-encoded pickle of the previous versions.
+    assert len(optimizer_str) < len(pickle.dumps(optimizer).hex())
+
+
+@pytest.mark.parametrize("legacy", [False, True])
+def test_restore_optimizer(legacy: bool) -> None:
+    sampler = catcma.CatCmaSampler(seed=0, popsize=6)
+    optimizer = _create_optimizer(sampler)
+    if legacy:
+        # The optimizers were stored as hex-encoded pickles by the previous versions.
+        optimizer_str = pickle.dumps(optimizer).hex()
+        assert len(sampler._split_optimizer_str(optimizer_str)) > 1
+    else:
+        optimizer_str = catcma.catcma._serialize_optimizer(optimizer)
+
+    restarted_sampler = catcma.CatCmaSampler(seed=1, popsize=6)
+    restarted_sampler._optimizer_trial = _create_optimizer_trial(
+        restarted_sampler, optimizer_str, optimizer.generation
+    )
+    trans = _SearchSpaceTransform(_NUMERICAL_SEARCH_SPACE, transform_step=True, transform_0_1=True)
+    _assert_same_optimizer(restarted_sampler._restore_optimizer(trans, _CAT_NUM), optimizer)
+
+
+def test_cached_optimizer_is_used_until_generation_advances() -> None:
+    sampler = catcma.CatCmaSampler(seed=0, popsize=6)
+    optimizer = _create_optimizer(sampler)
+    optimizer_str = catcma.catcma._serialize_optimizer(optimizer)
+    trans = _SearchSpaceTransform(_NUMERICAL_SEARCH_SPACE, transform_step=True, transform_0_1=True)
+
+    sampler._optimizer = optimizer
+    sampler._optimizer_trial = _create_optimizer_trial(
+        sampler, optimizer_str, optimizer.generation
+    )
+    assert sampler._restore_optimizer(trans, _CAT_NUM) is optimizer
+
+    # Another worker advanced the generation.
+    sampler._optimizer_trial = _create_optimizer_trial(
+        sampler, optimizer_str, optimizer.generation + 1
+    )
+    restored_optimizer = sampler._restore_optimizer(trans, _CAT_NUM)
+    assert restored_optimizer is not optimizer
+    _assert_same_optimizer(restored_optimizer, optimizer)
+
+
+def test_continue_legacy_study() -> None:
+    def objective(trial: optuna.Trial) -> float:
+        x = trial.suggest_float("x", -5, 5)
+        y = trial.suggest_int("y", -5, 5)
+        c = trial.suggest_categorical("c", ["a", "b", "c"])
+        return x**2 + y**2 + (c != "a")
+
+    sampler = catcma.CatCmaSampler(seed=0, popsize=4)
+    study = optuna.create_study(sampler=sampler)
+    study.optimize(objective, n_trials=12)
+
+    # Copy the study with the optimizers replaced by the hex-encoded pickles.
+    optimizer_key = sampler._attr_keys.optimizer()
+    legacy_study = optuna.create_study()
+    for trial in study.trials:
+        system_attrs = {
+            key: value
+            for key, value in trial.system_attrs.items()
+            if not key.startswith(optimizer_key)
+        }
+        if f"{optimizer_key}:0" in trial.system_attrs:
+            sampler._optimizer_trial = trial
+            sampler._optimizer = None
+            trans = _SearchSpaceTransform(
+                {k: v for k, v in trial.distributions.items() if k != "c"},
+                transform_step=True,
+                transform_0_1=True,
+            )
+            optimizer = sampler._restore_optimizer(trans, np.array([3]))
+            system_attrs.update(sampler._split_optimizer_str(pickle.dumps(optimizer).hex()))
+        legacy_study.add_trial(
+            optuna.trial.create_trial(
+                params=trial.params,
+                distributions=trial.distributions,
+                value=trial.value,
+                system_attrs=system_attrs,
+            )
+        )
+
+    legacy_study.sampler = catcma.CatCmaSampler(seed=0, popsize=4)
+    legacy_study.optimize(objective, n_trials=12)
+    generation_key = sampler._attr_keys.generation()
+    legacy_generation = legacy_study.trials[-1].system_attrs[generation_key]
+    assert legacy_generation > study.trials[-1].system_attrs[generation_key]
+
+
+def test_reuse_for_another_study() -> None:
+    def objective(trial: optuna.Trial) -> float:
+        x = trial.suggest_float("x", -5, 5)
+        y = trial.suggest_int("y", -5, 5)
+        c = trial.suggest_categorical("c", ["a", "b", "c"])
+        return x**2 + y**2 + (c != "a")
+
+    sampler = catcma.CatCmaSampler(seed=0, popsize=4)
+    study = optuna.create_study(sampler=sampler)
+    study.optimize(objective, n_trials=12)
+    optimizer = sampler._optimizer
+    assert optimizer is not None
+
+    # Every study of ``InMemoryStorage`` has the same ID.
+    another_study = optuna.create_study(sampler=sampler)
+    another_study.optimize(objective, n_trials=6)
+    assert len(another_study.trials) == 6
+    assert sampler._optimizer is not optimizer
+    assert sampler._optimizer_trial in another_study.trials
+    assert sampler._optimizer is not None and sampler._optimizer.generation == 1
+    for trials in sampler._solution_trials.values():
+        assert all(t in another_study.trials for t in trials)
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 from collections.abc import Callable
+from collections.abc import Sequence
 from typing import NamedTuple
 
 import numpy as np
 from optuna.distributions import BaseDistribution
 from optuna.distributions import CategoricalDistribution
+from optuna.samplers._tpe import _truncnorm
 from optuna.samplers._tpe.parzen_estimator import _ParzenEstimator
 from optuna.samplers._tpe.probability_distributions import _BatchedCategoricalDistributions
 from optuna.samplers._tpe.probability_distributions import _BatchedDiscreteTruncNormDistributions
@@ -14,6 +16,10 @@ from optuna.samplers._tpe.probability_distributions import _BatchedTruncNormDist
 from optuna.samplers._tpe.probability_distributions import _MixtureOfProductDistribution
 
 
+# The maximum number of (sample, kernel) pairs evaluated at once by ``_batched_log_pdf``.
+_MAX_N_LOG_PDF_ELEMENTS = 1 << 22
+
+
 class _CustomizableParzenEstimatorParameters(NamedTuple):
     consider_prior: bool
     prior_weight: float | None
@@ -212,3 +218,99 @@ class _CustomizableParzenEstimator(_ParzenEstimator):
             weights[-1] = 1.0 / n_choices
 
         return _BatchedCategoricalDistributions(weights)
+
+
+def _concatenate_distributions(
+    distributions: list[_BatchedDistributions],
+) -> _BatchedDistributions:
+    d = distributions[0]
+    if isinstance(d, _BatchedCategoricalDistributions):
+        return _BatchedCategoricalDistributions(
+            np.concatenate([d.weights for d in distributions])  # type: ignore[union-attr]
+        )
+    mu = np.concatenate([d.mu for d in distributions])  # type: ignore[union-attr]
+    sigma = np.concatenate([d.sigma for d in distributions])  # type: ignore[union-attr]
+    if isinstance(d, _BatchedTruncNormDistributions):
+        return _BatchedTruncNormDistributions(mu, sigma, d.low, d.high)
+    assert isinstance(d, _BatchedDiscreteTruncNormDistributions)
+    return _BatchedDiscreteTruncNormDistributions(mu, sigma, d.low, d.high, d.step)
+
+
+def _kernel_log_pdf(d: _BatchedDistributions, x: np.ndarray) -> np.ndarray:
+    if isinstance(d, _BatchedCategoricalDistributions):
+        return np.log(d.weights[:, x.astype(np.int64)].T)
+    elif isinstance(d, _BatchedTruncNormDistributions):
+        return _truncnorm.logpdf(
+            x=x[:, None],
+            a=(d.low - d.mu[None, :]) / d.sigma[None, :],
+            b=(d.high - d.mu[None, :]) / d.sigma[None, :],
+            loc=d.mu[None, :],
+            scale=d.sigma[None, :],
+        )
+    elif isinstance(d, _BatchedDiscreteTruncNormDistributions):
+        lower_limit = d.low - d.step / 2
+        upper_limit = d.high + d.step / 2
+        x_lower = np.maximum(x - d.step / 2, lower_limit)
+        x_upper = np.minimum(x + d.step / 2, upper_limit)
+        log_gauss_mass = _truncnorm._log_gauss_mass(
+            (x_lower[:, None] - d.mu[None, :]) / d.sigma[None, :],
+            (x_upper[:, None] - d.mu[None, :]) / d.sigma[None, :],
+        )
+        log_p_accept = _truncnorm._log_gauss_mass(
+            (d.low - d.step / 2 - d.mu[None, :]) / d.sigma[None, :],
+            (d.high + d.step / 2 - d.mu[None, :]) / d.sigma[None, :],
+        )
+        return log_gauss_mass - log_p_accept
+    else:
+        assert False
+
+
+def _batched_log_pdf(
+    parzen_estimators: Sequence[_ParzenEstimator], samples_dict: dict[str, np.ndarray]
+) -> np.ndarray:
+    """Evaluate the log pdfs of the samples for multiple Parzen estimators at once.
+
+    The kernels of all the estimators, which share the same search space, are stacked into one
+    mixture, so that each sample is evaluated against all the kernels in a single array
+    operation per parameter. For discrete parameters, only the distinct sample values are
+    evaluated. The samples are processed in chunks to bound the memory usage.
+
+    Returns:
+        The log pdfs with the shape of ``(len(parzen_estimators), n_samples)``.
+    """
+    mixtures = [pe._mixture_distribution for pe in parzen_estimators]
+    n_kernels = np.array([len(m.weights) for m in mixtures])
+    offsets = np.cumsum(n_kernels) - n_kernels
+    estimator_indices: np.ndarray = np.repeat(np.arange(len(mixtures)), n_kernels)
+    log_weights = np.log(np.concatenate([m.weights for m in mixtures]))
+    distributions = [
+        _concatenate_distributions([m.distributions[i] for m in mixtures])
+        for i in range(len(mixtures[0].distributions))
+    ]
+
+    x = parzen_estimators[0]._transform(samples_dict)
+    chunk_size = max(1, _MAX_N_LOG_PDF_ELEMENTS // len(log_weights))
+    log_pdfs: np.ndarray = np.empty((len(mixtures), len(x)), dtype=np.float64)
+    for start in range(0, len(x), chunk_size):
+        x_chunk = x[start : start + chunk_size]
+        weighted_log_pdf: np.ndarray = np.zeros((len(x_chunk), len(log_weights)), dtype=np.float64)
+        for i, d in enumerate(distributions):
+            if isinstance(d, _BatchedTruncNormDistributions):
+                weighted_log_pdf += _kernel_log_pdf(d, x_chunk[:, i])
+            else:
+                # Discrete samples take only a few distinct values, which are evaluated once.
+                unique_x, inverse = np.unique(x_chunk[:, i], return_inverse=True)
+                weighted_log_pdf += _kernel_log_pdf(d, unique_x)[inverse.ravel()]
+        weighted_log_pdf += log_weights[None, :]
+        max_ = np.maximum.reduceat(weighted_log_pdf, offsets, axis=1)
+        # We need to avoid (-inf) - (-inf) when the probability is zero.
+        max_[np.isneginf(max_)] = 0
+        with np.errstate(divide="ignore"):  # Suppress warning in log(0).
+            log_sum = np.log(
+                np.add.reduceat(
+                    np.exp(weighted_log_pdf - max_[:, estimator_indices]), offsets, axis=1
+                )
+            )
+        log_pdfs[:, start : start + chunk_size] = (log_sum + max_).T
+
+    return log_pdfs
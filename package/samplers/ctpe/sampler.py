@@ -2,25 +2,128 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from collections.abc import Sequence
+import os
+import threading
+import types
 from typing import Any
 
 import numpy as np
 from optuna.distributions import BaseDistribution
 from optuna.logging import get_logger
 from optuna.samplers import TPESampler
+from optuna.samplers._base import _CONSTRAINTS_KEY
 from optuna.samplers._tpe.parzen_estimator import _ParzenEstimator
 from optuna.study import Study
 from optuna.study import StudyDirection
 from optuna.trial import FrozenTrial
 from optuna.trial import TrialState
+import optunahub
 
 from .components import GammaFunc
 from .components import WeightFunc
+from .parzen_estimator import _batched_log_pdf
 from .parzen_estimator import _CustomizableParzenEstimator
 from .parzen_estimator import _CustomizableParzenEstimatorParameters
 
 
+def _load_simple() -> types.ModuleType:
+    # ``samplers/simple`` provides ``ObservationCache`` and ``TrialCursor``. It is loaded from the
+    # registry this package is loaded from if it is there, e.g., in a clone of the registry.
+    registry_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if os.path.isfile(os.path.join(registry_root, "samplers", "simple", "__init__.py")):
+        return optunahub.load_local_module("samplers/simple", registry_root=registry_root)
+    return optunahub.load_module("samplers/simple")
+
+
+_simple = _load_simple()
+ObservationCache = _simple.ObservationCache
+TrialCursor = _simple.TrialCursor
+
+
 _logger = get_logger(f"optuna.{__name__}")
+_INITIAL_CAPACITY = 64
+_CONSTRAINTS_KEY_PREFIX = "ctpe:constraints:"
+
+
+class _ConstraintsCache:
+    """Cache of the constraint values of finished trials indexed by trial numbers.
+
+    ``TPESampler.after_trial`` evaluates ``constraints_func`` once per finished trial and stores
+    the result in the trial system attrs. This class copies the stored values into a growable
+    matrix, so that sampling never calls ``constraints_func`` for the trials already observed.
+    ``constraints_func`` is called only for the trials without stored values, e.g., the trials
+    added by ``study.add_trials``. Since finished trials cannot be updated, the values of such
+    trials are stored in the study system attrs so that other processes do not evaluate them again.
+    """
+
+    def __init__(self, constraints_func: Callable[[FrozenTrial], Sequence[float]]) -> None:
+        self._constraints_func = constraints_func
+        # The cursor only identifies the study, since the trials are given by the caller.
+        self._cursor = TrialCursor()
+        self._lock = threading.Lock()
+        self._reset()
+
+    def __getstate__(self) -> dict[Any, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[Any, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _reset(self) -> None:
+        self._values: np.ndarray | None = None
+        self._is_cached: np.ndarray = np.zeros(_INITIAL_CAPACITY, dtype=bool)
+
+    def get(self, study: Study, trials: list[FrozenTrial]) -> np.ndarray:
+        """Return the constraint values of ``trials`` with the shape of ``(n_trials, n_constraints)``."""
+        with self._lock:
+            if not self._cursor.tracks(study, []):
+                self._cursor.reset(study)
+                self._reset()
+
+            numbers = np.fromiter((t.number for t in trials), dtype=int, count=len(trials))
+            if len(numbers) == 0:
+                return np.empty(0)
+
+            self._reserve(int(numbers.max()) + 1)
+            study_system_attrs: dict[str, Any] | None = None
+            for index in np.flatnonzero(~self._is_cached[numbers]):
+                trial = trials[index]
+                constraints = trial.system_attrs.get(_CONSTRAINTS_KEY)
+                if constraints is None:
+                    if study_system_attrs is None:
+                        study_system_attrs = study._storage.get_study_system_attrs(study._study_id)
+                    key = f"{_CONSTRAINTS_KEY_PREFIX}{trial.number}"
+                    constraints = study_system_attrs.get(key)
+                    if constraints is None:
+                        constraints = [float(c) for c in self._constraints_func(trial)]
+                        study._storage.set_study_system_attr(study._study_id, key, constraints)
+                if self._values is None:
+                    self._values = np.empty((len(self._is_cached), len(constraints)))
+                self._values[trial.number] = constraints
+                self._is_cached[trial.number] = True
+
+            assert self._values is not None
+            return self._values[numbers]
+
+    def _reserve(self, n_rows: int) -> None:
+        capacity = len(self._is_cached)
+        if n_rows <= capacity:
+            return
+
+        while capacity < n_rows:
+            capacity *= 2
+        self._is_cached = _resize(self._is_cached, capacity)
+        if self._values is not None:
+            self._values = _resize(self._values, capacity)
+
+
+def _resize(array: np.ndarray, capacity: int) -> np.ndarray:
+    resized = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+    resized[: len(array)] = array
+    return resized
 
 
 class cTPESampler(TPESampler):
@@ -65,6 +168,8 @@ class cTPESampler(TPESampler):
             multivariate=multivariate,
             constraints_func=constraints_func,
         )
+        self._constraints_cache = _ConstraintsCache(constraints_func)
+        self._observation_cache = ObservationCache()
         self._parzen_estimator_cls = _CustomizableParzenEstimator
         self._parzen_estimator_parameters = _CustomizableParzenEstimatorParameters(
             consider_prior=consider_prior,
@@ -101,6 +206,20 @@ class cTPESampler(TPESampler):
         """
         self._raise_error_if_multi_objective(study)
 
+    def _build_parzen_estimator(
+        self,
+        study: Study,
+        search_space: dict[str, BaseDistribution],
+        trials: list[FrozenTrial],
+        handle_below: bool,
+    ) -> _ParzenEstimator:
+        # NOTE: c-TPE does not support multi-objective optimization, so that all the observations
+        # are uniformly weighted.
+        observations = self._observation_cache.get(study, trials, search_space)
+        return self._parzen_estimator_cls(
+            observations, search_space, self._parzen_estimator_parameters
+        )
+
     def _build_parzen_estimators_for_constraints_and_get_quantiles(
         self,
         trials: list[FrozenTrial],
@@ -134,7 +253,7 @@ class cTPESampler(TPESampler):
     ) -> dict[str, Any]:
         self._warning_multi_objective_for_ctpe(study)
         trials = study._get_trials(deepcopy=False, states=(TrialState.COMPLETE,), use_cache=True)
-        constraints_vals = np.asarray([self._constraints_func(t) for t in trials])
+        constraints_vals = self._constraints_cache.get(study, trials)
         (mpes_below, mpes_above, quantiles) = (
             self._build_parzen_estimators_for_constraints_and_get_quantiles(
                 trials, study, search_space, constraints_vals
@@ -181,8 +300,8 @@ class cTPESampler(TPESampler):
     ) -> np.ndarray:
         _EPS = 1e-12
         assert len(mpes_above) == len(mpes_below) == len(quantiles)
-        lls_above = np.asarray([mpe_above.log_pdf(samples) for mpe_above in mpes_above])
-        lls_below = np.asarray([mpe_below.log_pdf(samples) for mpe_below in mpes_below])
+        lls = _batched_log_pdf(mpes_above + mpes_below, samples)
+        lls_above, lls_below = lls[: len(mpes_above)], lls[len(mpes_above) :]
         _q = np.asarray(quantiles)[:, np.newaxis]
         log_first_term = np.log(_q + _EPS)
         log_second_term = np.log(1.0 - _q + _EPS) + lls_above - lls_below
@@ -29,9 +29,8 @@ import optunahub
 import pytest
 
 
-cTPESampler = optunahub.load_local_module(
-    package="samplers/ctpe", registry_root="package/"
-).cTPESampler
+ctpe = optunahub.load_local_module(package="samplers/ctpe", registry_root="package/")
+cTPESampler = ctpe.cTPESampler
 
 
 def dummy_constraints(trial: FrozenTrial) -> tuple[float]:
@@ -910,3 +909,139 @@ def test_trial_relative_params(
         return -1
 
     study.optimize(objective, n_trials=10, n_jobs=n_jobs)
+
+
+def test_constraints_func_called_once_per_trial() -> None:
+    n_calls: dict[int, int] = {}
+
+    def constraints_func(trial: FrozenTrial) -> tuple[float]:
+        n_calls[trial.number] = n_calls.get(trial.number, 0) + 1
+        return (trial.params["x"] - 5.0,)
+
+    sampler = cTPESampler(n_startup_trials=2, seed=0, constraints_func=constraints_func)
+    study = optuna.study.create_study(sampler=sampler)
+    study.add_trial(
+        optuna.trial.create_trial(
+            params={"x": 1.0}, distributions={"x": FloatDistribution(-10, 10)}, value=1.0
+        )
+    )
+    study.optimize(lambda t: t.suggest_float("x", -10, 10) ** 2, n_trials=10)
+
+    assert n_calls == {i: 1 for i in range(11)}
+
+
+def test_constraints_of_added_trials_are_stored() -> None:
+    n_calls: dict[int, int] = {}
+
+    def constraints_func(trial: FrozenTrial) -> tuple[float]:
+        n_calls[trial.number] = n_calls.get(trial.number, 0) + 1
+        return (trial.params["x"] - 5.0,)
+
+    study = optuna.study.create_study(
+        sampler=cTPESampler(n_startup_trials=2, seed=0, constraints_func=constraints_func)
+    )
+    for x in [1.0, 7.0]:
+        study.add_trial(
+            optuna.trial.create_trial(
+                params={"x": x}, distributions={"x": FloatDistribution(-10, 10)}, value=x
+            )
+        )
+    study.optimize(lambda t: t.suggest_float("x", -10, 10) ** 2, n_trials=1)
+    assert n_calls == {0: 1, 1: 1, 2: 1}
+
+    # Another sampler, e.g., in another process, reads the stored constraint values.
+    study.sampler = cTPESampler(n_startup_trials=2, seed=0, constraints_func=constraints_func)
+    study.optimize(lambda t: t.suggest_float("x", -10, 10) ** 2, n_trials=1)
+    assert n_calls == {0: 1, 1: 1, 2: 1, 3: 1}
+
+
+def test_constraints_of_another_study() -> None:
+    def constraints_func(trial: FrozenTrial) -> tuple[float]:
+        return (trial.params["x"] - 5.0,)
+
+    sampler = cTPESampler(n_startup_trials=2, seed=0, constraints_func=constraints_func)
+    for x in [1.0, 7.0]:
+        # Every study of ``InMemoryStorage`` has the same study ID.
+        study = optuna.study.create_study(sampler=sampler)
+        study.add_trial(
+            optuna.trial.create_trial(
+                params={"x": x}, distributions={"x": FloatDistribution(-10, 10)}, value=x
+            )
+        )
+        trials = study.get_trials(deepcopy=False)
+        np.testing.assert_array_equal(sampler._constraints_cache.get(study, trials), [[x - 5.0]])
+
+
+@pytest.mark.parametrize("n_ei_candidates", [24, 240])
+@pytest.mark.parametrize("max_n_log_pdf_elements", [1 << 22, 1000, 1])
+def test_batched_log_pdf(
+    n_ei_candidates: int, max_n_log_pdf_elements: int, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    n_calls = 0
+    batched_log_pdf = ctpe.parzen_estimator._batched_log_pdf
+
+    def _batched_log_pdf(
+        parzen_estimators: Sequence[Any], samples_dict: dict[str, np.ndarray]
+    ) -> np.ndarray:
+        nonlocal n_calls
+        n_calls += 1
+        log_pdfs = batched_log_pdf(parzen_estimators, samples_dict)
+        # The batched log pdfs equal those of each estimator.
+        expected = np.stack([pe.log_pdf(samples_dict) for pe in parzen_estimators])
+        np.testing.assert_allclose(log_pdfs, expected, rtol=1e-10, atol=1e-10)
+        return log_pdfs
+
+    monkeypatch.setattr(ctpe.sampler, "_batched_log_pdf", _batched_log_pdf)
+    # The samples are evaluated in chunks if the number of (sample, kernel) pairs is large.
+    monkeypatch.setattr(ctpe.parzen_estimator, "_MAX_N_LOG_PDF_ELEMENTS", max_n_log_pdf_elements)
+
+    def objective(trial: Trial) -> float:
+        x = trial.suggest_float("x", -5, 5)
+        y = trial.suggest_float("y", 1e-3, 10, log=True)
+        z = trial.suggest_float("z", -1, 1, step=0.25)
+        i = trial.suggest_int("i", -3, 3)
+        j = trial.suggest_int("j", 1, 64, log=True)
+        c = trial.suggest_categorical("c", ["a", "b", "c", None])
+        return x**2 + np.log(y) ** 2 + z + i + np.log2(j) + (c == "a")
+
+    def constraints_func(trial: FrozenTrial) -> tuple[float, float]:
+        return (trial.params["x"] - 1.0, trial.params["i"] - 1.0)
+
+    sampler = cTPESampler(
+        n_startup_trials=5,
+        n_ei_candidates=n_ei_candidates,
+        multivariate=True,
+        seed=0,
+        constraints_func=constraints_func,
+    )
+    study = optuna.create_study(sampler=sampler)
+    study.optimize(objective, n_trials=20)
+    assert n_calls == 15
+
+
+def test_observation_cache_hit() -> None:
+    def objective(trial: Trial) -> float:
+        return trial.suggest_float("x", -5, 5) ** 2 + trial.suggest_int("y", -5, 5) ** 2
+
+    sampler = cTPESampler(seed=0, constraints_func=dummy_constraints)
+    study = optuna.create_study(sampler=sampler)
+    study.optimize(objective, n_trials=20)
+    search_space = {"x": FloatDistribution(-5, 5), "y": IntDistribution(-5, 5)}
+    trials = study.get_trials(deepcopy=False)
+    expected = ctpe.sampler.ObservationCache().get(study, trials, search_space)
+
+    with patch.object(
+        FloatDistribution, "to_internal_repr", autospec=True, side_effect=lambda _, v: float(v)
+    ) as to_internal_repr:
+        # Only the last trial is converted, since the others were converted while sampling.
+        mpe = sampler._build_parzen_estimator(study, search_space, trials, handle_below=False)
+        assert to_internal_repr.call_count == 1
+        mpe_hit = sampler._build_parzen_estimator(study, search_space, trials, handle_below=False)
+        assert to_internal_repr.call_count == 1
+
+    samples = {"x": np.linspace(-5, 5, 11), "y": np.arange(-5, 6, dtype=float)}
+    expected_mpe = sampler._parzen_estimator_cls(
+        expected, search_space, sampler._parzen_estimator_parameters
+    )
+    np.testing.assert_array_equal(mpe.log_pdf(samples), expected_mpe.log_pdf(samples))
+    np.testing.assert_array_equal(mpe_hit.log_pdf(samples), expected_mpe.log_pdf(samples))
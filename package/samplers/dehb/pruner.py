@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import bisect
 import math
 
 import numpy as np
@@ -25,6 +26,8 @@ class DEHBPruner(HyperbandPruner):
         super().__init__(min_resource, max_resource, reduction_factor, bootstrap_count)
 
         self._budget_candidates: list[int] | None = None
+        self._schedule_ends: list[int] | None = None
+        self._schedule_ids: list[tuple[int, int]] = []
 
     def prune(self, study: Study, trial: FrozenTrial) -> bool:
         if len(self._pruners) == 0:
@@ -49,8 +52,7 @@ class DEHBPruner(HyperbandPruner):
 
         assert self._get_iteration_id(study, trial) == 0
 
-        bracket_id = self._get_bracket_id_after_init(study, trial)
-        budget_id = self._get_budget_id(study, trial, bracket_id)
+        budget_id = self._get_budget_id(study, trial)
         budget = self._budget_candidates[budget_id]
         last_step = trial.last_step
         if last_step is None:
@@ -72,10 +74,11 @@ class DEHBPruner(HyperbandPruner):
             budget_candidates.append(min_resource * reduction_factor**i)
         self._budget_candidates = budget_candidates
 
-    def _get_n_trials_in_first_dehb_iteration(self, study: Study) -> int:
-        if self._n_brackets is None:
-            return 2**32 - 1  # Return a large number.
-
+    def _create_schedule(self) -> None:
+        # The trials of a DEHB iteration are split into the brackets, and the trials of the
+        # ``i``-th bracket are split into the budgets from ``i`` to ``s_max``. The schedule holds
+        # the end of each segment of the trials in an iteration and its bracket and budget IDs.
+        assert isinstance(self._n_brackets, int)
         s_max = self._n_brackets - 1
 
         successive_halving_pruner = self._pruners[0]
@@ -83,85 +86,63 @@ class DEHBPruner(HyperbandPruner):
 
         reduction_factor = successive_halving_pruner._reduction_factor
 
+        schedule_ends = []
+        schedule_ids = []
         n = 0
         for i in range(s_max + 1):
             for j in range(i, s_max + 1):
                 n += reduction_factor ** (s_max - j)
-        return n
+                schedule_ends.append(n)
+                schedule_ids.append((i, j))
+        self._schedule_ends = schedule_ends
+        self._schedule_ids = schedule_ids
+
+    def _get_schedule_ids(self, study: Study, trial: FrozenTrial) -> tuple[int, int]:
+        if self._schedule_ends is None:
+            self._create_schedule()
+        assert self._schedule_ends is not None
+
+        trial_number_in_iteration = trial.number % self._schedule_ends[-1]
+        return self._schedule_ids[
+            bisect.bisect_right(self._schedule_ends, trial_number_in_iteration)
+        ]
+
+    def _get_n_trials_in_first_dehb_iteration(self, study: Study) -> int:
+        if self._n_brackets is None:
+            return 2**32 - 1  # Return a large number.
+
+        if self._schedule_ends is None:
+            self._create_schedule()
+        assert self._schedule_ends is not None
+        return self._schedule_ends[-1]
 
     def _get_iteration_id(self, study: Study, trial: FrozenTrial) -> int:
         n_trials_per_iteration = self._get_n_trials_in_first_dehb_iteration(study)
         return trial.number // n_trials_per_iteration
 
     def _get_bracket_id_after_init(self, study: Study, trial: FrozenTrial) -> int:
-        assert isinstance(self._n_brackets, int)
-        s_max = self._n_brackets - 1
-
-        successive_halving_pruner = self._pruners[0]
-        assert isinstance(successive_halving_pruner, SuccessiveHalvingPruner)
-
-        reduction_factor = successive_halving_pruner._reduction_factor
-
-        n_trials_for_each_bracket = []
-        for i in range(s_max + 1):
-            n = 0
-            for j in range(i, s_max + 1):
-                n += reduction_factor ** (s_max - j)
-            n_trials_for_each_bracket.append(n)
+        return self._get_schedule_ids(study, trial)[0]
 
-        n_trials_per_iteration = self._get_n_trials_in_first_dehb_iteration(study)
-        trial_number_in_iteration = trial.number % n_trials_per_iteration
-        for i in range(s_max + 1):
-            if trial_number_in_iteration < n_trials_for_each_bracket[i]:
-                return i
-            trial_number_in_iteration -= n_trials_for_each_bracket[i]
+    def _get_budget_id(self, study: Study, trial: FrozenTrial) -> int:
+        """Return the budget ID of the trial.
 
-        assert False, "This line should never be reached."
+        The budget ID of a running trial is given by the schedule, and that of a finished trial is
+        the one whose budget is the closest to the last step of the trial.
+        """
+        if trial.state == TrialState.RUNNING:
+            return self._get_schedule_ids(study, trial)[1]
 
-    def _get_budget_id(self, study: Study, trial: FrozenTrial, bracket_id: int) -> int:
+        if self._budget_candidates is None:
+            self._create_budget_candidates(study)
         budget_candidates = self._budget_candidates
         assert budget_candidates is not None
-        assert isinstance(self._n_brackets, int)
-        s_max = self._n_brackets - 1
+
+        last_step = trial.last_step
+        assert last_step is not None
 
         successive_halving_pruner = self._pruners[0]
         assert isinstance(successive_halving_pruner, SuccessiveHalvingPruner)
-
         reduction_factor = successive_halving_pruner._reduction_factor
 
-        if trial.state != TrialState.RUNNING:
-            last_step = trial.last_step
-            assert last_step is not None
-
-            successive_halving_pruner = self._pruners[0]
-            assert isinstance(successive_halving_pruner, SuccessiveHalvingPruner)
-            reduction_factor = successive_halving_pruner._reduction_factor
-
-            difference = [
-                abs(math.log(x / last_step, reduction_factor)) for x in budget_candidates
-            ]
-            return np.argmin(difference)
-
-        n_trials_for_each_bracket = []
-        for i in range(s_max + 1):
-            n = 0
-            for j in range(i, s_max + 1):
-                n += reduction_factor ** (s_max - j)
-            n_trials_for_each_bracket.append(n)
-
-        n_trials_in_the_bracket = []
-        for j in range(bracket_id, s_max + 1):
-            n = reduction_factor ** (s_max - j)
-            n_trials_in_the_bracket.append(n)
-
-        n_trials_per_iteration = self._get_n_trials_in_first_dehb_iteration(study)
-        trial_number_in_iteration = trial.number % n_trials_per_iteration
-        for i in range(0, bracket_id):
-            trial_number_in_iteration -= n_trials_for_each_bracket[i]
-
-        for j in range(bracket_id, s_max + 1):
-            if trial_number_in_iteration < n_trials_in_the_bracket[j - bracket_id]:
-                return j
-            trial_number_in_iteration -= n_trials_in_the_bracket[j - bracket_id]
-
-        assert False, "This line should never be reached."
+        difference = [abs(math.log(x / last_step, reduction_factor)) for x in budget_candidates]
+        return int(np.argmin(difference))
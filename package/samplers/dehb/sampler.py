@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import bisect
+import os
+import threading
+import types
 from typing import Any
 
 import numpy as np
@@ -13,10 +17,23 @@ from optuna.study import Study
 from optuna.study import StudyDirection
 from optuna.trial import FrozenTrial
 from optuna.trial import TrialState
+import optunahub
 
 from .pruner import DEHBPruner
 
 
+def _load_simple() -> types.ModuleType:
+    # ``samplers/simple`` provides ``TrialCursor``. It is loaded from the registry this package is
+    # loaded from if it is there, e.g., in a clone of the registry.
+    registry_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if os.path.isfile(os.path.join(registry_root, "samplers", "simple", "__init__.py")):
+        return optunahub.load_local_module("samplers/simple", registry_root=registry_root)
+    return optunahub.load_module("samplers/simple")
+
+
+TrialCursor = _load_simple().TrialCursor
+
+
 class DEHBSampler(BaseSampler):
     def __init__(
         self,
@@ -29,6 +46,48 @@ class DEHBSampler(BaseSampler):
         self._random_sampler = RandomSampler(seed=seed)
         self._rng = LazyRandomState(seed)
         self._search_space = IntersectionSearchSpace()
+        self._cursor = TrialCursor()
+        self._reset_trials()
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[Any, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[Any, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _reset_trials(self) -> None:
+        # The completed and pruned trials in the order of the trial numbers, and those of each
+        # (iteration ID, bracket ID, budget ID).
+        self._finished_trials: list[FrozenTrial] = []
+        self._subpopulations: dict[tuple[int, int, int], list[FrozenTrial]] = {}
+
+    def _sync_trials(self, study: Study, pruner: DEHBPruner) -> None:
+        # A pruned trial is added to its subpopulation once it is finished, so the running trials
+        # are visited again by the cursor.
+        finished_trials, restarted = self._cursor.update(study)
+        if restarted:
+            # The subpopulations of another study, e.g., of another study in the same
+            # ``InMemoryStorage`` with the same ID, must not be used.
+            self._reset_trials()
+
+        for t in finished_trials:
+            if t.state not in (TrialState.COMPLETE, TrialState.PRUNED):
+                continue
+
+            bisect.insort(self._finished_trials, t)
+            if t.last_step is None or t.last_step <= 0:
+                # The budget of the trial is unknown.
+                continue
+            key = (
+                pruner._get_iteration_id(study, t),
+                pruner._get_bracket_id_after_init(study, t),
+                pruner._get_budget_id(study, t),
+            )
+            bisect.insort(self._subpopulations.setdefault(key, []), t)
 
     def sample_relative(
         self, study: Study, trial: FrozenTrial, search_space: dict[str, BaseDistribution]
@@ -36,52 +95,43 @@ class DEHBSampler(BaseSampler):
         if len(search_space) == 0:
             return {}
 
-        trials = study._get_trials(deepcopy=False, states=(TrialState.COMPLETE, TrialState.PRUNED))
-
-        if len(trials) <= self._get_n_trials_in_first_dehb_iteration(study):
+        pruner = study.pruner
+        assert isinstance(pruner, DEHBPruner)
+        if pruner._n_brackets is None:
             return {}
 
-        iteration_id = self._get_iteration_id(study, trial)
-        bracket_id = self._get_bracket_id(study, trial)
-        budget_id = self._get_budget_id(study, trial, bracket_id)
-        assert iteration_id > 0
-
-        subpopulation: list[FrozenTrial] = []
-
-        if bracket_id == 0:
-            subpopulation.extend(
-                [
-                    t
-                    for t in trials
-                    if self._get_iteration_id(study, t) == iteration_id - 1
-                    and self._get_bracket_id(study, t) == budget_id
-                    and self._get_budget_id(study, t, bracket_id) == budget_id
-                ]
-            )
-        else:
-            subpopulation.extend(
-                [
-                    t
-                    for t in trials
-                    if self._get_iteration_id(study, t) == iteration_id
-                    and self._get_bracket_id(study, t) == bracket_id - 1
-                    and self._get_budget_id(study, t, bracket_id) == budget_id
-                ]
-            )
+        with self._lock:
+            self._sync_trials(study, pruner)
+            trials = list(self._finished_trials)
+
+            if len(trials) <= pruner._get_n_trials_in_first_dehb_iteration(study):
+                return {}
 
-        if budget_id > bracket_id:
-            previous_budget_trials = [
-                t
-                for t in trials
-                if self._get_iteration_id(study, t) == iteration_id
-                and self._get_bracket_id(study, t) == bracket_id
-                and self._get_budget_id(study, t, bracket_id) == budget_id - 1
-            ]
-            reduction_factor = study.pruner._pruners[0]._reduction_factor
-            promotable_trials = sorted(
-                previous_budget_trials, key=lambda t: t.intermediate_values[t.last_step]
-            )[: len(previous_budget_trials) // reduction_factor]
-            subpopulation.extend(promotable_trials)
+            iteration_id = pruner._get_iteration_id(study, trial)
+            bracket_id = pruner._get_bracket_id_after_init(study, trial)
+            budget_id = pruner._get_budget_id(study, trial)
+            assert iteration_id > 0
+
+            subpopulation: list[FrozenTrial] = []
+
+            if bracket_id == 0:
+                subpopulation.extend(
+                    self._subpopulations.get((iteration_id - 1, budget_id, budget_id), [])
+                )
+            else:
+                subpopulation.extend(
+                    self._subpopulations.get((iteration_id, bracket_id - 1, budget_id), [])
+                )
+
+            if budget_id > bracket_id:
+                previous_budget_trials = self._subpopulations.get(
+                    (iteration_id, bracket_id, budget_id - 1), []
+                )
+                reduction_factor = pruner._pruners[0]._reduction_factor
+                promotable_trials = sorted(
+                    previous_budget_trials, key=lambda t: t.intermediate_values[t.last_step]
+                )[: len(previous_budget_trials) // reduction_factor]
+                subpopulation.extend(promotable_trials)
 
         if len(subpopulation) < 3:
             subpopulation.extend(trials)
@@ -118,26 +168,6 @@ class DEHBSampler(BaseSampler):
 
         return search_space
 
-    def _get_n_trials_in_first_dehb_iteration(self, study: Study) -> int:
-        dehb_pruner = study.pruner
-        assert isinstance(dehb_pruner, DEHBPruner)
-        return dehb_pruner._get_n_trials_in_first_dehb_iteration(study)
-
-    def _get_iteration_id(self, study: Study, trial: FrozenTrial) -> int:
-        dehb_pruner = study.pruner
-        assert isinstance(dehb_pruner, DEHBPruner)
-        return dehb_pruner._get_iteration_id(study, trial)
-
-    def _get_bracket_id(self, study: Study, trial: FrozenTrial) -> int:
-        dehb_pruner = study.pruner
-        assert isinstance(dehb_pruner, DEHBPruner)
-        return dehb_pruner._get_bracket_id_after_init(study, trial)
-
-    def _get_budget_id(self, study: Study, trial: FrozenTrial, bracket_id: int) -> int:
-        dehb_pruner = study.pruner
-        assert isinstance(dehb_pruner, DEHBPruner)
-        return dehb_pruner._get_budget_id(study, trial, bracket_id)
-
     def _select_parents(
         self, subpopulation: list[FrozenTrial], direction: StudyDirection
     ) -> tuple[FrozenTrial, FrozenTrial, FrozenTrial]:
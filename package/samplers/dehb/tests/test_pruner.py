@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from typing import Any
+
+import optuna
+from optuna.trial import TrialState
+import optunahub
+import pytest
+
+
+dehb = optunahub.load_local_module(package="samplers/dehb", registry_root="package/")
+
+
+def _create_pruner(max_resource: int, reduction_factor: int) -> Any:
+    pruner = dehb.DEHBPruner(
+        min_resource=1, max_resource=max_resource, reduction_factor=reduction_factor
+    )
+    pruner._try_initialization(optuna.create_study())
+    return pruner
+
+
+def _create_running_trial(number: int) -> optuna.trial.FrozenTrial:
+    trial = optuna.trial.create_trial(state=TrialState.RUNNING)
+    trial.number = number
+    return trial
+
+
+def _nested_loop_ids(n_brackets: int, reduction_factor: int, number: int) -> tuple[int, int]:
+    # The bracket and budget IDs computed by the nested loops of the previous versions.
+    s_max = n_brackets - 1
+    n_trials_for_each_bracket = [
+        sum(reduction_factor ** (s_max - j) for j in range(i, s_max + 1)) for i in range(s_max + 1)
+    ]
+    number_in_iteration = number % sum(n_trials_for_each_bracket)
+    for bracket_id in range(s_max + 1):
+        if number_in_iteration < n_trials_for_each_bracket[bracket_id]:
+            break
+        number_in_iteration -= n_trials_for_each_bracket[bracket_id]
+    for budget_id in range(bracket_id, s_max + 1):
+        if number_in_iteration < reduction_factor ** (s_max - budget_id):
+            return bracket_id, budget_id
+        number_in_iteration -= reduction_factor ** (s_max - budget_id)
+    assert False, "This line should never be reached."
+
+
+@pytest.mark.parametrize(
+    "max_resource, reduction_factor", [(1, 3), (9, 3), (27, 3), (100, 3), (16, 2), (64, 4)]
+)
+def test_schedule_ids_match_nested_loops(max_resource: int, reduction_factor: int) -> None:
+    pruner = _create_pruner(max_resource, reduction_factor)
+    n_brackets = pruner._n_brackets
+    n_trials_per_iteration = pruner._get_n_trials_in_first_dehb_iteration(None)
+    assert n_trials_per_iteration == sum(
+        reduction_factor ** (n_brackets - 1 - j)
+        for i in range(n_brackets)
+        for j in range(i, n_brackets)
+    )
+
+    for number in range(3 * n_trials_per_iteration):
+        trial = _create_running_trial(number)
+        expected = _nested_loop_ids(n_brackets, reduction_factor, number)
+        assert pruner._get_schedule_ids(None, trial) == expected
+        assert pruner._get_bracket_id_after_init(None, trial) == expected[0]
+        assert pruner._get_budget_id(None, trial) == expected[1]
+        assert pruner._get_iteration_id(None, trial) == number // n_trials_per_iteration
+
+
+def test_create_schedule() -> None:
+    pruner = _create_pruner(9, 3)
+    pruner._create_schedule()
+    # Three brackets with the budgets 1, 3 and 9, which run 9, 3 and 1 trials respectively.
+    assert pruner._schedule_ends == [9, 12, 13, 16, 17, 18]
+    assert pruner._schedule_ids == [(0, 0), (0, 1), (0, 2), (1, 1), (1, 2), (2, 2)]
+
+
+def test_budget_id_of_finished_trial() -> None:
+    pruner = _create_pruner(9, 3)
+    for last_step, budget_id in [(1, 0), (2, 1), (3, 1), (5, 1), (6, 2), (9, 2), (20, 2)]:
+        trial = optuna.trial.create_trial(
+            value=0.0, intermediate_values={step: 0.0 for step in range(1, last_step + 1)}
+        )
+        assert pruner._get_budget_id(None, trial) == budget_id
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from typing import Any
+
+import optuna
+import optunahub
+
+
+dehb = optunahub.load_local_module(package="samplers/dehb", registry_root="package/")
+
+
+def _objective(trial: optuna.Trial) -> float:
+    x = trial.suggest_float("x", -5, 5)
+    y = trial.suggest_float("y", -5, 5)
+    for step in range(1, 10):
+        trial.report(x**2 + y**2 + 1 / step, step)
+        if trial.should_prune():
+            raise optuna.TrialPruned()
+    return x**2 + y**2
+
+
+def _objective_without_steps(trial: optuna.Trial) -> float:
+    x = trial.suggest_float("x", -5, 5)
+    y = trial.suggest_float("y", -5, 5)
+    if trial.number % 3 == 0:
+        # Only the step 0 is reported.
+        trial.report(x**2 + y**2, 0)
+    elif trial.number % 3 == 1:
+        return _objective(trial)
+    return x**2 + y**2
+
+
+def _create_study(sampler: Any) -> optuna.Study:
+    pruner = dehb.DEHBPruner(min_resource=1, max_resource=9, reduction_factor=3)
+    return optuna.create_study(sampler=sampler, pruner=pruner)
+
+
+def _assert_subpopulations(sampler: Any, study: optuna.Study) -> None:
+    pruner = study.pruner
+    sampler._sync_trials(study, pruner)
+    trials = study.get_trials(
+        deepcopy=False, states=(optuna.trial.TrialState.COMPLETE, optuna.trial.TrialState.PRUNED)
+    )
+    assert sampler._finished_trials == trials
+
+    subpopulations: dict[tuple[int, int, int], list[optuna.trial.FrozenTrial]] = {}
+    for t in trials:
+        if t.last_step is None or t.last_step <= 0:
+            continue
+        key = (
+            pruner._get_iteration_id(study, t),
+            pruner._get_bracket_id_after_init(study, t),
+            pruner._get_budget_id(study, t),
+        )
+        subpopulations.setdefault(key, []).append(t)
+    assert sampler._subpopulations == subpopulations
+
+
+def test_subpopulations() -> None:
+    sampler = dehb.DEHBSampler(seed=0)
+    study = _create_study(sampler)
+    running_trial = study.ask()
+    running_trial.suggest_float("x", -5, 5)
+    running_trial.suggest_float("y", -5, 5)
+    study.optimize(_objective, n_trials=40)
+
+    # The running trial is added once it is finished.
+    running_trial.report(1.0, 3)
+    study.tell(running_trial, state=optuna.trial.TrialState.PRUNED)
+    study.optimize(_objective, n_trials=1)
+    _assert_subpopulations(sampler, study)
+
+
+def test_trials_without_positive_last_step() -> None:
+    sampler = dehb.DEHBSampler(seed=0)
+    study = _create_study(sampler)
+    study.optimize(_objective_without_steps, n_trials=60)
+
+    # The trials without a positive last step are only used as the fallback parents.
+    trials = study.get_trials(deepcopy=False)
+    assert any(t.last_step is None for t in trials)
+    assert any(t.last_step == 0 for t in trials)
+    _assert_subpopulations(sampler, study)
+    assert all(t.last_step > 0 for ts in sampler._subpopulations.values() for t in ts)
+
+
+def test_reuse_for_another_study() -> None:
+    sampler = dehb.DEHBSampler(seed=0)
+    study = _create_study(sampler)
+    study.optimize(_objective, n_trials=40)
+
+    # Every study of ``InMemoryStorage`` has the same ID, and the pruner is created again.
+    another_study = _create_study(sampler)
+    another_study.optimize(_objective, n_trials=25)
+    assert len(another_study.trials) == 25
+    _assert_subpopulations(sampler, another_study)
@@ -10,6 +10,9 @@ from optuna.samplers._lazy_random_state import LazyRandomState
 import optunahub
 
 
+_STRATEGIES = ("rand/1", "best/1", "current-to-best/1")
+
+
 class DESampler(optunahub.samplers.SimpleBaseSampler):
     """Differential Evolution Sampler with Random Sampling for categorical parameters.
 
@@ -42,6 +45,9 @@ class DESampler(optunahub.samplers.SimpleBaseSampler):
             Toggle for debug messages.
         seed:
             Random seed for reproducibility.
+        strategy:
+            Mutation strategy. ``"rand/1"`` (default), ``"best/1"``, and
+            ``"current-to-best/1"`` are supported.
 
     Attributes:
         seed:
@@ -56,6 +62,8 @@ class DESampler(optunahub.samplers.SimpleBaseSampler):
             Mutation scaling factor for DE.
         CR:
             Crossover probability for DE.
+        strategy:
+            Mutation strategy for DE.
         debug:
             Debugging toggle.
         dim:
@@ -92,10 +100,14 @@ class DESampler(optunahub.samplers.SimpleBaseSampler):
         CR: float = 0.7,
         debug: bool = False,
         seed: int | None = None,
+        strategy: str = "rand/1",
     ) -> None:
         """Initialize the DE sampler."""
         super().__init__(search_space)
 
+        if strategy not in _STRATEGIES:
+            raise ValueError(f"strategy must be one of {_STRATEGIES}, but got {strategy}.")
+
         # Store and set random seed
         self.seed = seed
         self._rng = LazyRandomState(seed)
@@ -110,6 +122,7 @@ class DESampler(optunahub.samplers.SimpleBaseSampler):
         )  # Will be resolved later
         self.F = F
         self.CR = CR
+        self.strategy = strategy
         self.debug = debug
 
         # Search space parameters
@@ -200,12 +213,17 @@ class DESampler(optunahub.samplers.SimpleBaseSampler):
 
         return numerical_space, categorical_space
 
-    def _generate_trial_vectors(self, active_indices: list[int]) -> np.ndarray:
+    def _generate_trial_vectors(self, active_indices: list[int], sign: int = 1) -> np.ndarray:
         """Generate new trial vectors using DE mutation and crossover.
 
+        The whole generation is built at once with NumPy array operations instead of looping
+        over the individuals.
+
         Args:
             active_indices:
                 Indices of active dimensions in the current trial's search space.
+            sign:
+                1 for minimization and -1 for maximization.
 
         Returns:
             np.ndarray:
@@ -215,43 +233,103 @@ class DESampler(optunahub.samplers.SimpleBaseSampler):
         if not isinstance(self.population_size, int):
             raise ValueError("Population size must be resolved to an integer before this point.")
 
-        trial_vectors = np.zeros((self.population_size, len(active_indices)))
+        if self.population is None or self.lower_bound is None or self.upper_bound is None:
+            raise ValueError(
+                "Population, lower_bound, and upper_bound must be initialized before this operation."
+            )
 
-        for i in range(self.population_size):
-            # Select three random distinct individuals for mutation
-            indices = [idx for idx in range(self.population_size) if idx != i]
-            r1, r2, r3 = self._rng.rng.choice(indices, 3, replace=False)
+        lower_bound = self.lower_bound[active_indices]
+        upper_bound = self.upper_bound[active_indices]
 
-            if self.population is None or self.lower_bound is None or self.upper_bound is None:
-                raise ValueError(
-                    "Population, lower_bound, and upper_bound must be initialized before this operation."
-                )
+        # Handle NaN values by filling with default (mean of bounds)
+        population = self.population[:, active_indices]
+        valid_population = np.where(
+            np.isnan(population), (lower_bound + upper_bound) / 2, population
+        )
 
-            # Handle NaN values by filling with default (mean of bounds)
-            valid_population = np.nan_to_num(
-                self.population[:, active_indices],
-                nan=(self.lower_bound[active_indices] + self.upper_bound[active_indices]) / 2,
-            )
+        # Select three random distinct individuals for mutation, all different from the target.
+        r1, r2, r3 = self._select_distinct_indices(self.population_size, n_indices=3)
+
+        # NOTE: The arithmetic below is done in place to avoid allocating temporary arrays of the
+        # population size for each operation.
+        if self.strategy == "rand/1":
+            # Mutation: v = x_r1 + F * (x_r2 - x_r3)
+            mutant = valid_population[r2] - valid_population[r3]
+            mutant *= self.F
+            mutant += valid_population[r1]
+        else:
+            # Mutation (best/1): v = x_best + F * (x_r1 - x_r2)
+            # Mutation (current-to-best/1): v = x_i + F * (x_best - x_i) + F * (x_r1 - x_r2)
+            best = valid_population[self._best_index(sign)]
+            mutant = valid_population[r1] - valid_population[r2]
+            if self.strategy == "current-to-best/1":
+                mutant += best - valid_population
+            mutant *= self.F
+            mutant += best if self.strategy == "best/1" else valid_population
+
+        # Clip mutant vectors to bounds for active dimensions
+        np.clip(mutant, lower_bound, upper_bound, out=mutant)
+
+        # Crossover: combine target vectors with mutant vectors
+        n_dims = len(active_indices)
+        crossover_mask = self._rng.rng.rand(self.population_size, n_dims) < self.CR
+
+        # Ensure at least one parameter is taken from mutant vector
+        no_crossover = np.flatnonzero(~crossover_mask.any(axis=1))
+        crossover_mask[no_crossover, self._rng.rng.randint(n_dims, size=len(no_crossover))] = True
+
+        # ``valid_population`` is already a copy, so the target vectors can be overwritten.
+        np.copyto(valid_population, mutant, where=crossover_mask)
+        return valid_population
 
-            # Mutation: v = x_r1 + F * (x_r2 - x_r3) for active indices only
-            mutant = valid_population[r1] + self.F * (valid_population[r2] - valid_population[r3])
-            # Clip mutant vector to bounds for active dimensions
-            mutant = np.clip(
-                mutant, self.lower_bound[active_indices], self.upper_bound[active_indices]
+    def _select_distinct_indices(self, population_size: int, n_indices: int) -> np.ndarray:
+        """Draw ``n_indices`` distinct individuals for each target individual at once.
+
+        For each target ``i``, the k-th index is drawn uniformly from ``population_size - k - 1``
+        candidates and then shifted over the already excluded indices (``i`` and the previously
+        drawn indices) in ascending order, which yields uniform sampling without replacement.
+
+        Args:
+            population_size:
+                Number of individuals in the population.
+            n_indices:
+                Number of distinct indices to draw for each individual.
+
+        Returns:
+            np.ndarray:
+                Array of indices (n_indices x population_size).
+        """
+        if population_size <= n_indices:
+            raise ValueError(
+                f"Population size must be larger than {n_indices}, but got {population_size}."
             )
 
-            # Crossover: combine target vector with mutant vector
-            trial = np.copy(valid_population[i])
-            crossover_mask = self._rng.rng.rand(len(active_indices)) < self.CR
+        excluded = np.arange(population_size)[:, np.newaxis]
+        for k in range(n_indices):
+            index = self._rng.rng.randint(population_size - k - 1, size=population_size)
+            for column in np.sort(excluded, axis=1).T:
+                index += index >= column
+            excluded = np.column_stack([excluded, index])
+
+        return excluded[:, 1:].T
 
-            # Ensure at least one parameter is taken from mutant vector
-            if not np.any(crossover_mask):
-                crossover_mask[self._rng.rng.randint(len(active_indices))] = True
-            trial[crossover_mask] = mutant[crossover_mask]
+    def _best_index(self, sign: int) -> int:
+        """Return the index of the best individual in the current population.
+
+        Args:
+            sign:
+                1 for minimization and -1 for maximization.
 
-            trial_vectors[i] = trial
+        Returns:
+            int:
+                The index of the individual with the best fitness.
+        """
+        if self.fitness is None:
+            raise ValueError("Fitness array must be initialized before this operation.")
 
-        return trial_vectors
+        # ``self.fitness`` stores raw objective values, so flip the sign for maximization.
+        fitness = np.where(np.isnan(self.fitness), np.inf, sign * self.fitness)
+        return int(np.argmin(fitness))
 
     def _debug_print(self, message: str) -> None:
         """Print debug message if debug mode is enabled.
@@ -470,12 +548,12 @@ class DESampler(optunahub.samplers.SimpleBaseSampler):
                 self._debug_print(f"Best fitness: {np.nanmin(sign * self.fitness):.6f}")
 
                 # Generate new trial vectors for current generation
-                self.current_gen_vectors = self._generate_trial_vectors(active_indices)
+                self.current_gen_vectors = self._generate_trial_vectors(active_indices, sign)
                 self.last_processed_gen = current_generation
 
         # Ensure we have trial vectors for current generation
         if self.current_gen_vectors is None:
-            self.current_gen_vectors = self._generate_trial_vectors(active_indices)
+            self.current_gen_vectors = self._generate_trial_vectors(active_indices, sign)
 
         # Combine numerical and categorical parameters
         numerical_params = {
@@ -54,8 +54,8 @@ import pytest
 
 # NOTE(nabenabe): This file content is mostly copied from the Optuna repository.
 The_Sampler = optunahub.load_local_module(
-    package="package/samplers/differential_evolution",
-    registry_root="/home/j/experiments/optunahub-registry",
+    package="samplers/differential_evolution",
+    registry_root="package/",
 ).DESampler
 
 
@@ -755,3 +755,54 @@ def test_cache_is_invalidated(
             return -1
 
         study.optimize(objective, n_trials=10, n_jobs=n_jobs)
+
+
+@pytest.mark.parametrize("strategy", ["rand/1", "best/1", "current-to-best/1"])
+def test_strategy(strategy: str) -> None:
+    sampler = The_Sampler(population_size=10, strategy=strategy, seed=0)
+    study = optuna.study.create_study(sampler=sampler)
+    study.optimize(lambda t: t.suggest_float("x", -10, 10) ** 2, n_trials=50)
+    assert all(-10 <= t.params["x"] <= 10 for t in study.trials)
+
+
+@pytest.mark.parametrize(
+    "strategy, sign, expected",
+    [
+        # v_i = x_r1 + F * (x_r2 - x_r3)
+        ("rand/1", 1, [[1, 3], [6, 8], [6, 3], [1, -2]]),
+        # v_i = x_best + F * (x_r1 - x_r2), where x_best = x_1 for minimization.
+        ("best/1", 1, [[5, 0], [1, 3], [8, 4], [2, 1]]),
+        # x_best = x_3 for maximization, and the mutant of x_2 is clipped to the upper bound.
+        ("best/1", -1, [[9, 2], [5, 5], [10, 6], [6, 3]]),
+        # v_i = x_i + F * (x_best - x_i) + F * (x_r1 - x_r2)
+        ("current-to-best/1", 1, [[3, -1], [1, 3], [7, 6], [4, 2]]),
+    ],
+)
+def test_mutant(strategy: str, sign: int, expected: list[list[float]]) -> None:
+    sampler = The_Sampler(population_size=4, F=0.5, CR=1.0, strategy=strategy, seed=0)
+    sampler.population = np.array([[0.0, 0.0], [4.0, 2.0], [2.0, 6.0], [8.0, 4.0]])
+    sampler.fitness = np.array([3.0, 1.0, 2.0, 4.0])
+    sampler.lower_bound = np.array([-10.0, -10.0])
+    sampler.upper_bound = np.array([10.0, 10.0])
+    # The i-th column holds r1, r2 and r3 of the i-th individual.
+    indices = np.array([[1, 2, 3, 0], [2, 3, 0, 1], [3, 0, 1, 2]])
+
+    # All the parameters are taken from the mutants since ``CR`` is 1.
+    with patch.object(sampler, "_select_distinct_indices", return_value=indices):
+        trial_vectors = sampler._generate_trial_vectors([0, 1], sign)
+    np.testing.assert_array_equal(trial_vectors, expected)
+
+
+def test_invalid_strategy() -> None:
+    with pytest.raises(ValueError):
+        The_Sampler(strategy="rand/2")
+
+
+def test_select_distinct_indices() -> None:
+    sampler = The_Sampler(seed=0)
+    population_size = 5
+    for _ in range(100):
+        indices = sampler._select_distinct_indices(population_size, n_indices=3)
+        assert indices.shape == (3, population_size)
+        for i in range(population_size):
+            assert len({i, *indices[:, i]}) == 4
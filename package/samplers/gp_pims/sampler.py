@@ -2,11 +2,18 @@ from __future__ import annotations
 
 from abc import ABCMeta
 from abc import abstractmethod
-from abc.collections import Callable
+from collections.abc import Callable
+import os
 import time
+import types
 from typing import Any
 
 import GPy
+from GPy.inference.latent_function_inference import ExactGaussianInference
+from GPy.inference.latent_function_inference.posterior import PosteriorExact
+from GPy.util import diag
+from GPy.util.linalg import dpotrs
+from GPy.util.linalg import dtrtrs
 import numpy as np
 import optuna
 from optuna.distributions import FloatDistribution
@@ -15,6 +22,18 @@ from scipy import optimize
 from scipy.stats import qmc
 
 
+def _load_simple() -> types.ModuleType:
+    # ``samplers/simple`` provides ``TrialCursor``. It is loaded from the registry this package is
+    # loaded from if it is there, e.g., in a clone of the registry.
+    registry_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if os.path.isfile(os.path.join(registry_root, "samplers", "simple", "__init__.py")):
+        return optunahub.load_local_module("samplers/simple", registry_root=registry_root)
+    return optunahub.load_module("samplers/simple")
+
+
+TrialCursor = _load_simple().TrialCursor
+
+
 class RFM_RBF:
     """
     rbf(gaussian) kernel of GPy k(x, y) = variance * exp(- 0.5 * ||x - y||_2^2 / lengthscale**2)
@@ -47,6 +66,121 @@ class RFM_RBF:
         )
         return X_transform_grad
 
+    def weighted_transform_grad(self, X: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """
+        Return the gradients of ``transform(X)[i].dot(weights[i])`` with respect to ``X[i]`` for
+        each row of X (N \times input_dim), where weights is (N \times basis_dim).
+        """
+        X = np.atleast_2d(X)
+        X_transform_grad = X.dot(self.random_weights.T) + self.random_offset
+        X_transform_grad = -self.std * np.sqrt(2 / self.basis_dim) * np.sin(X_transform_grad)
+        return (X_transform_grad * weights).dot(self.random_weights)
+
+
+class IncrementalExactGaussianInference(ExactGaussianInference):
+    """
+    Exact Gaussian inference that extends the Cholesky factor of the previous inference.
+
+    If ``append`` is True, and the inputs are the previous inputs followed by new ones while the
+    hyperparameters are unchanged, only the rows of the new inputs are added to the Cholesky
+    factor, which costs O(N^2) instead of O(N^3). The gradients with respect to the
+    hyperparameters are not computed in this case, so ``append`` must be False while the
+    hyperparameters are optimized.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.append = False
+        self._X: np.ndarray | None = None
+        self._K: np.ndarray | None = None
+        self._LW: np.ndarray | None = None
+        self._hyperparameters: np.ndarray | None = None
+
+    def inference(
+        self,
+        kern: GPy.kern.src.kern.Kern,
+        X: np.ndarray,
+        likelihood: GPy.likelihoods.Likelihood,
+        Y: np.ndarray,
+        mean_function: GPy.core.Mapping | None = None,
+        Y_metadata: dict | None = None,
+        K: np.ndarray | None = None,
+        variance: np.ndarray | None = None,
+        Z_tilde: float | None = None,
+    ) -> tuple[PosteriorExact, float, dict[str, np.ndarray]]:
+        if variance is None:
+            variance = likelihood.gaussian_variance(Y_metadata)
+        hyperparameters = np.r_[kern.param_array, np.ravel(variance)]
+
+        if (
+            self.append
+            and mean_function is None
+            and K is None
+            and Z_tilde is None
+            and self._can_append(X, hyperparameters)
+        ):
+            try:
+                return self._append_inference(kern, X, likelihood, Y, Y_metadata, variance)
+            except np.linalg.LinAlgError:
+                pass
+
+        posterior, log_marginal, grad_dict = super().inference(
+            kern, X, likelihood, Y, mean_function, Y_metadata, K, variance, Z_tilde
+        )
+        self._X = np.array(X)
+        self._K = posterior._K
+        self._LW = posterior.woodbury_chol
+        self._hyperparameters = hyperparameters
+        return posterior, log_marginal, grad_dict
+
+    def _can_append(self, X: np.ndarray, hyperparameters: np.ndarray) -> bool:
+        return (
+            self._X is not None
+            and self._hyperparameters is not None
+            and len(X) > len(self._X)
+            and np.array_equal(hyperparameters, self._hyperparameters)
+            and np.array_equal(X[: len(self._X)], self._X)
+        )
+
+    def _append_inference(
+        self,
+        kern: GPy.kern.src.kern.Kern,
+        X: np.ndarray,
+        likelihood: GPy.likelihoods.Likelihood,
+        Y: np.ndarray,
+        Y_metadata: dict | None,
+        variance: np.ndarray,
+    ) -> tuple[PosteriorExact, float, dict[str, np.ndarray]]:
+        assert self._X is not None and self._K is not None and self._LW is not None
+        n_old = len(self._X)
+        K_old_new = kern.K(self._X, X[n_old:])
+        K_new = kern.K(X[n_old:])
+        Ky_new = K_new.copy()
+        diag.add(Ky_new, variance + 1e-8)
+
+        # [[L, 0], [L_21, L_22]] is the Cholesky factor of [[Ky, K_12], [K_12^T, Ky_new]].
+        L_21 = dtrtrs(self._LW, K_old_new, lower=1)[0].T
+        L_22 = np.linalg.cholesky(Ky_new - L_21.dot(L_21.T))
+        LW = np.asfortranarray(np.block([[self._LW, np.zeros_like(K_old_new)], [L_21, L_22]]))
+        K = np.block([[self._K, K_old_new], [K_old_new.T, K_new]])
+
+        alpha, _ = dpotrs(LW, Y, lower=1)
+        W_logdet = 2.0 * np.sum(np.log(np.diag(LW)))
+        log_marginal = 0.5 * (
+            -Y.size * np.log(2 * np.pi) - Y.shape[1] * W_logdet - np.sum(alpha * Y)
+        )
+        dL_dK = np.zeros_like(K)
+        dL_dthetaL = likelihood.exact_inference_gradients(np.diag(dL_dK), Y_metadata)
+
+        self._X = np.array(X)
+        self._K = K
+        self._LW = LW
+        return (
+            PosteriorExact(woodbury_chol=LW, woodbury_vector=alpha, K=K),
+            log_marginal,
+            {"dL_dK": dL_dK, "dL_dthetaL": dL_dthetaL, "dL_dm": alpha},
+        )
+
 
 def minimize(
     func: Callable,
@@ -86,6 +220,102 @@ def minimize(
     return x[min_index], func_values[min_index]
 
 
+def _batched_lbfgsb(
+    func: Callable, start_points: np.ndarray, groups: np.ndarray, bounds: list, ftol: float
+) -> tuple[np.ndarray, np.ndarray]:
+    n_points, input_dim = np.shape(start_points)
+
+    # The start points are optimized as one point of the stacked space by one L-BFGS-B run, whose
+    # objective is the sum of the values at the start points. Since each term only depends on its
+    # own block, the minimizer of the sum consists of the minimizers of the terms, and the points
+    # of all the blocks are evaluated by one call of ``func`` per iteration.
+    last_z: np.ndarray | None = None
+    last_values = np.empty(n_points)
+
+    def summed_func(z: np.ndarray) -> tuple[float, np.ndarray]:
+        nonlocal last_z
+        values, grads = func(z.reshape(n_points, input_dim), groups)
+        last_z = np.copy(z)
+        last_values[:] = values
+        return float(np.sum(values)), np.asarray(grads, dtype=float).ravel()
+
+    # The decrease of the sum is relative to the sum of the values, so that ``ftol`` is divided by
+    # the number of the points to keep the threshold of the decrease about that of one point.
+    res = optimize.minimize(
+        summed_func,
+        x0=np.ravel(start_points),
+        bounds=list(bounds) * n_points,
+        method="L-BFGS-B",
+        options={"ftol": ftol / n_points},
+        jac=True,
+    )
+    x = res["x"].reshape(n_points, input_dim)
+    if last_z is None or not np.array_equal(last_z, res["x"]):
+        return x, np.asarray(func(x, groups)[0], dtype=float)
+    return x, np.copy(last_values)
+
+
+def minimize_batched(
+    func: Callable,
+    start_points: np.ndarray,
+    bounds: list,
+    groups: np.ndarray | None = None,
+    num_starts: int | None = None,
+    first_ftol: float = 1e-1,
+    second_ftol: float = 1e-2,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Batched version of ``minimize``. All the start points are optimized together by one L-BFGS-B
+    run of the sum of the values at the points, so that the points are evaluated by one call of
+    ``func`` per iteration. Note that the stopping test is applied to the sum, so that a point may
+    stop at a different iterate from ``minimize``.
+
+    Parameter
+    -----------------------
+    func: Callable
+        A function that returns the values (N,) and the gradients (N \times input_dim) at
+        the given points (N \times input_dim) of the given groups (N,).
+    groups: numpy array
+        The group index of each start point (N,). The points in the same group minimize the
+        same function, and the best point is returned for each group.
+    num_starts: int
+        If given, the function is evaluated at all the start points and only the best num_starts
+        points of each group are optimized.
+
+    Return
+    -----------------------
+    x_min, f_min: numpy array
+        The best points (n_groups \times input_dim) and values (n_groups,) of each group.
+    """
+    group_index = np.zeros(np.shape(start_points)[0], dtype=int) if groups is None else groups
+    n_groups = np.max(group_index) + 1
+
+    if num_starts is not None:
+        values = func(start_points, group_index)[0]
+        order = np.lexsort((values, group_index))
+        rank = np.arange(len(order)) - np.searchsorted(group_index[order], group_index[order])
+        selected = np.sort(order[rank < num_starts])
+        start_points = start_points[selected]
+        group_index = group_index[selected]
+
+    x, func_values = _batched_lbfgsb(func, np.copy(start_points), group_index, bounds, first_ftol)
+
+    if second_ftol < first_ftol:
+        f_min = np.full(n_groups, np.inf)
+        f_max = np.full(n_groups, -np.inf)
+        np.minimum.at(f_min, group_index, func_values)
+        np.maximum.at(f_max, group_index, func_values)
+        index = np.where(func_values <= (f_min + (f_max - f_min) * 1e-1)[group_index])[0]
+        x[index], func_values[index] = _batched_lbfgsb(
+            func, x[index], group_index[index], bounds, second_ftol
+        )
+
+    # Sort by the values within each group and take the first point of each group.
+    order = np.lexsort((func_values, group_index))
+    first = order[np.searchsorted(group_index[order], np.arange(n_groups))]
+    return x[first], func_values[first]
+
+
 class GPy_model(GPy.models.GPRegression):
     def __init__(
         self,
@@ -97,6 +327,7 @@ class GPy_model(GPy.models.GPRegression):
     ) -> None:
         super().__init__(X=X, Y=Y, kernel=kernel, noise_var=noise_var, normalizer=normalizer)
         self[".*Gaussian_noise.variance"].constrain_fixed(noise_var)
+        self.inference_method = IncrementalExactGaussianInference()
 
         if normalizer:
             self.std = self.normalizer.std.copy()
@@ -105,6 +336,33 @@ class GPy_model(GPy.models.GPRegression):
             self.std = 1.0
             self.mean = 0.0
 
+    def parameters_changed(self) -> None:
+        if not getattr(self.inference_method, "append", False):
+            super().parameters_changed()
+            return
+
+        # The gradients of the hyperparameters are not computed since they are not optimized when
+        # new data points are appended.
+        self.posterior, self._log_marginal_likelihood, self.grad_dict = (
+            self.inference_method.inference(
+                self.kern,
+                self.X,
+                self.likelihood,
+                self.Y_normalized,
+                self.mean_function,
+                self.Y_metadata,
+            )
+        )
+
+    def predict_mean(self, X: np.ndarray) -> np.ndarray:
+        """
+        Return the predictive mean (N,) at the inputs X (N \times input_dim) without computing
+        the predictive variance.
+        """
+        X = np.atleast_2d(X)
+        mean = self.kern.K(X, self.X).dot(self.posterior.woodbury_vector).ravel()
+        return mean * self.std + self.mean
+
     def minus_predict(self, x: np.ndarray) -> float:
         x = np.atleast_2d(x)
         return -1 * super().predict_noiseless(x)[0]
@@ -116,6 +374,32 @@ class GPy_model(GPy.models.GPRegression):
         mu_jac = super().predictive_gradients(x)[0].ravel()
         return -1 * mu_jac
 
+    def predict_noiseless_with_gradients(
+        self, X: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return the predictive mean (N,), the predictive variance (N,), and their gradients
+        (N \times input_dim) at the inputs X (N \times input_dim).
+        """
+        X = np.atleast_2d(X)
+        Kx = self.kern.K(X, self.X)
+        woodbury_vector = self.posterior.woodbury_vector
+        # Kx_Kinv is K(X, self.X) K^{-1}, which is obtained from the Cholesky factor.
+        Kx_Kinv = dpotrs(self.posterior.woodbury_chol, Kx.T, lower=1)[0].T
+
+        mean = Kx.dot(woodbury_vector).ravel()
+        var = self.kern.Kdiag(X) - np.sum(Kx * Kx_Kinv, axis=1)
+        mean_grad = self.kern.gradients_X(woodbury_vector.T, X, self.X)
+        var_grad = self.kern.gradients_X_diag(np.ones(np.shape(X)[0]), X) + self.kern.gradients_X(
+            -2.0 * Kx_Kinv, X, self.X
+        )
+        return (
+            mean * self.std + self.mean,
+            var * self.std**2,
+            mean_grad * self.std,
+            var_grad * self.std**2,
+        )
+
     def posterior_covariance_between_points(self, X1: np.ndarray, X2: np.ndarray) -> np.ndarray:
         Kx1 = self.kern.K(X1, self.X)
         Kx2 = self.kern.K(self.X, X2)
@@ -145,10 +429,12 @@ class GPy_model(GPy.models.GPRegression):
         new_X = np.r_[self.X, X]
         new_Y = np.r_[self.Y, Y]
 
-        fidelity_sort_index = np.argsort(new_X[:, -1])
-        new_X = new_X[fidelity_sort_index]
-        new_Y = new_Y[fidelity_sort_index]
-        self.set_XY(new_X, new_Y)
+        # The new data points are appended to keep the previous Cholesky factor valid.
+        self.inference_method.append = True
+        try:
+            self.set_XY(new_X, new_Y)
+        finally:
+            self.inference_method.append = False
 
         if self.normalizer is not None:
             self.std = self.normalizer.std.copy()
@@ -224,6 +510,8 @@ class BO_core(object):
         self.sampling_num = 10
         self.inference_point = None
         self.top_number = 50
+        # The number of start points of L-BFGS-B selected from the candidates for each function.
+        self.num_starts = 10
         self.preprocessing_time = 0.0
         self.max_inputs = None
 
@@ -239,6 +527,10 @@ class BO_core(object):
     def acq(self, x: np.ndarray) -> np.ndarray:
         pass
 
+    @abstractmethod
+    def acq_with_gradients(self, x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        pass
+
     @abstractmethod
     def next_input(self) -> np.ndarray:
         pass
@@ -263,8 +555,7 @@ class BO_core(object):
         if np.shape(self.unique_X)[0] <= self.top_number:
             x0s = np.r_[x0s, self.unique_X]
         else:
-            mean, _ = self.GPmodel.predict(self.unique_X)
-            mean = mean.ravel()
+            mean = self.GPmodel.predict_mean(self.unique_X)
             top_idx = np.argpartition(mean, -self.top_number)[-self.top_number :]
             x0s = np.r_[x0s, self.unique_X[top_idx]]
 
@@ -284,6 +575,14 @@ class BO_core(object):
     def sampling_RFM(
         self, pool_X: np.ndarray | None = None, MES_correction: bool = True
     ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Sample the maximum values of sampling_num posterior sample paths.
+
+        The sample paths are drawn by pathwise conditioning, i.e., f_s(x) = phi(x)^T w_s +
+        k(x, X) v_s, where phi is the random features of the prior with w_s ~ N(0, I) and v_s is
+        obtained from the Cholesky factor of the GP model. All the sample paths are maximized
+        together by one batched L-BFGS-B run.
+        """
         # 基底をサンプリング, n_compenontsは基底数, random_stateは基底サンプリング時のseed的なの
         basis_dim = 500 + np.shape(self.GPmodel.X)[0]
         self.rbf_features = RFM_RBF(
@@ -292,31 +591,20 @@ class BO_core(object):
             basis_dim=basis_dim,
         )
         X_train_features = self.rbf_features.transform(self.GPmodel.X)
+        noise_var = self.GPmodel[".*Gaussian_noise.variance"].values
 
-        max_sample = np.zeros(self.sampling_num)
-        max_inputs = list()
-
-        A_inv = np.linalg.inv(
-            (X_train_features.T).dot(X_train_features)
-            + np.eye(self.rbf_features.basis_dim)
-            * self.GPmodel[".*Gaussian_noise.variance"].values
+        self.weights_sample = np.random.normal(0, 1, size=(basis_dim, self.sampling_num))
+        noise_sample = np.sqrt(noise_var) * np.random.normal(
+            0, 1, size=(np.shape(self.GPmodel.X)[0], self.sampling_num)
         )
-        weights_mean = A_inv.dot(X_train_features.T).dot(
+        residuals = (
             (self.GPmodel.Y - self.GPmodel.mean) / self.GPmodel.std
+            - X_train_features.dot(self.weights_sample)
+            - noise_sample
         )
-        weights_var = A_inv * self.GPmodel[".*Gaussian_noise.variance"].values
-
-        try:
-            L = np.linalg.cholesky(weights_var)
-        except np.linalg.LinAlgError as e:
-            print("In RFM-based sampling,", e)
-            L = np.linalg.cholesky(weights_var + 1e-5 * np.eye(np.shape(weights_var)[0]))
-
-        # 自分で多次元正規乱数のサンプリング
-        standard_normal_rvs = np.random.normal(
-            0, 1, size=(np.size(weights_mean), self.sampling_num)
-        )
-        self.weights_sample = np.c_[weights_mean] + L.dot(standard_normal_rvs)
+        self.update_weights_sample = dpotrs(
+            self.GPmodel.posterior.woodbury_chol, residuals, lower=1
+        )[0]
 
         if pool_X is None:
             num_start = 100 * self.input_dim
@@ -328,46 +616,59 @@ class BO_core(object):
             if np.shape(self.unique_X)[0] <= self.top_number:
                 x0s = np.r_[x0s, self.unique_X]
             else:
-                mean, _ = self.GPmodel.predict(self.unique_X)
-                mean = mean.ravel()
+                mean = self.GPmodel.predict_mean(self.unique_X)
                 top_idx = np.argpartition(mean, -self.top_number)[-self.top_number :]
                 x0s = np.r_[x0s, self.unique_X[top_idx]]
-        else:
-            if np.size(pool_X[(self._upper_bound(pool_X) >= self.y_max).ravel()]) > 0:
-                pool_X = pool_X[(self._upper_bound(pool_X) >= self.y_max).ravel()]
-
-        for j in range(self.sampling_num):
 
-            def BLR(x: np.ndarray) -> np.ndarray:
-                X_features = self.rbf_features.transform(x)
-                sampled_value = X_features.dot(np.c_[self.weights_sample[:, j]])
-                return -(sampled_value * self.GPmodel.std + self.GPmodel.mean).ravel()
+            # Each sample path is optimized from all the start points.
+            groups: np.ndarray = np.repeat(np.arange(self.sampling_num), np.shape(x0s)[0])
 
-            def BLR_gradients(x: np.ndarray) -> np.ndarray:
-                X_features = self.rbf_features.transform_grad(x)
-                sampled_value = X_features.dot(np.c_[self.weights_sample[:, j]])
-                return -(sampled_value * self.GPmodel.std).ravel()
+            def BLR(x: np.ndarray, path_index: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+                values, grads = self._sample_path_with_gradients(x, path_index)
+                return -values, -grads
 
-            if pool_X is None:
-                f_min = np.inf
-                x_min = x0s[0]
+            max_inputs, f_min = minimize_batched(
+                BLR,
+                np.tile(x0s, (self.sampling_num, 1)),
+                self.bounds_list,
+                groups=groups,
+                num_starts=self.num_starts,
+            )
+            max_sample: np.ndarray = -1 * f_min
+        else:
+            candidates = pool_X
+            if np.size(pool_X[(self._upper_bound(pool_X) >= self.y_max).ravel()]) > 0:
+                candidates = pool_X[(self._upper_bound(pool_X) >= self.y_max).ravel()]
 
-                x_min, f_min = minimize(BLR, x0s, self.bounds_list, jac=BLR_gradients)
-                max_sample[j] = -1 * f_min
-                max_inputs.append(x_min)
-            else:
-                pool_Y = BLR(pool_X)
-                min_index = np.argmin(pool_Y)
-                max_sample[j] = -1 * pool_Y[min_index]
-                max_inputs.append(pool_X[min_index])
+            pool_Y = self.sample_path(candidates)
+            max_index = np.argmax(pool_Y, axis=0)
+            max_sample = pool_Y[max_index, np.arange(self.sampling_num)]
+            max_inputs = candidates[max_index]
 
         # Values smaller than the observed maximum + 3 times the observed noise are corrected.
         if MES_correction:
-            correction_value = self.y_max + 5 * np.sqrt(
-                self.GPmodel[".*Gaussian_noise.variance"].values
-            )
+            correction_value = self.y_max + 5 * np.sqrt(noise_var)
             max_sample[max_sample < correction_value] = correction_value
-        return max_sample, np.array(max_inputs)
+        return max_sample, max_inputs
+
+    def _sample_path_with_gradients(
+        self, X: np.ndarray, path_index: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return the values (N,) and the gradients (N \times input_dim) of the sample paths, where
+        the i-th input X[i] is evaluated by the path_index[i]-th sample path.
+        """
+        weights = self.weights_sample[:, path_index].T
+        update_weights = self.update_weights_sample[:, path_index].T
+        Kx = self.GPmodel.kern.K(X, self.GPmodel.X)
+
+        values = np.sum(self.rbf_features.transform(X) * weights, axis=1) + np.sum(
+            Kx * update_weights, axis=1
+        )
+        grads = self.rbf_features.weighted_transform_grad(
+            X, weights
+        ) + self.GPmodel.kern.gradients_X(update_weights, X, self.GPmodel.X)
+        return values * self.GPmodel.std + self.GPmodel.mean, grads * self.GPmodel.std
 
     def sample_path(self, X: np.ndarray) -> np.ndarray:
         """
@@ -385,8 +686,9 @@ class BO_core(object):
         """
         X_features = self.rbf_features.transform(X)
         sampled_outputs = (
-            X_features.dot(np.c_[self.weights_sample]) * self.GPmodel.std + self.GPmodel.mean
-        )
+            X_features.dot(self.weights_sample)
+            + self.GPmodel.kern.K(X, self.GPmodel.X).dot(self.update_weights_sample)
+        ) * self.GPmodel.std + self.GPmodel.mean
         return sampled_outputs
 
 
@@ -415,19 +717,23 @@ class BO(BO_core):
         if np.shape(self.unique_X)[0] <= self.top_number:
             x0s = np.r_[x0s, self.unique_X]
         else:
-            mean, _ = self.GPmodel.predict(self.unique_X)
-            mean = mean.ravel()
+            mean = self.GPmodel.predict_mean(self.unique_X)
             top_idx = np.argpartition(mean, -self.top_number)[-self.top_number :]
             x0s = np.r_[x0s, self.unique_X[top_idx]]
 
-        f_min = np.inf
-        x_min = x0s[0]
         if self.max_inputs is not None:
             x0s = np.r_[x0s, self.max_inputs]
 
-        x_min, f_min = minimize(self.acq, x0s, self.bounds_list, first_ftol=1e-2, second_ftol=1e-3)
-        print("optimized acquisition function value:", -1 * f_min)
-        return np.atleast_2d(x_min)
+        x_min, f_min = minimize_batched(
+            lambda x, _: self.acq_with_gradients(x),
+            x0s,
+            self.bounds_list,
+            num_starts=self.num_starts,
+            first_ftol=1e-2,
+            second_ftol=1e-3,
+        )
+        print("optimized acquisition function value:", -1 * f_min[0])
+        return np.atleast_2d(x_min[0])
 
 
 class PI_from_MaxSample(BO):
@@ -468,6 +774,14 @@ class PI_from_MaxSample(BO):
 
         return ((self.maximums - mean) / std).ravel()
 
+    def acq_with_gradients(self, x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        mean, var, mean_grad, var_grad = self.GPmodel.predict_noiseless_with_gradients(x)
+        std = np.sqrt(np.maximum(var, 1e-20))
+
+        values = (self.maximums - mean) / std
+        grads = -(mean_grad + values[:, None] * var_grad / (2 * std[:, None])) / std[:, None]
+        return values, grads
+
 
 class PIMSSampler(optunahub.samplers.SimpleBaseSampler):
     def __init__(
@@ -488,6 +802,9 @@ class PIMSSampler(optunahub.samplers.SimpleBaseSampler):
             self.bounds[1, i] = d.high
 
         self.optimizer: PI_from_MaxSample | None = None
+        self._n_observed = 0
+        # The trials still running at the previous call are observed once they complete.
+        self._cursor = TrialCursor()
 
     def sample_relative(
         self,
@@ -498,37 +815,31 @@ class PIMSSampler(optunahub.samplers.SimpleBaseSampler):
         if search_space == {}:
             return {}
 
-        states = (optuna.trial.TrialState.COMPLETE,)
-        trials = study._get_trials(deepcopy=False, states=states, use_cache=True)
+        new_trials = self._collect_new_trials(study)
+        n_trials = self._n_observed + len(new_trials)
 
-        if len(trials) < 1:
+        if n_trials < 1:
             return {}
-        elif self.optimizer is None:
-            X = np.zeros((len(trials), len(search_space)))
-            for i, trial in enumerate(trials):
-                X[i, :] = np.asarray(list(trial.params.values()))
 
-            _sign = -1.0 if study.direction == optuna.study.StudyDirection.MINIMIZE else 1.0
-            Y = np.zeros((len(trials), 1))
-            for i, trial in enumerate(trials):
-                Y[i, 0] = _sign * trial.value
+        X = np.asarray([[t.params[name] for name in search_space] for t in new_trials])
+        _sign = -1.0 if study.direction == optuna.study.StudyDirection.MINIMIZE else 1.0
+        Y = np.asarray([[_sign * t.value] for t in new_trials])
+        self._n_observed = n_trials
 
+        if self.optimizer is None:
             self.optimizer = PI_from_MaxSample(
                 X=X,
                 Y=Y,
                 bounds=self.bounds,
                 kernel_bounds=self.kernel_bounds,
             )
-        else:
-            assert self.optimizer is not None
-            X_new = np.asarray(list(trials[-1].params.values()))
-            _sign = -1.0 if study.direction == optuna.study.StudyDirection.MINIMIZE else 1.0
-            Y_new = _sign * trials[-1].value
-
-            if len(trials) % 5 == 4:
-                self.optimizer.update(np.atleast_2d(X_new), np.atleast_2d(Y_new), optimize=True)
+        elif len(new_trials) > 0:
+            # The hyperparameters are optimized every five trials. Otherwise, the new trials are
+            # appended to the Cholesky factor of the GP model.
+            if n_trials % 5 == 4:
+                self.optimizer.update(X, Y, optimize=True)
             else:
-                self.optimizer.update(np.atleast_2d(X_new), np.atleast_2d(Y_new), optimize=False)
+                self.optimizer.update(X, Y, optimize=False)
 
         new_inputs = self.optimizer.next_input()
 
@@ -536,3 +847,11 @@ class PIMSSampler(optunahub.samplers.SimpleBaseSampler):
         for name, value in zip(search_space.keys(), new_inputs[0]):
             params[name] = value
         return params
+
+    def _collect_new_trials(self, study: optuna.study.Study) -> list[optuna.trial.FrozenTrial]:
+        finished_trials, restarted = self._cursor.update(study)
+        if restarted:
+            # The GP model of another study must not be used.
+            self.optimizer = None
+            self._n_observed = 0
+        return [t for t in finished_trials if t.state == optuna.trial.TrialState.COMPLETE]
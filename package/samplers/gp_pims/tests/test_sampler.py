@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+import optuna
+import optunahub
+import pytest
+
+
+pytest.importorskip("GPy")
+
+gp_pims = optunahub.load_local_module("samplers/gp_pims", registry_root="../../")
+
+
+def _rastrigin(X: np.ndarray, groups: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # A multi-modal function whose minimizer is shifted by the group index.
+    Y = X - 0.3 * groups[:, None]
+    return np.sum(Y**2 - 3 * np.cos(3 * Y), axis=1), 2 * Y + 9 * np.sin(3 * Y)
+
+
+def _sphere(X: np.ndarray, groups: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # A convex function whose minimizer is shifted by the group index.
+    Y = X - 0.3 * groups[:, None]
+    return np.sum(Y**2, axis=1), 2 * Y
+
+
+@pytest.mark.parametrize("num_starts", [None, 3])
+def test_minimize_batched_finds_minimizer_of_each_group(num_starts: int | None) -> None:
+    n_groups = 4
+    n_points = 10
+    bounds = [(-4.0, 4.0)] * 3
+    start_points = np.random.RandomState(0).uniform(-4, 4, (n_groups * n_points, 3))
+    groups: np.ndarray = np.repeat(np.arange(n_groups), n_points)
+
+    n_evaluated = []
+
+    def func(X: np.ndarray, groups: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        n_evaluated.append(len(X))
+        return _sphere(X, groups)
+
+    x_batched, f_batched = gp_pims.sampler.minimize_batched(
+        func, start_points, bounds, groups=groups, num_starts=num_starts
+    )
+
+    expected = 0.3 * np.arange(n_groups)[:, None] * np.ones(3)
+    np.testing.assert_allclose(x_batched, expected, atol=1e-4)
+    np.testing.assert_allclose(f_batched, 0.0, atol=1e-8)
+    # All the start points are evaluated by one call in each iteration.
+    n_starts = n_groups * (n_points if num_starts is None else num_starts)
+    if num_starts is not None:
+        assert n_evaluated.pop(0) == n_groups * n_points
+    assert n_evaluated[0] == n_starts
+    assert set(n_evaluated) <= set(range(1, n_starts + 1))
+
+
+@pytest.mark.parametrize("num_starts", [None, 3])
+def test_minimize_batched_improves_start_points(num_starts: int | None) -> None:
+    n_groups = 4
+    n_points = 10
+    bounds = [(-4.0, 4.0)] * 3
+    start_points = np.random.RandomState(0).uniform(-4, 4, (n_groups * n_points, 3))
+    groups: np.ndarray = np.repeat(np.arange(n_groups), n_points)
+
+    x_batched, f_batched = gp_pims.sampler.minimize_batched(
+        _rastrigin, start_points, bounds, groups=groups, num_starts=num_starts
+    )
+
+    np.testing.assert_allclose(f_batched, _rastrigin(x_batched, np.arange(n_groups))[0])
+    start_values = _rastrigin(start_points, groups)[0]
+    for k in range(n_groups):
+        assert f_batched[k] < np.min(start_values[groups == k])
+    # The best points are local minima in the interior of the bounds.
+    assert np.all(np.abs(x_batched) < 4.0)
+    np.testing.assert_allclose(_rastrigin(x_batched, np.arange(n_groups))[1], 0.0, atol=0.1)
+
+
+def test_minimize_batched_propagates_errors() -> None:
+    def func(X: np.ndarray, groups: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        raise ValueError("error in func")
+
+    with pytest.raises(ValueError, match="error in func"):
+        gp_pims.sampler.minimize_batched(func, np.zeros((3, 2)), [(-1.0, 1.0)] * 2)
+
+
+def _create_gp_model(X: np.ndarray, Y: np.ndarray) -> Any:
+    kernel_bounds = np.array([[0.1] * X.shape[1], [2.0] * X.shape[1]])
+    return gp_pims.sampler.set_gpy_regressor(None, X, Y, kernel_bounds, optimize=False)
+
+
+def _objective(X: np.ndarray) -> np.ndarray:
+    return np.sum(np.sin(3 * X), axis=1, keepdims=True)
+
+
+def _finite_difference(func: Callable[[np.ndarray], np.ndarray], X: np.ndarray) -> np.ndarray:
+    eps = 1e-6
+    grads = np.empty_like(X)
+    for j in range(X.shape[1]):
+        dX = np.zeros_like(X)
+        dX[:, j] = eps
+        grads[:, j] = (func(X + dX) - func(X - dX)) / (2 * eps)
+    return grads
+
+
+def test_add_XY_extends_cholesky_factor(monkeypatch: pytest.MonkeyPatch) -> None:
+    X = np.random.RandomState(0).uniform(-1, 1, (20, 2))
+    Y = _objective(X)
+    model = _create_gp_model(X[:12], Y[:12])
+
+    n_appends = 0
+    append_inference = model.inference_method._append_inference
+
+    def _append_inference(*args: Any) -> Any:
+        nonlocal n_appends
+        n_appends += 1
+        return append_inference(*args)
+
+    monkeypatch.setattr(model.inference_method, "_append_inference", _append_inference)
+    model.add_XY(X[12:16], Y[12:16])
+    model.add_XY(X[16:], Y[16:])
+    assert n_appends == 2
+
+    refitted = _create_gp_model(X, Y)
+    np.testing.assert_allclose(
+        model.posterior.woodbury_chol, refitted.posterior.woodbury_chol, rtol=0, atol=1e-12
+    )
+    np.testing.assert_allclose(
+        model.posterior.woodbury_vector, refitted.posterior.woodbury_vector, atol=1e-10
+    )
+    assert model.log_likelihood() == pytest.approx(refitted.log_likelihood())
+    assert model.std == pytest.approx(refitted.std)
+    assert model.mean == pytest.approx(refitted.mean)
+
+
+def test_hyperparameter_change_refits_cholesky_factor() -> None:
+    X = np.random.RandomState(0).uniform(-1, 1, (10, 2))
+    Y = _objective(X)
+    model = _create_gp_model(X[:8], Y[:8])
+    model.kern.lengthscale[:] = 0.5
+    model.add_XY(X[8:], Y[8:])
+
+    refitted = _create_gp_model(X, Y)
+    refitted.kern.lengthscale[:] = 0.5
+    np.testing.assert_allclose(
+        model.posterior.woodbury_chol, refitted.posterior.woodbury_chol, atol=1e-12
+    )
+
+
+def test_predict_noiseless_with_gradients() -> None:
+    rng = np.random.RandomState(0)
+    X = rng.uniform(-1, 1, (15, 2))
+    model = _create_gp_model(X, _objective(X))
+    X_test = rng.uniform(-1, 1, (5, 2))
+
+    mean, var, mean_grad, var_grad = model.predict_noiseless_with_gradients(X_test)
+    expected_mean, expected_var = model.predict_noiseless(X_test)
+    np.testing.assert_allclose(mean, expected_mean.ravel())
+    np.testing.assert_allclose(var, expected_var.ravel(), atol=1e-12)
+    np.testing.assert_allclose(model.predict_mean(X_test), expected_mean.ravel())
+
+    def _mean(X: np.ndarray) -> np.ndarray:
+        return model.predict_noiseless(X)[0].ravel()
+
+    def _var(X: np.ndarray) -> np.ndarray:
+        return model.predict_noiseless(X)[1].ravel()
+
+    np.testing.assert_allclose(mean_grad, _finite_difference(_mean, X_test), atol=1e-6)
+    np.testing.assert_allclose(var_grad, _finite_difference(_var, X_test), atol=1e-6)
+
+
+def test_sample_path() -> None:
+    rng = np.random.RandomState(0)
+    X = rng.uniform(-1, 1, (10, 2))
+    Y = _objective(X)
+    bounds = np.array([[-1.0, -1.0], [1.0, 1.0]])
+    model = _create_gp_model(X, Y)
+    # A short lengthscale keeps the posterior variance at the test inputs large.
+    model.kern.lengthscale[:] = 0.3
+    bo = gp_pims.sampler.BO_core(X, Y, bounds, np.array([[0.1, 0.1], [2.0, 2.0]]), GPmodel=model)
+
+    np.random.seed(0)
+    bo.sampling_num = 2000
+    X_test = rng.uniform(-1, 1, (5, 2))
+    bo.sampling_RFM(pool_X=X_test, MES_correction=False)
+
+    # The pathwise samples follow the posterior of the GP model.
+    paths = bo.sample_path(X_test)
+    assert paths.shape == (5, 2000)
+    mean, var = model.predict_noiseless(X_test)
+    np.testing.assert_allclose(np.mean(paths, axis=1), mean.ravel(), atol=0.05)
+    np.testing.assert_allclose(np.var(paths, axis=1), var.ravel(), rtol=0.1)
+
+    # Each input is evaluated by the given sample path.
+    path_index = np.array([0, 3, 3, 7, 1999])
+    values, grads = bo._sample_path_with_gradients(X_test, path_index)
+    np.testing.assert_allclose(values, paths[np.arange(5), path_index])
+
+    def _values(X: np.ndarray) -> np.ndarray:
+        return bo._sample_path_with_gradients(X, path_index)[0]
+
+    np.testing.assert_allclose(grads, _finite_difference(_values, X_test), atol=1e-5)
+
+
+def test_reuse_for_another_study() -> None:
+    search_space = {
+        "x": optuna.distributions.FloatDistribution(0, 1),
+        "y": optuna.distributions.FloatDistribution(0, 1),
+    }
+
+    def objective(trial: optuna.Trial) -> float:
+        x = trial.suggest_float("x", 0, 1)
+        y = trial.suggest_float("y", 0, 1)
+        return float(_objective(np.array([[x, y]]))[0, 0])
+
+    np.random.seed(0)
+    sampler = gp_pims.PIMSSampler(search_space, kernel_bounds=np.array([[0.1, 0.1], [2.0, 2.0]]))
+    study = optuna.create_study(sampler=sampler)
+    study.optimize(objective, n_trials=4)
+
+    # Every study of ``InMemoryStorage`` has the same ID.
+    another_study = optuna.create_study(sampler=sampler)
+    another_study.optimize(objective, n_trials=3)
+    assert sampler.optimizer is not None
+    X = np.array([[t.params["x"], t.params["y"]] for t in another_study.trials[:2]])
+    np.testing.assert_allclose(sampler.optimizer.GPmodel.X, X)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import os
+import types
 from typing import Any
 
 import numpy as np
@@ -10,6 +12,18 @@ from optuna.study._study_direction import StudyDirection
 import optunahub
 
 
+def _load_simple() -> types.ModuleType:
+    # ``samplers/simple`` provides ``TrialCursor``. It is loaded from the registry this package is
+    # loaded from if it is there, e.g., in a clone of the registry.
+    registry_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if os.path.isfile(os.path.join(registry_root, "samplers", "simple", "__init__.py")):
+        return optunahub.load_local_module("samplers/simple", registry_root=registry_root)
+    return optunahub.load_module("samplers/simple")
+
+
+TrialCursor = _load_simple().TrialCursor
+
+
 class GreyWolfOptimizationSampler(optunahub.samplers.SimpleBaseSampler):
     def __init__(
         self,
@@ -34,13 +48,16 @@ class GreyWolfOptimizationSampler(optunahub.samplers.SimpleBaseSampler):
         self.population_size = population_size
         self.n_trials = n_trials
         self.num_leaders = min(max(1, num_leaders), self.population_size // 2)
-        self._rng = np.random.RandomState(seed)
+        self._rng = np.random.default_rng(seed)
         self.dim = 0
         self.leaders: np.ndarray = np.array([])  # Leaders (alpha, beta, gamma, ...) positions
         self.wolves: np.ndarray = np.array([])  # Wolf positions
         self.fitnesses: np.ndarray = np.full(population_size, np.inf)  # Fitness values
         self._random_sampler = RandomSampler(seed=seed)
         self.queue: list[dict[str, Any]] = []  # Queue to hold candidate positions
+        # The last ``population_size`` completed trials in the order of their numbers
+        self._cursor = TrialCursor()
+        self._last_trials: list[optuna.trial.FrozenTrial] = []
 
     def _lazy_init(self, search_space: dict[str, BaseDistribution]) -> None:
         # Workaround for the limitation of the type of distributions
@@ -56,7 +73,8 @@ class GreyWolfOptimizationSampler(optunahub.samplers.SimpleBaseSampler):
         self.lower_bound = np.array([dist.low for dist in search_space.values()])
         self.upper_bound = np.array([dist.high for dist in search_space.values()])
         self.wolves = (
-            np.random.rand(self.population_size, self.dim) * (self.upper_bound - self.lower_bound)
+            self._rng.random((self.population_size, self.dim))
+            * (self.upper_bound - self.lower_bound)
             + self.lower_bound
         )
         self.leaders = np.zeros((self.num_leaders, self.dim))  # Initialize as zeros
@@ -76,40 +94,35 @@ class GreyWolfOptimizationSampler(optunahub.samplers.SimpleBaseSampler):
         if len(self.queue) != 0:
             return self.queue.pop(0)
 
-        if len(study.trials) < self.population_size:
+        # The trial being sampled is included.
+        n_trials = len(study._get_trials(deepcopy=False, use_cache=True))
+        if n_trials < self.population_size:
             # Fill the initial population using sample_independent
             new_position = {
                 k: self.sample_independent(study, trial, k, dist)
                 for k, dist in search_space.items()
             }
-            self.wolves[len(study.trials)] = np.array(list(new_position.values()))
+            self.wolves[n_trials] = np.array(list(new_position.values()))
             return new_position
 
-        if len(study.trials) % self.population_size == 0:
+        if n_trials % self.population_size == 0:
             # Perform one iteration of GWO
-            completed_trials = study.get_trials(states=[optuna.trial.TrialState.COMPLETE])
-            self.fitnesses = np.array(
-                [trial.value for trial in completed_trials[-self.population_size :]]
-            )
-            self.fitnesses = np.array(
-                [
-                    (trial.value if study.direction == StudyDirection.MINIMIZE else -trial.value)
-                    for trial in completed_trials[-self.population_size :]
-                ]
-            )
+            last_trials = self._get_last_completed_trials(study)
+            sign = 1 if study.direction == StudyDirection.MINIMIZE else -1
+            self.fitnesses = np.array([sign * t.value for t in last_trials])
 
             # Update leaders (alpha, beta, gamma, ...)
             sorted_indices = np.argsort(self.fitnesses)
             self.leaders = self.wolves[sorted_indices[: self.num_leaders]]
 
             # Linearly decrease from 2 to 0, ensuring a is clipped between 0 and 2
-            current_iter = len(study.trials)
+            current_iter = n_trials
             a = 2 * (1 - current_iter / self.n_trials)
             a = np.clip(a, 0, 2)
 
             # Calculate A, C, D, X values for position update
-            r1 = self._rng.rand(self.population_size, self.num_leaders, self.dim)
-            r2 = self._rng.rand(self.population_size, self.num_leaders, self.dim)
+            r1 = self._rng.random((self.population_size, self.num_leaders, self.dim))
+            r2 = self._rng.random((self.population_size, self.num_leaders, self.dim))
             A = 2 * a * r1 - a
             C = 2 * r2
             D = np.abs(C * self.leaders - self.wolves[:, np.newaxis, :])
@@ -126,6 +139,22 @@ class GreyWolfOptimizationSampler(optunahub.samplers.SimpleBaseSampler):
 
         return self.queue.pop(0)
 
+    def _get_last_completed_trials(self, study: optuna.Study) -> list[optuna.trial.FrozenTrial]:
+        # Only the trials finished since the previous generation are visited.
+        finished_trials, restarted = self._cursor.update(study)
+        if restarted:
+            self._last_trials = []
+
+        completed_trials = [
+            t for t in finished_trials if t.state == optuna.trial.TrialState.COMPLETE
+        ]
+        if len(completed_trials) > 0:
+            # A trial may complete after the trials with larger numbers.
+            self._last_trials = sorted(
+                self._last_trials + completed_trials, key=lambda t: t.number
+            )[-self.population_size :]
+        return self._last_trials
+
     def tell(self, new_positions: np.ndarray, fitnesses: np.ndarray) -> None:
         self.wolves = np.clip(new_positions, self.lower_bound, self.upper_bound)
         min_index = np.argmin(fitnesses)
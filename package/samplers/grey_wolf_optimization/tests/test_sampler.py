@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import optuna
+import optunahub
+
+
+gwo = optunahub.load_local_module(
+    package="samplers/grey_wolf_optimization", registry_root="package/"
+)
+
+
+def _objective(trial: optuna.Trial) -> float:
+    x = trial.suggest_float("x", -10, 10)
+    y = trial.suggest_float("y", -10, 10)
+    return x**2 + y**2
+
+
+def test_seed_reproducibility() -> None:
+    params = []
+    for _ in range(2):
+        sampler = gwo.GreyWolfOptimizationSampler(population_size=5, n_trials=30, seed=0)
+        study = optuna.create_study(sampler=sampler)
+        study.optimize(_objective, n_trials=30)
+        params.append([trial.params for trial in study.trials])
+    assert params[0] == params[1]
+
+    sampler = gwo.GreyWolfOptimizationSampler(population_size=5, n_trials=30, seed=1)
+    study = optuna.create_study(sampler=sampler)
+    study.optimize(_objective, n_trials=30)
+    assert [trial.params for trial in study.trials] != params[0]
+
+
+def test_last_completed_trials_with_running_trials() -> None:
+    sampler = gwo.GreyWolfOptimizationSampler(population_size=3, seed=0)
+    study = optuna.create_study(sampler=sampler)
+    running_trial = study.ask()
+    study.optimize(_objective, n_trials=4)
+    study.tell(study.ask(), state=optuna.trial.TrialState.FAIL)
+    assert [t.number for t in sampler._get_last_completed_trials(study)] == [2, 3, 4]
+
+    # A trial that completes late is older than the last trials.
+    study.tell(running_trial, 1.0)
+    study.optimize(_objective, n_trials=1)
+    assert [t.number for t in sampler._get_last_completed_trials(study)] == [3, 4, 6]
+
+
+def test_reuse_for_another_study() -> None:
+    sampler = gwo.GreyWolfOptimizationSampler(population_size=5, n_trials=30, seed=0)
+    study = optuna.create_study(sampler=sampler)
+    study.optimize(_objective, n_trials=20)
+
+    # Every study of ``InMemoryStorage`` has the same ID.
+    another_study = optuna.create_study(sampler=sampler)
+    another_study.optimize(_objective, n_trials=3)
+    assert [t.number for t in sampler._get_last_completed_trials(another_study)] == [0, 1, 2]
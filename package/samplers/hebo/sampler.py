@@ -1,6 +1,10 @@
 from __future__ import annotations
 
 from collections.abc import Sequence
+import copy
+import os
+import threading
+import types
 from typing import Any
 
 import numpy as np
@@ -23,9 +27,118 @@ from hebo.design_space.design_space import DesignSpace
 from hebo.optimizers.hebo import HEBO
 
 
+def _load_simple() -> types.ModuleType:
+    # ``samplers/simple`` provides ``TrialCursor``. It is loaded from the registry this package is
+    # loaded from if it is there, e.g., in a clone of the registry.
+    registry_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if os.path.isfile(os.path.join(registry_root, "samplers", "simple", "__init__.py")):
+        return optunahub.load_local_module("samplers/simple", registry_root=registry_root)
+    return optunahub.load_module("samplers/simple")
+
+
+TrialCursor = _load_simple().TrialCursor
+
 _logger = get_logger(f"optuna.{__name__}")
 
 
+def _is_stepped(distribution: BaseDistribution) -> bool:
+    return (
+        isinstance(distribution, (IntDistribution, FloatDistribution))
+        and not distribution.log
+        and distribution.step is not None
+    )
+
+
+def _encode_params(
+    search_space: dict[str, BaseDistribution], trials: Sequence[FrozenTrial]
+) -> pd.DataFrame:
+    columns: dict[str, np.ndarray] = {}
+    for name, dist in search_space.items():
+        if isinstance(dist, CategoricalDistribution):
+            # NOTE: An object array keeps the choices such as None and bool as they are.
+            column: np.ndarray = np.empty(len(trials), dtype=object)
+            column[:] = [t.params[name] for t in trials]
+        else:
+            column = np.asarray([t.params[name] for t in trials])
+        if _is_stepped(dist):
+            # NOTE(nabenabe): We do not round here because HEBO treats params as float even if
+            # the domain is defined on integer. By not rounding, HEBO can handle any changes in
+            # the domain of these parameters such as changes in low, high, and step.
+            column = (column - dist.low) / dist.step  # type: ignore[attr-defined]
+        columns[name] = column
+
+    return pd.DataFrame(columns)
+
+
+class _IncrementalHEBO:
+    """A HEBO backend that is kept across trials in the stateless mode.
+
+    Only the trials completed since the last call to :meth:`sync` are observed. The constant liar
+    placeholders of the running trials are kept separately from the observations, and the
+    placeholders of the trials finished or started since the last call are removed or added by
+    diffing the running trials.
+    """
+
+    def __init__(
+        self, search_space: dict[str, BaseDistribution], design_space: DesignSpace, seed: int
+    ) -> None:
+        self.search_space = search_space
+        self._hebo = HEBO(design_space, scramble_seed=seed)
+        self._cursor = TrialCursor()
+        self._running_params = _encode_params(search_space, [])
+
+    @property
+    def n_observations(self) -> int:
+        return len(self._hebo.y)
+
+    def sync(self, study: Study, constant_liar: bool) -> None:
+        trials = study._get_trials(deepcopy=False, use_cache=not constant_liar)
+        finished_trials, _ = self._cursor.update(study, trials)
+        completed = [
+            t for t in finished_trials if t.state == TrialState.COMPLETE and self._contains(t)
+        ]
+        running = {
+            n: trials[n]
+            for n in self._cursor.unfinished
+            if trials[n].state == TrialState.RUNNING and self._contains(trials[n])
+        }
+
+        if len(completed) > 0:
+            # Assume that the back-end HEBO implementation aims to minimize.
+            sign = 1 if study.direction == StudyDirection.MINIMIZE else -1
+            values = sign * np.array([t.value for t in completed])[:, np.newaxis]
+            self._hebo.observe(_encode_params(self.search_space, completed), values)
+
+        if constant_liar:
+            self._update_running_params(running)
+
+    def _contains(self, trial: FrozenTrial) -> bool:
+        return all(name in trial.params for name in self.search_space)
+
+    def _update_running_params(self, running: dict[int, FrozenTrial]) -> None:
+        finished = [n for n in self._running_params.index if n not in running]
+        started = [t for n, t in running.items() if n not in self._running_params.index]
+        if len(finished) > 0:
+            self._running_params = self._running_params.drop(index=finished)
+        if len(started) > 0:
+            new_params = _encode_params(self.search_space, started)
+            new_params.index = pd.Index([t.number for t in started])
+            self._running_params = pd.concat([self._running_params, new_params])
+
+    def snapshot(self) -> HEBO:
+        """Return a shallow copy of the HEBO backend with the constant liar placeholders.
+
+        The running trials take the worst objective value observed so far. Since the copy does
+        not share the observations with the backend, :meth:`sync` can be called while the copy
+        suggests parameters.
+        """
+        hebo = copy.copy(self._hebo)
+        if len(self._running_params) > 0:
+            hebo.X = pd.concat([hebo.X, self._running_params], ignore_index=True)
+            hebo.y = np.vstack([hebo.y, np.full((len(self._running_params), 1), np.max(hebo.y))])
+        return hebo
+
+
 class HEBOSampler(optunahub.samplers.SimpleBaseSampler):
     """A sampler using `HEBO <https://github.com/huawei-noah/HEBO/tree/master/HEBO>__` as the backend.
 
@@ -92,6 +205,19 @@ class HEBOSampler(optunahub.samplers.SimpleBaseSampler):
         self._independent_sampler = independent_sampler or optuna.samplers.RandomSampler(seed=seed)
         self._constant_liar = constant_liar
         self._rng = np.random.default_rng(seed)
+        self._backend: _IncrementalHEBO | None = None
+        # The cursor only identifies the study, since the backend has its own cursor.
+        self._cursor = TrialCursor()
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[Any, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[Any, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
 
     @staticmethod
     def _suggest_and_transform_to_dict(
@@ -103,11 +229,7 @@ class HEBOSampler(optunahub.samplers.SimpleBaseSampler):
                 continue
 
             dist = search_space[name]
-            if (
-                isinstance(dist, (IntDistribution, FloatDistribution))
-                and not dist.log
-                and dist.step is not None
-            ):
+            if _is_stepped(dist):
                 step_index = row.iloc[0]
                 params[name] = dist.low + step_index * dist.step
             else:
@@ -129,46 +251,42 @@ class HEBOSampler(optunahub.samplers.SimpleBaseSampler):
         )
         # Assume that the back-end HEBO implementation aims to minimize.
         nan_padded_values = sign * np.where(np.isnan(values), worst_value, values)[:, np.newaxis]
-        params = pd.DataFrame([t.params for t in trials])
-        for name, dist in search_space.items():
-            if (
-                isinstance(dist, (IntDistribution, FloatDistribution))
-                and not dist.log
-                and dist.step is not None
-            ):
-                # NOTE(nabenabe): We do not round here because HEBO treats params as float even if
-                # the domain is defined on integer. By not rounding, HEBO can handle any changes in
-                # the domain of these parameters such as changes in low, high, and step.
-                params[name] = (params[name] - dist.low) / dist.step
-
-        hebo.observe(params, nan_padded_values)
+        hebo.observe(_encode_params(search_space, trials), nan_padded_values)
 
     def _sample_relative_define_and_run(
         self, study: Study, trial: FrozenTrial, search_space: dict[str, BaseDistribution]
     ) -> dict[str, Any]:
         return self._suggest_and_transform_to_dict(self._hebo, search_space)
 
+    def _reset_if_new_study(self, study: Study) -> None:
+        if not self._cursor.tracks(study, []):
+            self._cursor.reset(study)
+            self._intersection_search_space = IntersectionSearchSpace()
+            self._backend = None
+
     def _sample_relative_stateless(
         self, study: Study, trial: FrozenTrial, search_space: dict[str, BaseDistribution]
     ) -> dict[str, Any]:
-        if self._constant_liar:
-            target_states = [TrialState.COMPLETE, TrialState.RUNNING]
-        else:
-            target_states = [TrialState.COMPLETE]
-
-        use_cache = not self._constant_liar
-        trials = study._get_trials(deepcopy=False, states=target_states, use_cache=use_cache)
-        is_complete = np.array([t.state == TrialState.COMPLETE for t in trials])
-        if not np.any(is_complete):
-            # note: The backend HEBO implementation uses Sobol sampling here.
-            # This sampler does not call `hebo.suggest()` here because
-            # Optuna needs to know search space by running the first trial in Define-by-Run.
+        if search_space == {}:
             return {}
 
-        trials = [t for t in trials if set(search_space.keys()) <= set(t.params.keys())]
-        seed = int(self._rng.integers(low=1, high=(1 << 31)))
-        hebo = HEBO(self._convert_to_hebo_design_space(search_space), scramble_seed=seed)
-        self._transform_to_dict_and_observe(hebo, search_space, study, trials)
+        with self._lock:
+            self._reset_if_new_study(study)
+            if self._backend is None or self._backend.search_space != search_space:
+                # The observations are converted again only when the search space changes.
+                seed = int(self._rng.integers(low=1, high=(1 << 31)))
+                design_space = self._convert_to_hebo_design_space(search_space)
+                self._backend = _IncrementalHEBO(search_space, design_space, seed)
+
+            self._backend.sync(study, self._constant_liar)
+            if self._backend.n_observations == 0:
+                # note: The backend HEBO implementation uses Sobol sampling here.
+                # This sampler does not call `hebo.suggest()` here because
+                # Optuna needs to know search space by running the first trial in Define-by-Run.
+                return {}
+
+            hebo = self._backend.snapshot()
+
         return self._suggest_and_transform_to_dict(hebo, search_space)
 
     def sample_relative(
@@ -240,9 +358,9 @@ class HEBOSampler(optunahub.samplers.SimpleBaseSampler):
     def infer_relative_search_space(
         self, study: Study, trial: FrozenTrial
     ) -> dict[str, BaseDistribution]:
-        return optuna.search_space.intersection_search_space(
-            study._get_trials(deepcopy=False, use_cache=True)
-        )
+        with self._lock:
+            self._reset_if_new_study(study)
+            return self._intersection_search_space.calculate(study)
 
     def sample_independent(
         self,
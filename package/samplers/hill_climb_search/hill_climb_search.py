@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import os
+import threading
+import types
 from typing import Any
 
 import numpy as np
@@ -7,24 +10,81 @@ import optuna
 import optunahub
 
 
+def _load_simple() -> types.ModuleType:
+    # ``samplers/simple`` provides ``TrialCursor``. It is loaded from the registry this package is
+    # loaded from if it is there, e.g., in a clone of the registry.
+    registry_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if os.path.isfile(os.path.join(registry_root, "samplers", "simple", "__init__.py")):
+        return optunahub.load_local_module("samplers/simple", registry_root=registry_root)
+    return optunahub.load_module("samplers/simple")
+
+
+TrialCursor = _load_simple().TrialCursor
+
+
+def _to_key(params: dict[str, Any]) -> frozenset:
+    """This function converts a point into a hashable key, which is equal for equal dicts"""
+    return frozenset(params.items())
+
+
 class HillClimbingSampler(optunahub.samplers.SimpleBaseSampler):
-    """A sampler based on the Hill Climb Local Search Algorithm dealing with discrete values."""
+    """A sampler based on the Hill Climb Local Search Algorithm dealing with discrete values.
+
+    The sampler evaluates all the unvisited neighbors of the current point and moves to the best
+    one if it improves upon the current point, i.e., steepest ascent. Otherwise, it restarts from
+    a random point. The visited points are collected from the study only when the sampler is
+    first used for it, and are then kept in a hashed set updated in ``after_trial``, so that
+    checking whether a neighbor has been visited does not scan the trials of the study.
+
+    Args:
+        search_space:
+            The search space. If :obj:`None`, the intersection search space is used.
+        batch:
+            If :obj:`True`, all the unvisited neighbors of the current point are suggested at once
+            so that parallel workers can evaluate them at the same time, and the next move is
+            made after all of them are finished. Otherwise, the next point is suggested only after
+            the result of the previous one is received, and trials started in the meantime are
+            sampled randomly.
+        seed:
+            Seed for random number generator.
+    """
 
     def __init__(
-        self, search_space: dict[str, optuna.distributions.BaseDistribution] | None = None
+        self,
+        search_space: dict[str, optuna.distributions.BaseDistribution] | None = None,
+        batch: bool = False,
+        seed: int | None = None,
     ) -> None:
-        super().__init__(search_space)
+        super().__init__(search_space, seed)
         self._remaining_points: list[dict] = []
-        self._rng = np.random.RandomState()
+        self._rng = np.random.RandomState(seed)
+        self._batch = batch
 
         # This is for storing the current point whose neighbors are under analysis
         self._current_point: dict | None = None
-        self._current_point_value = None
+        self._current_point_value: float | None = None
         self._current_state = "Not Initialized"
 
-        # This is for keeping track of the best neighbor
-        self._best_neighbor = None
-        self._best_neighbor_value = None
+        # This is for keeping track of the evaluated neighbors
+        self._neighbor_results: list[tuple[dict, float]] = []
+
+        # This is for keeping track of the points that have been tried or queued, and the trials
+        # whose results are awaited
+        self._visited: set[frozenset] = set()
+        self._pending_trial_numbers: set[int] = set()
+        # The cursor only identifies the study, since the visited points are updated in
+        # ``after_trial``.
+        self._cursor = TrialCursor()
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[Any, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[Any, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
 
     def _generate_random_point(
         self, search_space: dict[str, optuna.distributions.BaseDistribution]
@@ -44,19 +104,14 @@ class HillClimbingSampler(optunahub.samplers.SimpleBaseSampler):
                 raise NotImplementedError
         return params
 
-    def _remove_tried_points(
-        self, neighbors: list[dict], study: optuna.study.Study, current_point: dict
-    ) -> list[dict]:
-        """This function removes the points that have already been tried from the list of neighbors"""
+    def _remove_tried_points(self, neighbors: list[dict]) -> list[dict]:
+        """This function removes the points that have already been tried or queued from the list
+        of neighbors and marks the remaining ones as visited"""
         final_neighbors = []
-
-        tried_points = [trial.params for trial in study.get_trials(deepcopy=False)]
-        points_to_try = self._remaining_points
-
-        invalid_points = tried_points + points_to_try + [current_point]
-
         for neighbor in neighbors:
-            if neighbor not in invalid_points:
+            key = _to_key(neighbor)
+            if key not in self._visited:
+                self._visited.add(key)
                 final_neighbors.append(neighbor)
 
         return final_neighbors
@@ -65,7 +120,6 @@ class HillClimbingSampler(optunahub.samplers.SimpleBaseSampler):
         self,
         current_point: dict,
         search_space: dict[str, optuna.distributions.BaseDistribution],
-        study: optuna.study.Study,
     ) -> list[dict]:
         """This function generates the neighbors of the current point"""
         neighbors = []
@@ -87,101 +141,120 @@ class HillClimbingSampler(optunahub.samplers.SimpleBaseSampler):
             else:
                 raise NotImplementedError
 
-        valid_neighbors = self._remove_tried_points(neighbors, study, current_point)
+        valid_neighbors = self._remove_tried_points(neighbors)
 
         return valid_neighbors
 
+    def _sync_visited_points(self, study: optuna.study.Study) -> None:
+        """This function collects the points tried before the sampler is used for the study"""
+        if self._cursor.tracks(study, []):
+            return
+
+        self._cursor.reset(study)
+        self._visited = {_to_key(trial.params) for trial in study.get_trials(deepcopy=False)}
+        self._pending_trial_numbers = set()
+
+    def _is_better(self, value: float, other: float | None, study: optuna.study.Study) -> bool:
+        if other is None:
+            return True
+        return (
+            value < other
+            if study.direction == optuna.study.StudyDirection.MINIMIZE
+            else value > other
+        )
+
+    def _start(self, search_space: dict[str, optuna.distributions.BaseDistribution]) -> dict:
+        # Create the current point
+        starting_point = self._generate_random_point(search_space)
+        self._current_point = starting_point
+        self._current_point_value = None
+        self._visited.add(_to_key(starting_point))
+
+        # Add the neighbors
+        neighbors = self._generate_neighbors(starting_point, search_space)
+        self._remaining_points.extend(neighbors)
+
+        # Change the state to initialized
+        self._current_state = "Initialized"
+
+        # Return the current point
+        return starting_point
+
     def sample_relative(
         self,
         study: optuna.study.Study,
         trial: optuna.trial.FrozenTrial,
         search_space: dict[str, optuna.distributions.BaseDistribution],
-    ) -> dict[str, Any] | None:
+    ) -> dict[str, Any]:
         if search_space == {}:
             return {}
 
-        if self._current_state == "Not Initialized":
-            # Create the current point
-            starting_point = self._generate_random_point(search_space)
-            self._current_point = starting_point
-
-            # Add the neighbors
-            neighbors = self._generate_neighbors(starting_point, search_space, study)
-            self._remaining_points.extend(neighbors)
-
-            # Change the state to initialized
-            self._current_state = "Initialized"
-
-            # Return the current point
-            return starting_point
-
-        elif self._current_state == "Initialized":
-            # This section is only for storing the value of the current point and best neighbor point
-            previous_trial = study.get_trials(deepcopy=False)[-2]
-            if previous_trial.params == self._current_point:
-                # Just now the current point was evaluated
-                # Store the value of the current point
-                self._current_point_value = previous_trial.value
-            else:
-                # The neighbor was evaluated
-                # Store the value of the neighbor, if it improves upon the current point
-                neighbor_value = previous_trial.value
-
-                criteria = (
-                    neighbor_value < self._current_point_value
-                    if study.direction == optuna.study.StudyDirection.MINIMIZE
-                    else neighbor_value > self._current_point_value
-                )
-
-                if criteria:
-                    self._best_neighbor = previous_trial.params
-                    self._best_neighbor_value = neighbor_value
-
-            # This section is for the next point to be evaluated
-            if len(self._remaining_points) == 0:
-                # This means that all the neighbors have been processed
-                # Now you have to select the best neighbor
-
-                if self._best_neighbor is not None:
-                    # There was an improvement
-                    # Select the best neighbor, make that the current point and add its neighbors
-                    self._current_point = self._best_neighbor
-                    self._current_point_value = self._best_neighbor_value
-
-                    self._best_neighbor = None
-                    self._best_neighbor_value = None
-                    self._remaining_points = []  # Happens by virtue of the condition, but just for clarity
-
-                    # Add the neighbors
-                    neighbors = self._generate_neighbors(self._current_point, search_space, study)
-                    self._remaining_points.extend(neighbors)
-
-                    self._current_state = "Initialized"
-
-                    return self._current_point
+        with self._lock:
+            self._sync_visited_points(study)
+            if len(self._pending_trial_numbers) > 0 and (
+                not self._batch or len(self._remaining_points) == 0
+            ):
+                # The next point depends on the results of the running trials.
+                return {}
 
-                else:
-                    # If none of the neighbors are better then do a random restart
-                    self._current_state = "Not Initialized"
-                    restarting_point = self._generate_random_point(search_space)
-                    self._current_point = restarting_point
+            params = self._next_point(study, search_space)
+            self._pending_trial_numbers.add(trial.number)
+            return params
 
-                    self._best_neighbor = None
-                    self._best_neighbor_value = None
-
-                    # Add the neighbors
-                    neighbors = self._generate_neighbors(restarting_point, search_space, study)
-                    self._remaining_points.extend(neighbors)
-
-                    # Change the state to initialized
-                    self._current_state = "Initialized"
+    def _next_point(
+        self,
+        study: optuna.study.Study,
+        search_space: dict[str, optuna.distributions.BaseDistribution],
+    ) -> dict[str, Any]:
+        if self._current_state == "Not Initialized":
+            return self._start(search_space)
+
+        while len(self._remaining_points) == 0:
+            # This means that all the neighbors have been processed
+            # Now you have to select the best neighbor
+            best_neighbor: dict | None = None
+            best_neighbor_value: float | None = None
+            for neighbor, neighbor_value in self._neighbor_results:
+                if self._is_better(neighbor_value, best_neighbor_value, study):
+                    best_neighbor = neighbor
+                    best_neighbor_value = neighbor_value
+            self._neighbor_results = []
+
+            if best_neighbor_value is None or not self._is_better(
+                best_neighbor_value, self._current_point_value, study
+            ):
+                # If none of the neighbors are better then do a random restart
+                return self._start(search_space)
+
+            # There was an improvement
+            # Select the best neighbor, make that the current point and add its neighbors
+            assert best_neighbor is not None
+            self._current_point = best_neighbor
+            self._current_point_value = best_neighbor_value
+            neighbors = self._generate_neighbors(self._current_point, search_space)
+            self._remaining_points.extend(neighbors)
 
-                    # Return the current point
-                    return self._current_point
+        # Process as normal
+        return self._remaining_points.pop()
 
+    def after_trial(
+        self,
+        study: optuna.study.Study,
+        trial: optuna.trial.FrozenTrial,
+        state: optuna.trial.TrialState,
+        values: list[float] | None,
+    ) -> None:
+        with self._lock:
+            self._visited.add(_to_key(trial.params))
+            if trial.number not in self._pending_trial_numbers:
+                return
+            self._pending_trial_numbers.remove(trial.number)
+            if state != optuna.trial.TrialState.COMPLETE or values is None:
+                return
+
+            if trial.params == self._current_point:
+                # The current point was evaluated
+                self._current_point_value = values[0]
             else:
-                # Process as normal
-                current_point = self._remaining_points.pop()
-                return current_point
-
-        return {}
+                # A neighbor was evaluated
+                self._neighbor_results.append((trial.params, values[0]))
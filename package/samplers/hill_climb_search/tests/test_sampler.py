@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import optuna
+import optunahub
+
+
+hill_climb_search = optunahub.load_local_module(
+    package="samplers/hill_climb_search", registry_root="package/"
+)
+
+_SEARCH_SPACE = {
+    "x": optuna.distributions.IntDistribution(0, 6),
+    "y": optuna.distributions.IntDistribution(0, 6),
+    "z": optuna.distributions.IntDistribution(0, 6),
+}
+
+
+def _suggest(trial: optuna.Trial) -> dict[str, int]:
+    return {name: trial.suggest_int(name, d.low, d.high) for name, d in _SEARCH_SPACE.items()}
+
+
+def _evaluate(params: dict[str, int]) -> float:
+    # A function with many local minima on the lattice, and without ties.
+    value = (params["x"] * 3 + params["y"] * 5 + params["z"] * 7) % 11
+    return value + 1e-2 * params["x"] + 1e-3 * params["y"] + 1e-4 * params["z"]
+
+
+def _record_sample_relative(sampler: Any) -> dict[int, dict[str, Any]]:
+    relative_params: dict[int, dict[str, Any]] = {}
+    sample_relative = sampler.sample_relative
+
+    def _sample_relative(study: optuna.Study, trial: optuna.trial.FrozenTrial, *args: Any) -> Any:
+        params = sample_relative(study, trial, *args)
+        relative_params[trial.number] = params
+        return params
+
+    sampler.sample_relative = _sample_relative
+    return relative_params
+
+
+def _neighbors(point: dict[str, int]) -> list[dict[str, int]]:
+    neighbors = []
+    for name, d in _SEARCH_SPACE.items():
+        for value in [point[name] - 1, point[name] + 1]:
+            if d.low <= value <= d.high:
+                neighbors.append({**point, name: value})
+    return neighbors
+
+
+def test_visited_points_are_not_proposed_again() -> None:
+    sampler = hill_climb_search.HillClimbingSampler(_SEARCH_SPACE, seed=0)
+    relative_params = _record_sample_relative(sampler)
+    starting_points: list[dict] = []
+    start = sampler._start
+
+    def _start(search_space: dict[str, optuna.distributions.BaseDistribution]) -> dict:
+        starting_points.append(start(search_space))
+        return starting_points[-1]
+
+    sampler._start = _start
+
+    study = optuna.create_study(sampler=sampler)
+    visited: set[frozenset] = set()
+    n_neighbors = 0
+    for _ in range(200):
+        trial = study.ask()
+        n_starts = len(starting_points)
+        params = _suggest(trial)
+        assert relative_params[trial.number] == params
+        key = frozenset(params.items())
+        # Only the random restarts can land on a visited point.
+        if len(starting_points) == n_starts:
+            assert key not in visited
+            n_neighbors += 1
+        visited.add(key)
+        study.tell(trial, _evaluate(params))
+    assert n_neighbors > 100
+    assert len(starting_points) > 1
+
+
+def test_batch_hands_out_unvisited_neighbors_once() -> None:
+    sampler = hill_climb_search.HillClimbingSampler(_SEARCH_SPACE, batch=True, seed=0)
+    relative_params = _record_sample_relative(sampler)
+    study = optuna.create_study(sampler=sampler)
+
+    trial = study.ask()
+    current_point = _suggest(trial)
+    current_value = _evaluate(current_point)
+    pending_trials = [trial]
+    visited = {frozenset(current_point.items())}
+    n_moves = 0
+    while True:
+        expected = [p for p in _neighbors(current_point) if frozenset(p.items()) not in visited]
+        # All the unvisited neighbors are handed out to the following trials before any of them
+        # is told, and the next trial waits for their results.
+        neighbor_trials = []
+        while True:
+            trial = study.ask()
+            params = _suggest(trial)
+            visited.add(frozenset(params.items()))
+            if relative_params[trial.number] == {}:
+                pending_trials.append(trial)
+                break
+            neighbor_trials.append(trial)
+        assert sorted(tuple(t.params.values()) for t in neighbor_trials) == sorted(
+            tuple(p.values()) for p in expected
+        )
+
+        # The results are told in a random order.
+        pending_trials += neighbor_trials
+        for i in np.random.RandomState(n_moves).permutation(len(pending_trials)):
+            study.tell(pending_trials[i], _evaluate(pending_trials[i].params))
+        pending_trials = []
+        assert sampler._pending_trial_numbers == set()
+
+        best_trial = min(neighbor_trials, key=lambda t: _evaluate(t.params), default=None)
+        if best_trial is None or _evaluate(best_trial.params) >= current_value:
+            break
+        # The search moves to the best neighbor.
+        current_point = best_trial.params
+        current_value = _evaluate(current_point)
+        n_moves += 1
+
+    assert n_moves > 0
+
+
+def test_reuse_for_another_study() -> None:
+    sampler = hill_climb_search.HillClimbingSampler(_SEARCH_SPACE, seed=0)
+    study = optuna.create_study(sampler=sampler)
+    study.optimize(lambda t: _evaluate(_suggest(t)), n_trials=20)
+
+    # Every study of ``InMemoryStorage`` has the same study ID.
+    another_study = optuna.create_study(sampler=sampler)
+    params = {"x": 3, "y": 3, "z": 3}
+    another_study.add_trial(
+        optuna.trial.create_trial(
+            params=params, distributions=_SEARCH_SPACE, value=_evaluate(params)
+        )
+    )
+    sampler._sync_visited_points(another_study)
+    assert sampler._visited == {frozenset(params.items())}
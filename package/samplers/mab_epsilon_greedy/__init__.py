@@ -1,4 +1,6 @@
 from .mab_epsilon_greedy import MABEpsilonGreedySampler
+from .mab_epsilon_greedy import MABThompsonSampler
+from .mab_epsilon_greedy import MABUCB1Sampler
 
 
-__all__ = ["MABEpsilonGreedySampler"]
+__all__ = ["MABEpsilonGreedySampler", "MABThompsonSampler", "MABUCB1Sampler"]
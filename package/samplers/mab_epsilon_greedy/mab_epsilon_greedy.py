@@ -1,17 +1,256 @@
 from __future__ import annotations
 
-from collections import defaultdict
+import abc
+import math
+import os
+import threading
+import types
 from typing import Any
+from typing import Sequence
 
 from optuna.distributions import BaseDistribution
+from optuna.distributions import CategoricalDistribution
 from optuna.samplers import RandomSampler
 from optuna.study import Study
 from optuna.study._study_direction import StudyDirection
 from optuna.trial import FrozenTrial
 from optuna.trial import TrialState
+import optunahub
 
 
-class MABEpsilonGreedySampler(RandomSampler):
+def _load_simple() -> types.ModuleType:
+    # ``samplers/simple`` provides ``TrialCursor``. It is loaded from the registry this package is
+    # loaded from if it is there, e.g., in a clone of the registry.
+    registry_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if os.path.isfile(os.path.join(registry_root, "samplers", "simple", "__init__.py")):
+        return optunahub.load_local_module("samplers/simple", registry_root=registry_root)
+    return optunahub.load_module("samplers/simple")
+
+
+TrialCursor = _load_simple().TrialCursor
+
+_STATISTICS_KEY = "mab:arm_statistics"
+
+
+class _RunningStatistics:
+    """Running sums of the rewards of each arm of each categorical parameter.
+
+    The statistics are updated in ``after_trial`` for the trials finished in this process, and
+    the trials finished by other workers are added by :meth:`sync`. The trials counted in
+    ``after_trial`` are kept in ``self._told`` until :meth:`sync` visits them as finished, to
+    avoid counting them twice. The statistics and these numbers are stored in the study system
+    attrs so that a new worker does not need to visit all the trials.
+    """
+
+    def __init__(self) -> None:
+        self._cursor = TrialCursor()
+        self._reset()
+
+    def _reset(self, study: Study | None = None) -> None:
+        self._cursor.reset(study)
+        self._told: set[int] = set()
+        # The sum of rewards, the sum of squared rewards, and the number of pulls of each arm.
+        self._arms: dict[str, dict[Any, list]] = {}
+        self._value_range: list[float] | None = None
+
+    @property
+    def value_range(self) -> float:
+        """The difference between the maximum and minimum rewards observed so far."""
+        if self._value_range is None:
+            return 0.0
+        return self._value_range[1] - self._value_range[0]
+
+    def get(self, param_name: str) -> dict[Any, list]:
+        return self._arms.get(param_name, {})
+
+    def sync(self, study: Study) -> None:
+        trials = study._get_trials(deepcopy=False, use_cache=True)
+        if not self._cursor.tracks(study, trials):
+            # The statistics of another study, e.g., of another study in the same
+            # ``InMemoryStorage`` with the same ID, must not be used.
+            self._reset(study)
+            self._load(study, trials)
+
+        for trial in self._cursor.advance(trials):
+            if trial.number in self._told:
+                self._told.remove(trial.number)
+            else:
+                self._add(trial, trial.state, trial.values)
+
+    def add_running_trial(
+        self, study: Study, trial: FrozenTrial, state: TrialState, values: Sequence[float] | None
+    ) -> None:
+        # NOTE: ``after_trial`` is called before the state of the trial is stored, so that the
+        # trial is not visited as finished yet and must be skipped by ``sync``.
+        if self._cursor.visited(trial.number):
+            return
+        if trial.number in self._told or not self._add(trial, state, values):
+            return
+        self._told.add(trial.number)
+        self._save(study)
+
+    def _add(self, trial: FrozenTrial, state: TrialState, values: Sequence[float] | None) -> bool:
+        if state not in (TrialState.COMPLETE, TrialState.PRUNED) or values is None:
+            return False
+
+        value = values[0]
+        if self._value_range is None:
+            self._value_range = [value, value]
+        else:
+            self._value_range = [
+                min(self._value_range[0], value),
+                max(self._value_range[1], value),
+            ]
+        for param_name, param_value in trial.params.items():
+            if not isinstance(trial.distributions[param_name], CategoricalDistribution):
+                continue
+            arm = self._arms.setdefault(param_name, {}).setdefault(param_value, [0.0, 0.0, 0])
+            arm[0] += value
+            arm[1] += value * value
+            arm[2] += 1
+        return True
+
+    def _save(self, study: Study) -> None:
+        # NOTE: The size of the stored state only depends on the number of arms and the number
+        # of the trials running at the same time.
+        study._storage.set_study_system_attr(
+            study._study_id,
+            _STATISTICS_KEY,
+            {
+                "n_visited": self._cursor.n_visited,
+                "unfinished": self._cursor.unfinished,
+                "told": sorted(self._told),
+                "value_range": self._value_range,
+                "arms": {
+                    param_name: [[choice, *arm] for choice, arm in arms.items()]
+                    for param_name, arms in self._arms.items()
+                },
+            },
+        )
+
+    def _load(self, study: Study, trials: list[FrozenTrial]) -> None:
+        system_attrs = study._storage.get_study_system_attrs(study._study_id)
+        if _STATISTICS_KEY not in system_attrs:
+            return
+
+        state = system_attrs[_STATISTICS_KEY]
+        if state["n_visited"] > len(trials):
+            # The stored statistics are newer than the trials read from the storage, so that
+            # the statistics are counted from scratch instead.
+            return
+        self._cursor.reset(study, state["n_visited"], state["unfinished"])
+        self._told = set(state["told"])
+        self._value_range = state["value_range"]
+        self._arms = {
+            param_name: {choice: [s, s2, n] for choice, s, s2, n in arms}
+            for param_name, arms in state["arms"].items()
+        }
+
+
+class _MABSampler(RandomSampler, abc.ABC):
+    """Base class of the samplers that select each categorical parameter as an arm of a bandit."""
+
+    def __init__(self, seed: int | None = None) -> None:
+        super().__init__(seed)
+        self._statistics = _RunningStatistics()
+        self._synced_trial_number: int | None = None
+        # The arms selected by the running trials of this process.
+        self._running_arms: dict[int, list[tuple[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[Any, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[Any, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def sample_independent(
+        self,
+        study: Study,
+        trial: FrozenTrial,
+        param_name: str,
+        param_distribution: BaseDistribution,
+    ) -> Any:
+        with self._lock:
+            if self._synced_trial_number != trial.number:
+                self._statistics.sync(study)
+                self._synced_trial_number = trial.number
+
+            arms = self._statistics.get(param_name)
+            choices = param_distribution.choices  # type: ignore[attr-defined]
+
+            # Use never selected arm for initialization like UCB1 algorithm.
+            # ref. https://github.com/optuna/optunahub-registry/pull/155#discussion_r1780446062
+            never_selected = [arm for arm in choices if arm not in arms]
+            if never_selected:
+                choice = self._rng.rng.choice(never_selected)
+            else:
+                n_running: dict[Any, int] = {}
+                for running_arms in self._running_arms.values():
+                    for name, running_choice in running_arms:
+                        if name == param_name:
+                            n_running[running_choice] = n_running.get(running_choice, 0) + 1
+                choice = self._select_arm(study, choices, arms, n_running)
+
+            self._running_arms.setdefault(trial.number, []).append((param_name, choice))
+            return choice
+
+    @abc.abstractmethod
+    def _select_arm(
+        self,
+        study: Study,
+        choices: Sequence[Any],
+        arms: dict[Any, list],
+        n_running: dict[Any, int],
+    ) -> Any:
+        """Select an arm after all arms are selected at least once.
+
+        Args:
+            study:
+                The study.
+            choices:
+                The choices of the parameter.
+            arms:
+                The sum of rewards, the sum of squared rewards, and the number of pulls of each
+                arm.
+            n_running:
+                The number of running trials of this process that selected each arm.
+        """
+        raise NotImplementedError
+
+    def after_trial(
+        self,
+        study: Study,
+        trial: FrozenTrial,
+        state: TrialState,
+        values: Sequence[float] | None,
+    ) -> None:
+        with self._lock:
+            self._running_arms.pop(trial.number, None)
+            # The next trial may have the same number, e.g., in another study.
+            self._synced_trial_number = None
+            self._statistics.sync(study)
+            self._statistics.add_running_trial(study, trial, state, values)
+
+
+def _best(study: Study, choices: Sequence[Any], score: dict[Any, float]) -> Any:
+    if study.direction == StudyDirection.MINIMIZE:
+        return min(choices, key=lambda x: score[x])
+    else:
+        return max(choices, key=lambda x: score[x])
+
+
+def _pooled_std(arms: dict[Any, list]) -> float:
+    total = sum(arm[0] for arm in arms.values())
+    total_sq = sum(arm[1] for arm in arms.values())
+    n = sum(arm[2] for arm in arms.values())
+    return math.sqrt(max(total_sq / n - (total / n) ** 2, 0.0))
+
+
+class MABEpsilonGreedySampler(_MABSampler):
     """Sampler based on Multi-armed Bandit Algorithm.
 
     Args:
@@ -31,41 +270,86 @@ class MABEpsilonGreedySampler(RandomSampler):
         super().__init__(seed)
         self._epsilon = epsilon
 
-    def sample_independent(
+    def _select_arm(
         self,
         study: Study,
-        trial: FrozenTrial,
-        param_name: str,
-        param_distribution: BaseDistribution,
+        choices: Sequence[Any],
+        arms: dict[Any, list],
+        n_running: dict[Any, int],
     ) -> Any:
-        states = (TrialState.COMPLETE, TrialState.PRUNED)
-        trials = study._get_trials(deepcopy=False, states=states, use_cache=True)
-
-        rewards_by_choice: defaultdict = defaultdict(float)
-        cnt_by_choice: defaultdict = defaultdict(int)
-        for t in trials:
-            rewards_by_choice[t.params[param_name]] += t.value
-            cnt_by_choice[t.params[param_name]] += 1
-
-        # Use never selected arm for initialization like UCB1 algorithm.
-        # ref. https://github.com/optuna/optunahub-registry/pull/155#discussion_r1780446062
-        never_selected = [
-            arm for arm in param_distribution.choices if arm not in rewards_by_choice
-        ]
-        if never_selected:
-            return self._rng.rng.choice(never_selected)
-
         # If all arms are selected at least once, select arm by epsilon-greedy.
         if self._rng.rng.rand() < self._epsilon:
-            return self._rng.rng.choice(param_distribution.choices)
+            return self._rng.rng.choice(choices)
         else:
-            if study.direction == StudyDirection.MINIMIZE:
-                return min(
-                    param_distribution.choices,
-                    key=lambda x: rewards_by_choice[x] / cnt_by_choice[x],
-                )
-            else:
-                return max(
-                    param_distribution.choices,
-                    key=lambda x: rewards_by_choice[x] / cnt_by_choice[x],
-                )
+            return _best(study, choices, {x: arms[x][0] / arms[x][2] for x in choices})
+
+
+class MABUCB1Sampler(_MABSampler):
+    """Sampler based on Multi-armed Bandit Algorithm with UCB1 arm selection.
+
+    Since the objective values are not bounded in ``[0, 1]``, the exploration term is scaled by
+    the difference between the maximum and minimum objective values observed so far. The arms
+    selected by the running trials are counted as pulled, so that parallel workers select
+    different arms.
+
+    Args:
+        exploration_weight (float):
+            Weight of the exploration term.
+        seed (int | None):
+            Seed for random number generator and arm selection.
+
+    """
+
+    def __init__(
+        self,
+        exploration_weight: float = 1.0,
+        seed: int | None = None,
+    ) -> None:
+        super().__init__(seed)
+        self._exploration_weight = exploration_weight
+
+    def _select_arm(
+        self,
+        study: Study,
+        choices: Sequence[Any],
+        arms: dict[Any, list],
+        n_running: dict[Any, int],
+    ) -> Any:
+        scale = self._exploration_weight * self._statistics.value_range
+        n_total = sum(arms[x][2] + n_running.get(x, 0) for x in choices)
+        sign = -1.0 if study.direction == StudyDirection.MINIMIZE else 1.0
+        score = {
+            x: arms[x][0] / arms[x][2]
+            + sign * scale * math.sqrt(2 * math.log(n_total) / (arms[x][2] + n_running.get(x, 0)))
+            for x in choices
+        }
+        return _best(study, choices, score)
+
+
+class MABThompsonSampler(_MABSampler):
+    """Sampler based on Multi-armed Bandit Algorithm with Thompson sampling.
+
+    The mean reward of each arm is sampled from a Gaussian posterior whose variance is estimated
+    from all the objective values observed for the parameter. Since the arm selection is
+    randomized, parallel workers naturally select different arms.
+
+    Args:
+        seed (int | None):
+            Seed for random number generator and arm selection.
+
+    """
+
+    def _select_arm(
+        self,
+        study: Study,
+        choices: Sequence[Any],
+        arms: dict[Any, list],
+        n_running: dict[Any, int],
+    ) -> Any:
+        std = _pooled_std(arms)
+        score = {
+            x: arms[x][0] / arms[x][2]
+            + std / math.sqrt(arms[x][2]) * self._rng.rng.standard_normal()
+            for x in choices
+        }
+        return _best(study, choices, score)
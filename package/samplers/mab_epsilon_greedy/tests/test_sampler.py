@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from typing import Any
+
+import optuna
+from optuna.trial import TrialState
+import optunahub
+import pytest
+
+
+mab = optunahub.load_local_module(package="samplers/mab_epsilon_greedy", registry_root="package/")
+
+_STATISTICS_KEY = "mab:arm_statistics"
+
+parametrize_sampler = pytest.mark.parametrize(
+    "sampler_class",
+    [mab.MABEpsilonGreedySampler, mab.MABUCB1Sampler, mab.MABThompsonSampler],
+)
+
+
+def _objective(trial: optuna.Trial) -> float:
+    x = trial.suggest_categorical("x", [0, 1, 2, 3])
+    y = trial.suggest_categorical("y", ["a", "b"])
+    return x + (y == "b") * 0.5
+
+
+def _expected_arms(study: optuna.Study, param_name: str) -> dict[Any, list]:
+    arms: dict[Any, list] = {}
+    for trial in study.get_trials(states=(TrialState.COMPLETE, TrialState.PRUNED)):
+        if param_name not in trial.params:
+            continue
+        arm = arms.setdefault(trial.params[param_name], [0.0, 0.0, 0])
+        arm[0] += trial.value
+        arm[1] += trial.value * trial.value
+        arm[2] += 1
+    return arms
+
+
+@pytest.mark.parametrize("sampler_class", [mab.MABUCB1Sampler, mab.MABThompsonSampler])
+@pytest.mark.parametrize("direction", ["minimize", "maximize"])
+def test_sampler_pulls_best_arm_most(sampler_class: Any, direction: str) -> None:
+    study = optuna.create_study(direction=direction, sampler=sampler_class(seed=0))
+    study.optimize(_objective, n_trials=100)
+
+    best_x = 0 if direction == "minimize" else 3
+    n_pulls = {x: arm[2] for x, arm in _expected_arms(study, "x").items()}
+    assert max(n_pulls, key=lambda x: n_pulls[x]) == best_x
+
+
+def test_ucb1_sampler_counts_running_trials() -> None:
+    study = optuna.create_study(sampler=mab.MABUCB1Sampler(exploration_weight=100.0, seed=0))
+    for x in [0, 1, 2, 3]:
+        study.enqueue_trial({"x": x, "y": "a"})
+    study.optimize(_objective, n_trials=4)
+
+    # The exploration term dominates, so that the running trials select different arms.
+    trials = [study.ask() for _ in range(4)]
+    assert sorted(trial.suggest_categorical("x", [0, 1, 2, 3]) for trial in trials) == [0, 1, 2, 3]
+
+
+@parametrize_sampler
+def test_statistics_with_stale_running_trial(sampler_class: Any) -> None:
+    sampler = sampler_class(seed=0)
+    study = optuna.create_study(sampler=sampler)
+    stale_trial = study.ask()
+    stale_trial.suggest_categorical("x", [0, 1, 2, 3])
+    study.optimize(_objective, n_trials=50)
+
+    for param_name in ["x", "y"]:
+        assert sampler._statistics.get(param_name) == _expected_arms(study, param_name)
+
+    state = study._storage.get_study_system_attrs(study._study_id)[_STATISTICS_KEY]
+    # The last trial is still running in the storage when its result is counted.
+    assert state["n_visited"] == 51
+    assert state["unfinished"] == [0, 50]
+    assert state["told"] == [50]
+
+
+@parametrize_sampler
+def test_resume_from_stored_statistics(sampler_class: Any) -> None:
+    storage = optuna.storages.InMemoryStorage()
+    study = optuna.create_study(storage=storage, sampler=sampler_class(seed=0))
+    running_trial = study.ask()
+    running_trial.suggest_categorical("x", [0, 1, 2, 3])
+    study.optimize(_objective, n_trials=30)
+
+    # The trials finished by a worker without the sampler are added by visiting them.
+    other_study = optuna.load_study(
+        study_name=study.study_name, storage=storage, sampler=optuna.samplers.RandomSampler(0)
+    )
+    other_study.tell(running_trial, 10.0)
+    other_study.optimize(_objective, n_trials=10)
+
+    sampler = sampler_class(seed=1)
+    resumed_study = optuna.load_study(
+        study_name=study.study_name, storage=storage, sampler=sampler
+    )
+    state = storage.get_study_system_attrs(study._study_id)[_STATISTICS_KEY]
+    visited = []
+    original_add = sampler._statistics._add
+
+    def _add(trial: optuna.trial.FrozenTrial, *args: Any) -> bool:
+        visited.append(trial.number)
+        return original_add(trial, *args)
+
+    sampler._statistics._add = _add
+    sampler._statistics.sync(resumed_study)
+
+    assert visited == [0, *range(state["n_visited"], 41)]
+    for param_name in ["x", "y"]:
+        assert sampler._statistics.get(param_name) == _expected_arms(resumed_study, param_name)
+
+    resumed_study.optimize(_objective, n_trials=10)
+    for param_name in ["x", "y"]:
+        assert sampler._statistics.get(param_name) == _expected_arms(resumed_study, param_name)
+
+
+@parametrize_sampler
+def test_reuse_for_another_study(sampler_class: Any) -> None:
+    sampler = sampler_class(seed=0)
+    study = optuna.create_study(sampler=sampler)
+    study.optimize(_objective, n_trials=20)
+
+    # Every study of ``InMemoryStorage`` has the same ID.
+    another_study = optuna.create_study(sampler=sampler)
+    another_study.optimize(_objective, n_trials=5)
+    for param_name in ["x", "y"]:
+        assert sampler._statistics.get(param_name) == _expected_arms(another_study, param_name)
+
+    state = another_study._storage.get_study_system_attrs(another_study._study_id)
+    assert state[_STATISTICS_KEY]["n_visited"] == 5
@@ -2,7 +2,10 @@ from __future__ import annotations
 
 from collections.abc import Sequence
 import math
+import os
+import types
 from typing import Any
+from typing import NamedTuple
 
 import numpy as np
 import optuna
@@ -17,12 +20,157 @@ from optuna.search_space import IntersectionSearchSpace
 from optuna.study._multi_objective import _dominates
 from optuna.study._multi_objective import _fast_non_domination_rank
 from optuna.study._study_direction import StudyDirection
+from optuna.trial import FrozenTrial
 from optuna.trial import TrialState
+import optunahub
 
 
+def _load_simple() -> types.ModuleType:
+    # ``samplers/simple`` provides ``TrialCursor``. It is loaded from the registry this package is
+    # loaded from if it is there, e.g., in a clone of the registry.
+    registry_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if os.path.isfile(os.path.join(registry_root, "samplers", "simple", "__init__.py")):
+        return optunahub.load_local_module("samplers/simple", registry_root=registry_root)
+    return optunahub.load_module("samplers/simple")
+
+
+TrialCursor = _load_simple().TrialCursor
+
 _EPS = 1e-8
 
 
+class _GenerationState(NamedTuple):
+    """The (1+1)-CMA-ES parameters of the elites of a generation.
+
+    The parameters of all the elites are packed into arrays and stored as a single study system
+    attribute per generation.
+    """
+
+    elite_ids: list[int]
+    param_names: list[str]
+    sigma: np.ndarray  # (popsize,)
+    p_succ: np.ndarray  # (popsize,)
+    p_c: np.ndarray  # (popsize, n)
+    cov: np.ndarray  # (popsize, n, n)
+
+    def to_attr(self) -> dict[str, Any]:
+        return {
+            "elite_ids": self.elite_ids,
+            "param_names": self.param_names,
+            "sigma": self.sigma.tolist(),
+            "p_succ": self.p_succ.tolist(),
+            "p_c": self.p_c.tolist(),
+            "cov": self.cov.tolist(),
+        }
+
+    @classmethod
+    def from_attr(cls, attr: dict[str, Any]) -> _GenerationState:
+        n_elites = len(attr["elite_ids"])
+        n = len(attr["param_names"])
+        return cls(
+            elite_ids=attr["elite_ids"],
+            param_names=attr["param_names"],
+            sigma=np.asarray(attr["sigma"], dtype=float),
+            p_succ=np.asarray(attr["p_succ"], dtype=float),
+            p_c=np.asarray(attr["p_c"], dtype=float).reshape(n_elites, n),
+            cov=np.asarray(attr["cov"], dtype=float).reshape(n_elites, n, n),
+        )
+
+    @classmethod
+    def from_legacy_attrs(
+        cls,
+        study_system_attrs: dict[str, Any],
+        g: int,
+        trials_by_id: dict[int, FrozenTrial],
+        param_names: list[str],
+    ) -> _GenerationState:
+        # Older versions stored the elite ids of each generation and the parameters of each trial
+        # as separate study system attrs. The vectors of a trial are ordered as its params,
+        # restricted to the numerical ones when the trial has categorical params.
+        elite_ids = study_system_attrs[f"mocma:generation:{g}:elite_ids"]
+        sigma, p_succ, p_c, cov = [], [], [], []
+        for eid in elite_ids:
+            trial = trials_by_id[eid]
+            sigma.append(study_system_attrs[f"mocma:trial:{eid}:sigma"])
+            p_succ.append(study_system_attrs[f"mocma:trial:{eid}:p_succ"])
+            p_c_e = np.asarray(study_system_attrs[f"mocma:trial:{eid}:p_c"], dtype=float)
+            cov_e = np.asarray(study_system_attrs[f"mocma:trial:{eid}:cov"], dtype=float)
+            p_c_indices = _legacy_indices(trial, len(p_c_e), param_names)
+            cov_indices = _legacy_indices(trial, len(cov_e), param_names)
+            p_c.append(p_c_e[p_c_indices])
+            cov.append(cov_e[np.ix_(cov_indices, cov_indices)])
+        n = len(param_names)
+        return cls(
+            elite_ids=list(elite_ids),
+            param_names=param_names,
+            sigma=np.asarray(sigma, dtype=float),
+            p_succ=np.asarray(p_succ, dtype=float),
+            p_c=np.asarray(p_c, dtype=float).reshape(len(elite_ids), n),
+            cov=np.asarray(cov, dtype=float).reshape(len(elite_ids), n, n),
+        )
+
+    def select(self, param_names: list[str]) -> _GenerationState:
+        if param_names == self.param_names:
+            return self
+        indices = np.asarray([self.param_names.index(name) for name in param_names], dtype=int)
+        return self._replace(
+            param_names=param_names,
+            p_c=self.p_c[:, indices],
+            cov=self.cov[:, indices[:, np.newaxis], indices],
+        )
+
+
+def _legacy_indices(trial: FrozenTrial, size: int, param_names: list[str]) -> np.ndarray:
+    names = list(trial.params)
+    if len(names) != size:
+        names = [
+            name
+            for name in names
+            if isinstance(trial.distributions[name], (FloatDistribution, IntDistribution))
+        ]
+    if len(names) != size or any(name not in names for name in param_names):
+        raise ValueError(
+            f"Cannot restore the MO-CMA-ES parameters of trial {trial.number} stored by an older "
+            "version of MoCmaSampler. Please start a new study."
+        )
+    return np.asarray([names.index(name) for name in param_names], dtype=int)
+
+
+class _TrialIndex:
+    """An index of complete trials updated only with the trials finished since the last call."""
+
+    def __init__(self) -> None:
+        self._cursor = TrialCursor()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.trials_by_id: dict[int, FrozenTrial] = {}
+        # Generation -> instance number -> complete trials.
+        self.classified_trials: dict[int, dict[int, list[FrozenTrial]]] = {0: {}}
+        self.generation = 0
+
+    def update(self, study: optuna.Study) -> bool:
+        """Index the trials finished since the last call.
+
+        Returns:
+            Whether the index started over for another study.
+        """
+        finished_trials, restarted = self._cursor.update(study)
+        if restarted:
+            self._reset()
+
+        for t in finished_trials:
+            if t.state != TrialState.COMPLETE:
+                continue
+
+            g_ = t.system_attrs["mocma:g"]
+            k_ = t.system_attrs["mocma:k"]
+            self.generation = max(self.generation, g_)
+            self.trials_by_id[t._trial_id] = t
+            self.classified_trials.setdefault(g_, {}).setdefault(k_, []).append(t)
+        return restarted
+
+
 class MoCmaSampler(BaseSampler):
     """A sampler based on the Multi-Objective Covariance Matrix Adaptation Evolution Strategy (MO-CMA-ES).
 
@@ -58,6 +206,9 @@ class MoCmaSampler(BaseSampler):
         self._popsize = popsize
         self._search_space = search_space
         self._intersection_search_space = IntersectionSearchSpace()
+        self._trial_index = _TrialIndex()
+        # The states of each generation never change once they are stored, so they are cached.
+        self._generation_states: dict[int, _GenerationState] = {}
 
     def reseed_rng(self) -> None:
         self._rng.rng.seed()
@@ -108,23 +259,13 @@ class MoCmaSampler(BaseSampler):
         if self._popsize is None:
             self._popsize = 4 + math.floor(3 * math.log(n))
 
-        # Compute generation g and instance k.
-        complete_trials = [
-            t for t in study.get_trials(deepcopy=False, states=[TrialState.COMPLETE])
-        ]
-
         # Classify trials by generation and instance number.
-        classified_trials: dict[int, dict] = {0: {}}
-        g = 0  # current generation
-        for t in complete_trials:
-            g_ = t.system_attrs["mocma:g"]
-            k_ = t.system_attrs["mocma:k"]
-            g = max(g, g_)
-            if g_ not in classified_trials:
-                classified_trials[g_] = {}
-            if k_ not in classified_trials[g_]:
-                classified_trials[g_][k_] = []
-            classified_trials[g_][k_].append(t)
+        if self._trial_index.update(study):
+            # The states of the generations of another study must not be used.
+            self._generation_states.clear()
+        classified_trials = self._trial_index.classified_trials
+        trials_by_id = self._trial_index.trials_by_id
+        g = self._trial_index.generation  # current generation
 
         generation_finished = True
         ks = []
@@ -159,94 +300,67 @@ class MoCmaSampler(BaseSampler):
         elif g == 1 and generation_finished:
             # Set parameters for the first generation (g = 0).
             elites = [
-                list(sorted(instance, key=lambda x: x.datetime_complete))[0]
+                min(instance, key=lambda x: x.datetime_complete)
                 for instance in classified_trials[g - 1].values()
             ]
-            for a in elites:
-                study._storage.set_study_system_attr(
-                    study._study_id, f"mocma:trial:{a._trial_id}:sigma", sigma
-                )
-                study._storage.set_study_system_attr(
-                    study._study_id,
-                    f"mocma:trial:{a._trial_id}:cov",
-                    np.eye(len(a.params)).tolist(),
-                )
-                study._storage.set_study_system_attr(
-                    study._study_id, f"mocma:trial:{a._trial_id}:p_succ", p_targetsucc
-                )
-                study._storage.set_study_system_attr(
-                    study._study_id,
-                    f"mocma:trial:{a._trial_id}:p_c",
-                    np.zeros(len(a.params)).tolist(),
-                )
-            elite_ids = [e._trial_id for e in elites]
-            study._storage.set_study_system_attr(
-                study._study_id, f"mocma:generation:{g-1}:elite_ids", elite_ids
+            self._set_generation_state(
+                study,
+                g - 1,
+                _GenerationState(
+                    elite_ids=[e._trial_id for e in elites],
+                    param_names=list(search_space),
+                    sigma=np.full(len(elites), sigma),
+                    p_succ=np.full(len(elites), p_targetsucc),
+                    p_c=np.zeros((len(elites), n)),
+                    cov=np.tile(np.eye(n), (len(elites), 1, 1)),
+                ),
             )
         elif g >= 2 and generation_finished:
             # This section conducts the parameter updates for g-1 with individuals for g-1 and g-2
             # before generating individuals for generation g.
-            study_system_attrs = study._storage.get_study_system_attrs(study._study_id)
-
-            parents = [
-                [t for t in complete_trials if t._trial_id == eid][0]
-                for eid in study_system_attrs[f"mocma:generation:{g-2}:elite_ids"]
-            ]
             # Handling conditional parameters for parents
             # (Discard cma parmeter values for paramaters not in the intersection search space)
-            for a in parents:
-                indices = [i for i, n in enumerate(a.params) if n in search_space]
-                a.params = {n: a.params[n] for n in search_space}
-                p_c_a = np.asarray(study_system_attrs[f"mocma:trial:{a._trial_id}:p_c"])
-                p_c_a = p_c_a[indices]
-                study._storage.set_study_system_attr(
-                    study._study_id, f"mocma:trial:{a._trial_id}:p_c", p_c_a.tolist()
-                )
+            parent_state = self._get_generation_state(study, g - 2, list(search_space))
+            parents = [trials_by_id[eid] for eid in parent_state.elite_ids]
+            parent_indices = {eid: i for i, eid in enumerate(parent_state.elite_ids)}
 
             offsprings = [
-                list(sorted(instance, key=lambda x: x.datetime_complete))[0]
+                min(instance, key=lambda x: x.datetime_complete)
                 for instance in classified_trials[g - 1].values()
             ]
-            # Handling conditional parameters for offsprings
-            for a_ in offsprings:
-                a_.params = {n: a_.params[n] for n in search_space}
-
-            # Reload study_system_attrs
-            study_system_attrs = study._storage.get_study_system_attrs(study._study_id)
 
+            # The updated parameters of the parents, followed by those of the offsprings.
+            sigmas = parent_state.sigma.tolist()
+            p_succs = parent_state.p_succ.tolist()
+            p_cs = list(parent_state.p_c)
+            covs = list(parent_state.cov)
             for a_ in offsprings:
                 # Find parent a for a_
-                a = [p for p in parents if p._trial_id == a_.system_attrs["mocma:parent_id"]][0]
+                i = parent_indices[a_.system_attrs["mocma:parent_id"]]
+                a = parents[i]
                 lambda_succ = int(_dominates(a_, a, study.directions))
 
                 # Update parent step size
-                p_succ_a = study_system_attrs[f"mocma:trial:{a._trial_id}:p_succ"]
-                p_succ_a = (1 - c_p) * p_succ_a + c_p * lambda_succ
-                sigma_a = study_system_attrs[f"mocma:trial:{a._trial_id}:sigma"]
-                sigma_a = sigma_a * math.exp(
+                p_succ_a = (1 - c_p) * parent_state.p_succ[i] + c_p * lambda_succ
+                sigma_a = parent_state.sigma[i] * math.exp(
                     (1 / d) * ((p_succ_a - p_targetsucc) / (1 - p_targetsucc))
                 )
                 sigma_a = max(sigma_a, _EPS)
-                study._storage.set_study_system_attr(
-                    study._study_id, f"mocma:trial:{a._trial_id}:p_succ", p_succ_a
-                )
-                study._storage.set_study_system_attr(
-                    study._study_id, f"mocma:trial:{a._trial_id}:sigma", sigma_a
-                )
+                p_succs[i] = p_succ_a
+                sigmas[i] = sigma_a
 
-                # Update offspring step size and covariance matrix
-                p_succ_a_ = np.asarray(study_system_attrs[f"mocma:trial:{a_._trial_id}:p_succ"])
-                p_succ_a_ = (1 - c_p) * p_succ_a_ + c_p * lambda_succ
-                sigma_a_ = study_system_attrs[f"mocma:trial:{a_._trial_id}:sigma"]
-                sigma_a_ = sigma_a_ * math.exp(
+                # Update offspring step size and covariance matrix.
+                # The offspring inherited the parameters of its parent when it was sampled.
+                p_succ_a_ = (1 - c_p) * parent_state.p_succ[i] + c_p * lambda_succ
+                sigma_a_ = parent_state.sigma[i] * math.exp(
                     (1 / d) * ((p_succ_a_ - p_targetsucc) / (1 - p_targetsucc))
                 )
                 sigma_a_ = max(sigma_a_, _EPS)
-                cov_a_ = np.asarray(study_system_attrs[f"mocma:trial:{a_._trial_id}:cov"])
-                p_c = np.asarray(study_system_attrs[f"mocma:trial:{a._trial_id}:p_c"])
+                cov_a_ = parent_state.cov[i]
+                p_c = parent_state.p_c[i]
                 if p_succ_a_ < p_thresh:
-                    values_a_ = np.asarray(list(a_.params.values()))
-                    values_a = np.asarray(list(a.params.values()))
+                    values_a_ = np.asarray([a_.params[name] for name in search_space])
+                    values_a = np.asarray([a.params[name] for name in search_space])
                     x_step = (values_a_ - values_a) / sigma_a
                     p_c = (1 - c_c) * p_c + math.sqrt(c_c * (2 - c_c)) * x_step
                     cov_a_ = (1 - c_cov) * cov_a_ + c_cov * p_c @ p_c.T
@@ -256,21 +370,13 @@ class MoCmaSampler(BaseSampler):
                         p_c @ p_c.T + c_c * (2 - c_c) * cov_a_
                     )
 
-                study._storage.set_study_system_attr(
-                    study._study_id, f"mocma:trial:{a_._trial_id}:sigma", float(sigma_a_)
-                )
-                study._storage.set_study_system_attr(
-                    study._study_id, f"mocma:trial:{a_._trial_id}:cov", cov_a_.tolist()
-                )
-                study._storage.set_study_system_attr(
-                    study._study_id, f"mocma:trial:{a_._trial_id}:p_succ", float(p_succ_a_)
-                )
-                study._storage.set_study_system_attr(
-                    study._study_id, f"mocma:trial:{a_._trial_id}:p_c", p_c.tolist()
-                )
+                sigmas.append(sigma_a_)
+                p_succs.append(p_succ_a_)
+                p_cs.append(p_c)
+                covs.append(cov_a_)
 
             # Selecting elites
-            population = np.asarray(parents + offsprings)
+            population = parents + offsprings
             objective_values = np.asarray([i.values for i in population])
             non_domination_ranks = _fast_non_domination_rank(
                 objective_values, n_below=self._popsize
@@ -278,7 +384,7 @@ class MoCmaSampler(BaseSampler):
             elites = []
             for i in range(len(population)):
                 # Selection based on non-dmination ranks
-                front_i = population[non_domination_ranks == i].tolist()
+                front_i = np.flatnonzero(non_domination_ranks == i).tolist()
                 if len(elites) + len(front_i) <= self._popsize:
                     elites += front_i
                     continue
@@ -316,45 +422,30 @@ class MoCmaSampler(BaseSampler):
                     # Remove selected candidate
                     rank_i_vals = np.delete(rank_i_vals, candidate, axis=0)
                     del front_i[candidate]
-            elite_ids = [e._trial_id for e in elites]
-            study._storage.set_study_system_attr(
-                study._study_id, f"mocma:generation:{g-1}:elite_ids", elite_ids
-            )
 
-        # Load/reload study_system_attrs after updates
-        study_system_attrs = study._storage.get_study_system_attrs(study._study_id)
+            self._set_generation_state(
+                study,
+                g - 1,
+                _GenerationState(
+                    elite_ids=[population[i]._trial_id for i in elites],
+                    param_names=list(search_space),
+                    sigma=np.asarray(sigmas)[elites],
+                    p_succ=np.asarray(p_succs)[elites],
+                    p_c=np.asarray(p_cs)[elites],
+                    cov=np.asarray(covs)[elites],
+                ),
+            )
 
         # Generate individual for generation g and instance k
-        a = [
-            t
-            for t in complete_trials
-            if t._trial_id == study_system_attrs[f"mocma:generation:{g-1}:elite_ids"][k]
-        ][0]
-        mean = trans.transform(a.params)
-        sigma = study_system_attrs[f"mocma:trial:{a._trial_id}:sigma"]
-        cov = np.asarray(study_system_attrs[f"mocma:trial:{a._trial_id}:cov"])
-        p_c = np.asarray(study_system_attrs[f"mocma:trial:{a._trial_id}:p_c"])
-        p_succ = study_system_attrs[f"mocma:trial:{a._trial_id}:p_succ"]
-
         # Handling conditional parameters
         # (Discard cma parmeter values for paramaters not in the intersection search space)
-        indices = np.asarray([i for i, n in enumerate(a.params) if n in search_space])
-        cov = cov[np.ix_(indices, indices)]
-        p_c = p_c[indices]
+        elite_state = self._get_generation_state(study, g - 1, list(search_space))
+        a = trials_by_id[elite_state.elite_ids[k]]
+        mean = trans.transform(a.params)
+        sigma = float(elite_state.sigma[k])
+        cov = elite_state.cov[k]
 
         study._storage.set_trial_system_attr(trial._trial_id, "mocma:parent_id", a._trial_id)
-        study._storage.set_study_system_attr(
-            study._study_id, f"mocma:trial:{trial._trial_id}:sigma", float(sigma)
-        )
-        study._storage.set_study_system_attr(
-            study._study_id, f"mocma:trial:{trial._trial_id}:cov", cov.tolist()
-        )
-        study._storage.set_study_system_attr(
-            study._study_id, f"mocma:trial:{trial._trial_id}:p_succ", float(p_succ)
-        )
-        study._storage.set_study_system_attr(
-            study._study_id, f"mocma:trial:{trial._trial_id}:p_c", p_c.tolist()
-        )
 
         x = np.clip(
             self._rng.rng.multivariate_normal(mean, sigma**2 * cov),
@@ -373,6 +464,29 @@ class MoCmaSampler(BaseSampler):
 
         return external_values
 
+    def _get_generation_state(
+        self, study: optuna.study, g: int, param_names: list[str]
+    ) -> _GenerationState:
+        if g not in self._generation_states:
+            # Read the study system attrs only when another worker stored the state.
+            study_system_attrs = study._storage.get_study_system_attrs(study._study_id)
+            key = f"mocma:generation:{g}:state"
+            if key in study_system_attrs:
+                state = _GenerationState.from_attr(study_system_attrs[key])
+            else:
+                # The generation was produced by an older version of the sampler.
+                state = _GenerationState.from_legacy_attrs(
+                    study_system_attrs, g, self._trial_index.trials_by_id, param_names
+                )
+            self._generation_states[g] = state
+        return self._generation_states[g].select(param_names)
+
+    def _set_generation_state(self, study: optuna.study, g: int, state: _GenerationState) -> None:
+        study._storage.set_study_system_attr(
+            study._study_id, f"mocma:generation:{g}:state", state.to_attr()
+        )
+        self._generation_states[g] = state
+
     def sample_independent(
         self,
         study: optuna.study,
@@ -662,3 +662,96 @@ def test_cache_is_invalidated(
         return -1
 
     study.optimize(objective, n_trials=10, n_jobs=n_jobs)
+
+
+def _bi_objective(trial: Trial) -> tuple[float, float]:
+    x = trial.suggest_float("x", -5, 5)
+    y = trial.suggest_int("y", -5, 5)
+    return x**2 + y**2, (x - 2) ** 2 + (y - 1) ** 2
+
+
+def test_generation_state_is_shared_across_samplers() -> None:
+    study = optuna.create_study(
+        directions=["minimize", "minimize"], sampler=MoCmaSampler(popsize=popsize, seed=0)
+    )
+    study.optimize(_bi_objective, n_trials=popsize * 4)
+    sampler = study.sampler
+    assert isinstance(sampler, MoCmaSampler)
+
+    another_sampler = MoCmaSampler(popsize=popsize, seed=0)
+    another_sampler._trial_index.update(study)
+    for g in range(3):
+        stored = sampler._get_generation_state(study, g, ["x", "y"])
+        loaded = another_sampler._get_generation_state(study, g, ["x", "y"])
+        assert loaded.elite_ids == stored.elite_ids
+        np.testing.assert_array_equal(loaded.sigma, stored.sigma)
+        np.testing.assert_array_equal(loaded.p_succ, stored.p_succ)
+        np.testing.assert_array_equal(loaded.p_c, stored.p_c)
+        np.testing.assert_array_equal(loaded.cov, stored.cov)
+
+
+def test_resume_study_with_legacy_attrs() -> None:
+    # Older versions stored the parameters of each trial as separate study system attrs.
+    study = optuna.create_study(directions=["minimize", "minimize"])
+    rng = np.random.RandomState(0)
+    for k in range(popsize):
+        study.add_trial(
+            optuna.trial.create_trial(
+                params={"x": float(rng.uniform(-5, 5)), "y": int(rng.randint(-5, 6))},
+                distributions={"x": FloatDistribution(-5, 5), "y": IntDistribution(-5, 5)},
+                values=[float(k), float(popsize - k)],
+                system_attrs={"mocma:g": 0, "mocma:k": k},
+            )
+        )
+    elite_ids = [t._trial_id for t in study.trials]
+    storage = study._storage
+    storage.set_study_system_attr(study._study_id, "mocma:generation:0:elite_ids", elite_ids)
+    for i, eid in enumerate(elite_ids):
+        storage.set_study_system_attr(study._study_id, f"mocma:trial:{eid}:sigma", 0.1 * (i + 1))
+        storage.set_study_system_attr(study._study_id, f"mocma:trial:{eid}:p_succ", 0.2)
+        storage.set_study_system_attr(study._study_id, f"mocma:trial:{eid}:p_c", [0.0, float(i)])
+        storage.set_study_system_attr(
+            study._study_id, f"mocma:trial:{eid}:cov", [[1.0, 0.0], [0.0, float(i + 1)]]
+        )
+
+    # All but one offspring of the generation 1 were sampled from the legacy attrs.
+    for k in range(popsize - 1):
+        study.add_trial(
+            optuna.trial.create_trial(
+                params={"x": float(rng.uniform(-5, 5)), "y": int(rng.randint(-5, 6))},
+                distributions={"x": FloatDistribution(-5, 5), "y": IntDistribution(-5, 5)},
+                values=[float(rng.uniform()), float(rng.uniform())],
+                system_attrs={"mocma:g": 1, "mocma:k": k, "mocma:parent_id": elite_ids[k]},
+            )
+        )
+
+    sampler = MoCmaSampler(popsize=popsize, seed=0)
+    study.sampler = sampler
+    study.optimize(_bi_objective, n_trials=popsize * 3)
+
+    state = sampler._get_generation_state(study, 0, ["y", "x"])
+    assert state.elite_ids == elite_ids
+    np.testing.assert_allclose(state.sigma, 0.1 * np.arange(1, popsize + 1))
+    np.testing.assert_array_equal(state.p_c[:, 0], np.arange(popsize))
+    np.testing.assert_array_equal(state.cov[:, 0, 0], np.arange(1, popsize + 1))
+    assert study.trials[2 * popsize - 1].system_attrs["mocma:g"] == 1
+    assert study.trials[2 * popsize - 1].system_attrs["mocma:parent_id"] == elite_ids[-1]
+    assert max(t.system_attrs["mocma:g"] for t in study.trials) >= 3
+
+
+def test_reuse_for_another_study() -> None:
+    sampler = MoCmaSampler(popsize=popsize, seed=0)
+    study = optuna.create_study(directions=["minimize", "minimize"], sampler=sampler)
+    study.optimize(_bi_objective, n_trials=popsize * 4)
+    assert max(sampler._generation_states) >= 2
+
+    # Every study of ``InMemoryStorage`` has the same ID.
+    other_study = optuna.create_study(directions=["minimize", "minimize"], sampler=sampler)
+    other_study.optimize(_bi_objective, n_trials=popsize * 2 + 1)
+    assert [t.system_attrs["mocma:g"] for t in other_study.trials] == (
+        [0] * popsize + [1] * popsize + [2]
+    )
+    # The state of the first generation is selected from the trials of the new study.
+    state = sampler._get_generation_state(other_study, 0, ["x", "y"])
+    assert set(state.elite_ids) <= {t._trial_id for t in other_study.trials[:popsize]}
+    assert max(sampler._generation_states) == 1
@@ -53,54 +53,40 @@ class MOEAdElitePopulationSelectionStrategy:
     def _update_neighboring_solutions(
         self, population: list[FrozenTrial], weight_vectors: np.ndarray
     ) -> list[FrozenTrial]:
-        elite_population: list[FrozenTrial] = []
         offset = len(population) // 2
-
-        for id, neighbor_ids in self._neighbors.items():
-            id_old = offset + id
-            elite = population[id_old]
-            lambda_ = weight_vectors[id]
-
-            g_old = self._scalar_aggregation_func(
-                lambda_, population[id_old], self._reference_point, self._nadir_point
-            )
-            for n_id in neighbor_ids:
-                # check new population
-                target_population = population[n_id]
-                g_new = self._scalar_aggregation_func(
-                    lambda_, target_population, self._reference_point, self._nadir_point
-                )
-                if g_new < g_old:
-                    elite = target_population
-                    g_old = g_new
-
-                # check old population
-                target_population = population[n_id + offset]
-                g_new = self._scalar_aggregation_func(
-                    lambda_, target_population, self._reference_point, self._nadir_point
-                )
-                if g_new < g_old:
-                    elite = target_population
-                    g_old = g_new
-
-            elite_population.append(elite)
-
-        return elite_population
+        n_subproblems = len(weight_vectors)
+
+        # The candidates of each subproblem are its own solution in the old population followed
+        # by the new and old solutions of each neighbor. ``np.argmin`` returns the first minimum,
+        # so that a candidate replaces the current elite only if it is strictly better.
+        candidates = np.empty(
+            (n_subproblems, 1 + 2 * self._neighbor_ids.shape[1]), dtype=self._neighbor_ids.dtype
+        )
+        candidates[:, 0] = offset + np.arange(n_subproblems)
+        candidates[:, 1::2] = self._neighbor_ids
+        candidates[:, 2::2] = self._neighbor_ids + offset
+
+        values = np.asarray([trial.values for trial in population], dtype=float)
+        scores = self._scalar_aggregation_func(
+            weight_vectors[:, np.newaxis, :],
+            values[candidates],
+            self._reference_point,
+            self._nadir_point,
+        )
+        elite_ids = candidates[np.arange(n_subproblems), np.argmin(scores, axis=1)]
+        return [population[i] for i in elite_ids]
 
     def _update_reference_point(
         self, directions: list[StudyDirection], population: list[FrozenTrial]
     ) -> None:
-        self._reference_point = []
-        self._nadir_point = []  # using for normalize of subproblem objective values
-
-        for i, direction in enumerate(directions):
-            target_values = np.array([trial.values[i] for trial in population])
-            if direction == StudyDirection.MINIMIZE:
-                self._reference_point.append(np.min(target_values, axis=0))
-                self._nadir_point.append(np.max(target_values, axis=0))
-            else:
-                self._reference_point.append(np.max(target_values, axis=0))
-                self._nadir_point.append(np.min(target_values, axis=0))
+        values = np.asarray([trial.values for trial in population], dtype=float)
+        min_values = np.min(values, axis=0)
+        max_values = np.max(values, axis=0)
+        maximize = np.array([direction == StudyDirection.MAXIMIZE for direction in directions])
+
+        self._reference_point = np.where(maximize, max_values, min_values)
+        # using for normalize of subproblem objective values
+        self._nadir_point = np.where(maximize, min_values, max_values)
 
     # More uniform sequences generation method is better.
     def _generate_weight_vectors(self, n_vector: int, n_objective: int) -> np.ndarray:
@@ -117,11 +103,9 @@ class MOEAdElitePopulationSelectionStrategy:
         return self._weight_vectors
 
     def _compute_neighborhoods(self, weight_vectors: np.ndarray) -> None:
-        self._neighbors: dict[int, list[int]] = {}
-
         tree = cKDTree(weight_vectors)
-        for i, weight_vector in enumerate(weight_vectors):
-            _, idx = tree.query(weight_vector, k=self._n_neighbors + 1)
+        _, idx = tree.query(weight_vectors, k=self._n_neighbors + 1)
 
-            # include itself, first element is itself
-            self._neighbors[i] = idx
+        # include itself, first element is itself
+        self._neighbor_ids: np.ndarray = idx.reshape(len(weight_vectors), -1)
+        self._neighbors: dict[int, list[int]] = dict(enumerate(self._neighbor_ids))
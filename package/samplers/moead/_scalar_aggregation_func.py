@@ -1,28 +1,29 @@
 import numpy as np
-from optuna.trial import FrozenTrial
+
+
+# The functions broadcast over the leading axes of ``weight_vectors`` and ``values``, so that the
+# scalarized values of all the candidates of all the subproblems are computed at once. The last
+# axis is the objectives.
 
 
 def weighted_sum(
-    weight_vector: list[float],
-    trial: FrozenTrial,
-    reference_point: list[float],
-    nadir_point: list[float],
-) -> float:
-    lambda_ = np.array(weight_vector)
-    value = np.array(trial.values)
-    ref = np.array(reference_point)
-    nadir = np.array(nadir_point)
-    return float(np.sum(lambda_ * (value - ref) / (nadir - ref)))
+    weight_vectors: np.ndarray,
+    values: np.ndarray,
+    reference_point: np.ndarray,
+    nadir_point: np.ndarray,
+) -> np.ndarray:
+    return np.sum(
+        weight_vectors * (values - reference_point) / (nadir_point - reference_point), axis=-1
+    )
 
 
 def tchebycheff(
-    weight_vector: list[float],
-    trial: FrozenTrial,
-    reference_point: list[float],
-    nadir_point: list[float],
-) -> float:
-    lambda_ = np.array(weight_vector)
-    value = np.array(trial.values)
-    ref = np.array(reference_point)
-    nadir = np.array(nadir_point)
-    return float(np.max(lambda_ * np.abs((value - ref) / (nadir - ref))))
+    weight_vectors: np.ndarray,
+    values: np.ndarray,
+    reference_point: np.ndarray,
+    nadir_point: np.ndarray,
+) -> np.ndarray:
+    return np.max(
+        weight_vectors * np.abs((values - reference_point) / (nadir_point - reference_point)),
+        axis=-1,
+    )
@@ -1,13 +1,12 @@
 from __future__ import annotations
 
-from collections import defaultdict
-import hashlib
+import os
+import types
 from typing import Any
 from typing import Dict
 from typing import Literal
 from typing import TYPE_CHECKING
 
-import optuna
 from optuna.distributions import BaseDistribution
 from optuna.samplers import BaseSampler
 from optuna.samplers import RandomSampler
@@ -16,6 +15,7 @@ from optuna.samplers.nsgaii._crossovers._base import BaseCrossover
 from optuna.samplers.nsgaii._crossovers._uniform import UniformCrossover
 from optuna.search_space import IntersectionSearchSpace
 from optuna.trial import FrozenTrial
+import optunahub
 
 from ._child_generation_strategy import MOEAdChildGenerationStrategy
 from ._elite_population_selection_strategy import MOEAdElitePopulationSelectionStrategy
@@ -24,6 +24,19 @@ from ._elite_population_selection_strategy import MOEAdElitePopulationSelectionS
 if TYPE_CHECKING:
     from optuna.study import Study
 
+
+def _load_simple() -> types.ModuleType:
+    # ``samplers/simple`` provides ``GenerationIndex``. It is loaded from the registry this package
+    # is loaded from if it is there, e.g., in a clone of the registry.
+    registry_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if os.path.isfile(os.path.join(registry_root, "samplers", "simple", "__init__.py")):
+        return optunahub.load_local_module("samplers/simple", registry_root=registry_root)
+    return optunahub.load_module("samplers/simple")
+
+
+GenerationIndex = _load_simple().GenerationIndex
+
+
 # Define key names of `Trial.system_attrs`.
 _GENERATION_KEY = "moead:generation"
 _POPULATION_CACHE_KEY_PREFIX = "moead:population"
@@ -106,6 +119,7 @@ class MOEADSampler(BaseSampler):
         self._search_space = IntersectionSearchSpace()
         self._seed = seed
         self._weight_vectors = None
+        self._generation_index = GenerationIndex(_GENERATION_KEY, _POPULATION_CACHE_KEY_PREFIX)
 
         self._elite_population_selection_strategy = MOEAdElitePopulationSelectionStrategy(
             seed=seed,
@@ -172,54 +186,6 @@ class MOEADSampler(BaseSampler):
         return search_space
 
     def _collect_parent_population(self, study: Study) -> tuple[int, list[FrozenTrial]]:
-        trials = study._get_trials(deepcopy=False, use_cache=True)
-
-        generation_to_runnings = defaultdict(list)
-        generation_to_population = defaultdict(list)
-        for trial in trials:
-            if _GENERATION_KEY not in trial.system_attrs:
-                continue
-
-            generation = trial.system_attrs[_GENERATION_KEY]
-            if trial.state != optuna.trial.TrialState.COMPLETE:
-                if trial.state == optuna.trial.TrialState.RUNNING:
-                    generation_to_runnings[generation].append(trial)
-                continue
-
-            generation_to_population[generation].append(trial)
-
-        hasher = hashlib.sha256()
-        parent_population: list[FrozenTrial] = []
-        parent_generation = -1
-        while True:
-            generation = parent_generation + 1
-            population = generation_to_population[generation]
-
-            if len(population) < self._population_size:
-                break
-
-            for trial in generation_to_runnings[generation]:
-                hasher.update(bytes(str(trial.number), "utf-8"))
-
-            cache_key = "{}:{}".format(_POPULATION_CACHE_KEY_PREFIX, hasher.hexdigest())
-            study_system_attrs = study._storage.get_study_system_attrs(study._study_id)
-            cached_generation, cached_population_numbers = study_system_attrs.get(
-                cache_key, (-1, [])
-            )
-            if cached_generation >= generation:
-                generation = cached_generation
-                population = [trials[n] for n in cached_population_numbers]
-            else:
-                population.extend(parent_population)
-                population = self._elite_population_selection_strategy(study, population)
-
-                if len(generation_to_runnings[generation]) == 0:
-                    population_numbers = [t.number for t in population]
-                    study._storage.set_study_system_attr(
-                        study._study_id, cache_key, (generation, population_numbers)
-                    )
-
-            parent_generation = generation
-            parent_population = population
-
-        return parent_generation, parent_population
+        return self._generation_index.collect_parent_population(
+            study, self._population_size, self._elite_population_selection_strategy
+        )
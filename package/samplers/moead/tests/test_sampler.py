@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import optuna
+import optunahub
+
+
+moead = optunahub.load_local_module(package="samplers/moead", registry_root="package/")
+
+
+def _objective(trial: optuna.Trial) -> tuple[float, float]:
+    x = trial.suggest_float("x", 0, 1)
+    y = trial.suggest_float("y", 0, 1)
+    return x + y, 1 - x + y
+
+
+def test_reuse_for_another_study() -> None:
+    sampler = moead.MOEADSampler(population_size=10, n_neighbors=3, seed=0)
+    study = optuna.create_study(directions=["minimize", "minimize"], sampler=sampler)
+    study.optimize(_objective, n_trials=50)
+
+    # Every study of ``InMemoryStorage`` has the same ID.
+    other_study = optuna.create_study(directions=["minimize", "minimize"], sampler=sampler)
+    other_study.optimize(_objective, n_trials=25)
+    generations = [t.system_attrs["moead:generation"] for t in other_study.trials]
+    assert generations == [0] * 10 + [1] * 10 + [2] * 5
@@ -1,6 +1,7 @@
 # mypy: ignore-errors
 import numpy as np
 from scipy.linalg import cho_solve
+from scipy.linalg import solve_triangular
 
 
 class GP:
@@ -31,6 +32,37 @@ class GP:
         self.K_varI = self.K + noise_var * np.eye(self.n_data)
 
         self.K_varI_L = np.linalg.cholesky(self.K + np.eye(self.n_data) * self.noise_var).T
+        self.alpha = cho_solve((self.K_varI_L, False), self.y)
+
+    def add_data(self, x, y):
+        """Add data and update the Cholesky factor without recomputing it from scratch
+
+        Parameters
+        ----------
+        x : 2d-ndarray
+            Input data X to add
+        y : 1d-ndarray
+            Output data y to add
+        """
+        k_old_new = self.kern.K(self.x, x)
+        k_new = self.kern.K(x, x)
+        k_new_varI = k_new + self.noise_var * np.eye(len(x))
+
+        # [[L, L_12], [0, L_22]] is the upper Cholesky factor of [[K_varI, k_12], [k_12^T, k_22]].
+        L_12 = solve_triangular(self.K_varI_L, k_old_new, trans="T", lower=False)
+        L_22 = np.linalg.cholesky(k_new_varI - np.matmul(L_12.T, L_12)).T
+        self.K_varI_L = np.block([[self.K_varI_L, L_12], [np.zeros_like(L_12.T), L_22]])
+        self.K = np.block([[self.K, k_old_new], [k_old_new.T, k_new]])
+        self.K_varI = self.K + self.noise_var * np.eye(len(self.K))
+
+        self.x = np.concatenate([self.x, x])
+        self.y = np.concatenate([self.y, y])
+        self.n_data = self.x.shape[0]
+        self.alpha = cho_solve((self.K_varI_L, False), self.y)
+
+    def _predict_fvar_diag(self, x, k):
+        v = solve_triangular(self.K_varI_L, k.T, trans="T", lower=False)
+        return self.kern.K(x, x, diag=True) - np.sum(v**2, axis=0)
 
     @staticmethod
     def prior_sampling(xs, rng, kern):
@@ -77,13 +109,11 @@ class GP:
             Predict mean and variance of f
         """
         k = self.kern.K(x, self.x)
-        mean = np.matmul(k, cho_solve((self.K_varI_L, False), self.y))
+        mean = np.matmul(k, self.alpha)
         if full_var:
             var = self.kern.K(x, x) - np.matmul(k, cho_solve((self.K_varI_L, False), k.T))
         else:
-            var = self.kern.K(x, x, diag=True) - np.sum(
-                k * cho_solve((self.K_varI_L, False), k.T).T, axis=1
-            )
+            var = self._predict_fvar_diag(x, k)
         return mean, var
 
     def predict_fvar(self, x, full_var=False):
@@ -105,9 +135,7 @@ class GP:
         if full_var:
             return self.kern.K(x, x) - np.matmul(k, cho_solve((self.K_varI_L, False), k.T))
         else:
-            return self.kern.K(x, x, diag=True) - np.sum(
-                k * cho_solve((self.K_varI_L, False), k.T).T, axis=1
-            )
+            return self._predict_fvar_diag(x, k)
 
     def predict_mean(self, x):
         """Return predict mean
@@ -123,4 +151,4 @@ class GP:
             Predict mean
         """
         k = self.kern.K(x, self.x)
-        return np.matmul(k, cho_solve((self.K_varI_L, False), self.y))
+        return np.matmul(k, self.alpha)
@@ -2,14 +2,30 @@
 # flake8: noqa
 from __future__ import annotations
 
+import os
+import threading
+import types
 from typing import Any
 
 import numpy as np
 import optuna
 import optunahub
+from scipy.stats import qmc
 
-from gp import GP
-from kern import Rbf
+from .gp import GP
+from .kern import Rbf
+
+
+def _load_simple() -> types.ModuleType:
+    # ``samplers/simple`` provides ``TrialCursor``. It is loaded from the registry this package is
+    # loaded from if it is there, e.g., in a clone of the registry.
+    registry_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if os.path.isfile(os.path.join(registry_root, "samplers", "simple", "__init__.py")):
+        return optunahub.load_local_module("samplers/simple", registry_root=registry_root)
+    return optunahub.load_module("samplers/simple")
+
+
+TrialCursor = _load_simple().TrialCursor
 
 
 def get_input_candidate(x_n_grids):
@@ -27,7 +43,48 @@ def get_input_candidate(x_n_grids):
     return xs
 
 
+def get_sobol_candidate(n_dim, n_points, seed):
+    # The first n_points of the Sobol sequence of length 2^m.
+    sampler = qmc.Sobol(d=n_dim, scramble=True, seed=seed)
+    return sampler.random_base2(int(np.ceil(np.log2(n_points))))[:n_points]
+
+
 class MeanVarianceAnalysisScalarizationSimulatorSampler(optunahub.samplers.SimpleBaseSampler):
+    """Sampler based on the UCB of the scalarized mean-variance objective.
+
+    The first ``len(search_space) - wdim`` parameters are the design variables ``x`` and the rest
+    are the environmental variables ``w``, which are assumed to follow the uniform distribution.
+    The candidates of ``x`` and ``w`` are built once, and the posterior of the Gaussian process is
+    evaluated in chunks of ``chunk_size`` points so that the memory usage does not depend on the
+    number of candidates. The Cholesky factor of the Gaussian process is extended with the trials
+    finished since the last call instead of being recomputed from scratch.
+
+    Args:
+        search_space:
+            The search space. All the parameters must be floats in ``[0, 1]``.
+        beta:
+            The coefficient of the posterior standard deviation in the confidence bounds.
+        alpha:
+            The weight of the mean in the scalarized objective. The weight of the standard
+            deviation is ``1 - alpha``.
+        lengthscale:
+            The lengthscale of the RBF kernel.
+        outputscale:
+            The outputscale of the RBF kernel.
+        noise_var:
+            The variance of the observation noise.
+        wdim:
+            The number of environmental variables.
+        n_x_candidates:
+            If given, the candidates of ``x`` are the first ``n_x_candidates`` points of a
+            scrambled Sobol sequence instead of the grid with 100 points per dimension.
+        n_w_candidates:
+            If given, the candidates of ``w`` are the first ``n_w_candidates`` points of a
+            scrambled Sobol sequence instead of the grid with 20 points per dimension.
+        chunk_size:
+            The number of points whose posterior is evaluated at once.
+    """
+
     # By default, search space will be estimated automatically like Optuna's built-in samplers.
     # You can fix the search spacd by `search_space` argument of `SimpleSampler` class.
     def __init__(
@@ -39,6 +96,9 @@ class MeanVarianceAnalysisScalarizationSimulatorSampler(optunahub.samplers.Simpl
         outputscale=1.0,
         noise_var=1e-4,
         wdim=1,
+        n_x_candidates: int | None = None,
+        n_w_candidates: int | None = None,
+        chunk_size: int = 4096,
     ) -> None:
         assert all(
             [
@@ -58,6 +118,30 @@ class MeanVarianceAnalysisScalarizationSimulatorSampler(optunahub.samplers.Simpl
         self._wdim = wdim
         self._xdim = len(search_space) - wdim
         self._alpha = alpha
+        self._chunk_size = chunk_size
+
+        if n_x_candidates is None:
+            self._xs = get_input_candidate(",".join(["100"] * self._xdim))
+        else:
+            self._xs = get_sobol_candidate(self._xdim, n_x_candidates, self._rng.randint(2**31))
+        if n_w_candidates is None:
+            self._ws = get_input_candidate(",".join(["20"] * self._wdim))
+        else:
+            self._ws = get_sobol_candidate(self._wdim, n_w_candidates, self._rng.randint(2**31))
+
+        self._model: GP | None = None
+        # The trials still running at the previous update are added to the GP once they complete.
+        self._cursor = TrialCursor()
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[Any, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[Any, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
 
     # You need to implement sample_relative method.
     # This method returns a dictionary of hyperparameters.
@@ -74,50 +158,70 @@ class MeanVarianceAnalysisScalarizationSimulatorSampler(optunahub.samplers.Simpl
         if search_space == {}:
             return {}
 
-        states = (optuna.trial.TrialState.COMPLETE,)
-        trials = study._get_trials(deepcopy=False, states=states, use_cache=True)
-
-        if len(trials) < 1:
-            return {}
+        with self._lock:
+            self._update_model(study, search_space)
+            if self._model is None:
+                return {}
+            xt, wt = self._maximize_ucb()
 
-        X = np.zeros((len(trials), len(search_space)))  # train_size x n_dim
-        for i, trial in enumerate(trials):
-            X[i, :] = np.asarray(list(trial.params.values()))
+        params = {}  # type: dict[str, Any]
+        for i, n in enumerate(search_space.keys()):
+            params[n] = xt[i] if i < self._xdim else wt[i - self._xdim]
+        return params
 
-        _sign = -1.0 if study.direction == optuna.study.StudyDirection.MINIMIZE else 1.0
-        Y = np.zeros((len(trials), 1))
-        for i, trial in enumerate(trials):
-            Y[i, 0] = _sign * trial.value
+    def _update_model(self, study, search_space):
+        finished_trials, restarted = self._cursor.update(study)
+        if restarted:
+            self._model = None
 
-        model = GP(X, Y[:, 0], kern=self._kern, noise_var=self._noise_var)
+        new_trials = [t for t in finished_trials if t.state == optuna.trial.TrialState.COMPLETE]
+        if len(new_trials) == 0:
+            return
 
-        xs = get_input_candidate(",".join(["100"] * self._xdim))
-        ws = get_input_candidate(",".join(["20"] * self._wdim))
-        xws = get_input_candidate(
-            ",".join(["100"] * self._xdim) + "," + ",".join(["20"] * self._wdim)
-        )
-        pws = np.ones(len(ws)) / len(ws)
+        X = np.asarray([[t.params[n] for n in search_space] for t in new_trials])
+        _sign = -1.0 if study.direction == optuna.study.StudyDirection.MINIMIZE else 1.0
+        Y = np.asarray([_sign * t.value for t in new_trials])
+        if self._model is None:
+            self._model = GP(X, Y, kern=self._kern, noise_var=self._noise_var)
+        else:
+            self._model.add_data(X, Y)
+
+    def _maximize_ucb(self):
+        xs = self._xs
+        ws = self._ws
         nx = len(xs)
         nw = len(ws)
+        pws = np.ones(nw) / nw
+        # Each chunk contains all the candidates of w for the candidates of x in the chunk.
+        chunk_nx = max(1, self._chunk_size // nw)
+
+        best_fmv_ucb = -np.inf
+        next_xidx = 0
+        next_pos_var = np.zeros(nw)
+        for start in range(0, nx, chunk_nx):
+            xs_chunk = xs[start : start + chunk_nx]
+            cnx = len(xs_chunk)
+            xws = np.concatenate([np.repeat(xs_chunk, nw, axis=0), np.tile(ws, (cnx, 1))], axis=1)
+
+            pos_mu, pos_var = self._model.predict_f(xws)
+            pos_var = np.maximum(pos_var, 0.0)
+            fucb = (pos_mu + self._beta * np.sqrt(pos_var)).reshape([cnx, nw])
+            flcb = (pos_mu - self._beta * np.sqrt(pos_var)).reshape([cnx, nw])
+            fmean_ucb = np.sum(fucb * pws, axis=1)
+            fmean_lcb = np.sum(flcb * pws, axis=1)
+            fdev_ucb = fucb - fmean_lcb[:, np.newaxis]
+            fdev_lcb = flcb - fmean_ucb[:, np.newaxis]
+            fsqdev_lcb = ((fdev_ucb * fdev_lcb) > 0) * np.minimum(fdev_ucb**2, fdev_lcb**2)
+            fvar_lcb = np.sum(fsqdev_lcb * pws, axis=1)
+            fmv_ucb = self._alpha * fmean_ucb - (1 - self._alpha) * np.sqrt(fvar_lcb)
+
+            idx = fmv_ucb.argmax()
+            if fmv_ucb[idx] > best_fmv_ucb:
+                best_fmv_ucb = fmv_ucb[idx]
+                next_xidx = start + idx
+                next_pos_var = pos_var.reshape([cnx, nw])[idx]
 
-        pos_mu, pos_var = model.predict_f(xws)
-        fucb = (pos_mu + self._beta * np.sqrt(pos_var)).reshape([nx, nw])
-        flcb = (pos_mu - self._beta * np.sqrt(pos_var)).reshape([nx, nw])
-        fmean_ucb = np.sum(fucb * pws, axis=1)
-        fmean_lcb = np.sum(flcb * pws, axis=1)
-        fdev_ucb = fucb - fmean_lcb[:, np.newaxis]
-        fdev_lcb = flcb - fmean_ucb[:, np.newaxis]
-        fsqdev_lcb = ((fdev_ucb * fdev_lcb) > 0) * np.minimum(fdev_ucb**2, fdev_lcb**2)
-        fsqdev_ucb = np.maximum(fdev_ucb**2, fdev_lcb**2)
-        fvar_lcb = np.sum(fsqdev_lcb * pws, axis=1)
-        fvar_ucb = np.sum(fsqdev_ucb * pws, axis=1)
-        fmv_ucb = self._alpha * fmean_ucb - (1 - self._alpha) * np.sqrt(fvar_lcb)
-        next_xidx = fmv_ucb.argmax()
         xt = xs[next_xidx].flatten()
-        next_widx = pos_var.reshape([nx, nw])[next_xidx, :].argmax()
+        next_widx = next_pos_var.argmax()
         wt = ws[next_widx].flatten()
-
-        params = {}  # type: dict[str, Any]
-        for i, n in enumerate(search_space.keys()):
-            params[n] = xt[i] if i < self._xdim else wt[i - self._xdim]
-        return params
+        return xt, wt
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import numpy as np
+import optuna
+import optunahub
+import pytest
+
+
+mvas = optunahub.load_local_module(package="samplers/mvas", registry_root="package/")
+
+_SEARCH_SPACE = {
+    "x0": optuna.distributions.FloatDistribution(0, 1),
+    "x1": optuna.distributions.FloatDistribution(0, 1),
+    "w": optuna.distributions.FloatDistribution(0, 1),
+}
+
+
+def _objective(trial: optuna.Trial) -> float:
+    x0 = trial.suggest_float("x0", 0, 1)
+    x1 = trial.suggest_float("x1", 0, 1)
+    w = trial.suggest_float("w", 0, 1)
+    return np.sin(6 * x0) * w + (x1 - 0.3) ** 2 + 0.1 * w
+
+
+def test_add_data_matches_rebuilt_gp() -> None:
+    rng = np.random.RandomState(0)
+    x = rng.rand(30, 3)
+    y = rng.randn(30)
+    kern = mvas.kern.Rbf(3, lengthscale=0.25)
+    expected_model = mvas.gp.GP(x, y, kern=kern, noise_var=1e-4)
+
+    # The data are added in batches of various sizes.
+    model = mvas.gp.GP(x[:5], y[:5], kern=kern, noise_var=1e-4)
+    for start, end in [(5, 6), (6, 15), (15, 16), (16, 30)]:
+        model.add_data(x[start:end], y[start:end])
+
+    np.testing.assert_array_equal(model.x, expected_model.x)
+    np.testing.assert_array_equal(model.y, expected_model.y)
+    assert model.n_data == expected_model.n_data
+    np.testing.assert_allclose(model.K, expected_model.K)
+    np.testing.assert_allclose(model.K_varI, expected_model.K_varI)
+    np.testing.assert_allclose(model.K_varI_L, expected_model.K_varI_L, atol=1e-8)
+    np.testing.assert_allclose(model.alpha, expected_model.alpha, rtol=1e-6, atol=1e-8)
+
+    xs = rng.rand(50, 3)
+    for full_var in [False, True]:
+        mean, var = model.predict_f(xs, full_var=full_var)
+        expected_mean, expected_var = expected_model.predict_f(xs, full_var=full_var)
+        np.testing.assert_allclose(mean, expected_mean, rtol=1e-6, atol=1e-8)
+        np.testing.assert_allclose(var, expected_var, rtol=1e-6, atol=1e-8)
+
+
+def _fit_sampler(**kwargs: int) -> optuna.samplers.BaseSampler:
+    sampler = mvas.MeanVarianceAnalysisScalarizationSimulatorSampler(
+        _SEARCH_SPACE, n_w_candidates=16, **kwargs
+    )
+    study = optuna.create_study(sampler=optuna.samplers.RandomSampler(seed=0))
+    study.optimize(_objective, n_trials=20)
+    sampler._update_model(study, _SEARCH_SPACE)
+    return sampler
+
+
+@pytest.mark.parametrize("chunk_size", [1, 16, 100, 1000])
+def test_chunked_maximize_ucb_matches_unchunked(chunk_size: int) -> None:
+    sampler = _fit_sampler()
+    sampler._chunk_size = len(sampler._xs) * len(sampler._ws)
+    expected_xt, expected_wt = sampler._maximize_ucb()
+
+    sampler._chunk_size = chunk_size
+    xt, wt = sampler._maximize_ucb()
+    np.testing.assert_array_equal(xt, expected_xt)
+    np.testing.assert_array_equal(wt, expected_wt)
+
+
+def test_sobol_x_candidates() -> None:
+    sampler = _fit_sampler(n_x_candidates=256)
+    assert sampler._xs.shape == (256, 2)
+    assert sampler._ws.shape == (16, 1)
+    assert np.all((0 <= sampler._xs) & (sampler._xs < 1))
+    assert len(np.unique(sampler._xs, axis=0)) == 256
+
+    xt, wt = sampler._maximize_ucb()
+    assert any(np.array_equal(xt, x) for x in sampler._xs)
+    assert any(np.array_equal(wt, w) for w in sampler._ws)
+
+    study = optuna.create_study(sampler=sampler)
+    study.optimize(_objective, n_trials=10)
+    for trial in study.trials[1:]:
+        x = np.array([trial.params["x0"], trial.params["x1"]])
+        assert any(np.array_equal(x, candidate) for candidate in sampler._xs)
+
+
+def test_reuse_for_another_study() -> None:
+    sampler = mvas.MeanVarianceAnalysisScalarizationSimulatorSampler(
+        _SEARCH_SPACE, n_x_candidates=64, n_w_candidates=16
+    )
+    study = optuna.create_study(sampler=sampler)
+    study.optimize(_objective, n_trials=10)
+
+    # Every study of ``InMemoryStorage`` has the same study ID.
+    another_study = optuna.create_study(sampler=sampler)
+    another_study.optimize(_objective, n_trials=5)
+    assert sampler._model.n_data == 4
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
+import threading
 from typing import Any
 
 import numpy as np
@@ -17,7 +19,9 @@ class NelderMeadSampler(optunahub.samplers.SimpleBaseSampler):
 
        Several important matters:
 
-       1. NelderMeadSampler does not support parallel execution, i.e., `n_jobs > 1`.
+       1. NelderMeadSampler is essentially sequential. With parallel execution, i.e., `n_jobs > 1`, trials sampled while
+       the previous vertex is still being evaluated are delegated to independent_sampler and ignored by the algorithm.
+       Only the shrinkage step can be evaluated in parallel by setting ``batch_shrinkage=True``.
 
        2. If it is run "define-by-run" (no search space defined), the first trial is ignored because this trial is not involved in the Nelder-Mead algorithm.
 
@@ -39,6 +43,10 @@ class NelderMeadSampler(optunahub.samplers.SimpleBaseSampler):
         seed:
             A seed number.
 
+        batch_shrinkage:
+            If :obj:`True`, all the ``d`` vertices of the shrinkage step are suggested at once to the
+            next ``d`` trials so that they can be evaluated in parallel.
+
     """
 
     def __init__(
@@ -47,6 +55,7 @@ class NelderMeadSampler(optunahub.samplers.SimpleBaseSampler):
         centroid: float = 0.5,
         edge: float = 0.5,
         seed: int | None = None,
+        batch_shrinkage: bool = False,
     ) -> None:
         super().__init__(search_space)
 
@@ -58,10 +67,8 @@ class NelderMeadSampler(optunahub.samplers.SimpleBaseSampler):
 
         if search_space is None:
             self._NM_state = "estimate_search_space"
-            self._ignore_trial_number = 1
         else:
             self._NM_state = "generate_initial_simplex"
-            self._ignore_trial_number = 0
 
         self._edge = edge
         self._centroid = centroid
@@ -71,6 +78,16 @@ class NelderMeadSampler(optunahub.samplers.SimpleBaseSampler):
         self._coef = {"r": 1.0, "ic": -0.5, "oc": 0.5, "e": 2.0, "s": 0.5}
         self._f: list[float] = []
         self._shrink_num = 0
+        self._batch_shrinkage = batch_shrinkage
+
+        # The objective values are received in ``after_trial`` instead of reading the history.
+        self._results: dict[int, float] = {}
+        # The trial number evaluating the latest vertex suggested by the state machine.
+        self._pending_trial_number: int | None = None
+        # Trial number -> vertex index for the shrinkage vertices being evaluated in batch.
+        self._shrink_trials: dict[int, int] = {}
+        self._shrink_queue: list[int] = []
+        self._lock = threading.Lock()
 
         self._independent_sampler = optuna.samplers.RandomSampler(seed=self._seed)
 
@@ -129,11 +146,8 @@ class NelderMeadSampler(optunahub.samplers.SimpleBaseSampler):
     ) -> tuple[dict, bool]:
         # Initialization
         if self._NM_state == "Initialization":
-            if trial.number > self._ignore_trial_number:
-                self._f.append(study.trials_dataframe()["value"].values[-2])
-
-            if f_val == float("inf"):
-                self._f.append(float("inf"))
+            if f_val is not None:
+                self._f.append(f_val)
 
             if len(self._y) != len(self._f):
                 params, out_of_boundary, normalized_param = self.suggest_eval_param(
@@ -142,11 +156,8 @@ class NelderMeadSampler(optunahub.samplers.SimpleBaseSampler):
             else:
                 self._NM_state = "Reflection_org"
         # Reflection, Expansion, Outside contraction, Inside Contraction, Shrinkage.
-        else:
-            if f_val is None:
-                objective_value = study.trials_dataframe()["value"].values[-2]
-            else:
-                objective_value = f_val
+        elif f_val is not None:
+            objective_value = f_val
 
             if self._NM_state == "Reflection":
                 self._fr = objective_value
@@ -224,6 +235,12 @@ class NelderMeadSampler(optunahub.samplers.SimpleBaseSampler):
                 search_space, self._yic
             )
 
+        elif self._NM_state == "Shrinkage" and self._batch_shrinkage:
+            self._ys_batch: np.ndarray = self._y[0] + self._coef["s"] * (self._y[1:] - self._y[0])
+            self._shrink_queue = list(range(1, self._dim + 1))
+            self._NM_state = "Shrinkage_batch"
+            return self.search_shrinkage_batch(trial, search_space, study)
+
         elif self._NM_state == "Shrinkage":
             self._ys: np.ndarray = self._y[0] + self._coef["s"] * (
                 self._y[self._shrink_num + 1] - self._y[0]
@@ -241,6 +258,59 @@ class NelderMeadSampler(optunahub.samplers.SimpleBaseSampler):
 
         return params, out_of_boundary
 
+    def search_shrinkage_batch(
+        self,
+        trial: optuna.trial.FrozenTrial,
+        search_space: dict[str, optuna.distributions.BaseDistribution],
+        study: optuna.study.Study,
+    ) -> tuple[dict, bool]:
+        """
+        Suggest the next queued vertex of the shrinkage step. The results of the shrinkage vertices
+        are reflected in the simplex as they arrive, and the search proceeds to the reflection
+        once all of them are evaluated.
+        """
+        for number, index in list(self._shrink_trials.items()):
+            f_val = self._pop_result(study, number)
+            if f_val is not None:
+                self._y[index] = self._ys_batch[index - 1]
+                self._f[index] = f_val
+                del self._shrink_trials[number]
+
+        if len(self._shrink_queue) > 0:
+            index = self._shrink_queue.pop(0)
+            params, out_of_boundary, normalized_param = self.suggest_eval_param(
+                search_space, self._ys_batch[index - 1]
+            )
+            if out_of_boundary:
+                self._y[index] = self._ys_batch[index - 1]
+                self._f[index] = float("inf")
+                return self.search_shrinkage_batch(trial, search_space, study)
+            self._shrink_trials[trial.number] = index
+            self._current_y = self._y.copy()
+            self._current_y[index] = normalized_param
+            return params, out_of_boundary
+
+        if len(self._shrink_trials) > 0:
+            # The other shrinkage vertices are still being evaluated.
+            return {}, False
+
+        self._NM_state = "Reflection_org"
+        return self.search(trial, search_space, study)
+
+    def _pop_result(self, study: optuna.study.Study, number: int) -> float | None:
+        """
+        Return the objective value of the given trial, or :obj:`None` if it is not finished yet.
+        """
+        if number in self._results:
+            return self._results.pop(number)
+
+        # The trial might have been told by another process, so look it up directly in O(1).
+        trial_id = study._storage.get_trial_id_from_study_id_trial_number(study._study_id, number)
+        finished_trial = study._storage.get_trial(trial_id)
+        if not finished_trial.state.is_finished():
+            return None
+        return finished_trial.value if finished_trial.value is not None else float("nan")
+
     def sample_relative(
         self,
         study: optuna.study.Study,
@@ -249,6 +319,15 @@ class NelderMeadSampler(optunahub.samplers.SimpleBaseSampler):
     ) -> dict[str, Any]:
         self._raise_error_if_multi_objective(study)
 
+        with self._lock:
+            return self._sample_relative(study, trial, search_space)
+
+    def _sample_relative(
+        self,
+        study: optuna.study.Study,
+        trial: optuna.trial.FrozenTrial,
+        search_space: dict[str, optuna.distributions.BaseDistribution],
+    ) -> dict[str, Any]:
         if search_space == {}:
             self._NM_state = "generate_initial_simplex"
             return {}
@@ -263,19 +342,43 @@ class NelderMeadSampler(optunahub.samplers.SimpleBaseSampler):
             )
             self._NM_state = "Initialization"
 
-        params, out_of_boundary = self.search(trial, search_space, study)
-
-        if out_of_boundary:
-            while True:
-                params, out_of_boundary = self.search(
-                    trial, search_space, study, f_val=float("inf")
-                )
-                if not out_of_boundary:
-                    break
+        if self._NM_state == "Shrinkage_batch":
+            params, out_of_boundary = self.search_shrinkage_batch(trial, search_space, study)
+        else:
+            f_val: float | None = None
+            if self._pending_trial_number is not None:
+                f_val = self._pop_result(study, self._pending_trial_number)
+                if f_val is None:
+                    # The previous vertex is still being evaluated, so the state machine cannot
+                    # proceed. Fall back to independent_sampler.
+                    return {}
+                self._pending_trial_number = None
+            params, out_of_boundary = self.search(trial, search_space, study, f_val=f_val)
+
+        while out_of_boundary:
+            params, out_of_boundary = self.search(trial, search_space, study, f_val=float("inf"))
+
+        if self._NM_state == "Shrinkage_batch":
+            if trial.number not in self._shrink_trials:
+                # Fall back to independent_sampler while waiting for the shrinkage vertices.
+                return {}
+        else:
+            self._pending_trial_number = trial.number
         trial.set_user_attr("simplex", self._current_y)
 
         return params
 
+    def after_trial(
+        self,
+        study: optuna.study.Study,
+        trial: optuna.trial.FrozenTrial,
+        state: optuna.trial.TrialState,
+        values: Sequence[float] | None,
+    ) -> None:
+        with self._lock:
+            if trial.number == self._pending_trial_number or trial.number in self._shrink_trials:
+                self._results[trial.number] = values[0] if values is not None else float("nan")
+
     def sample_independent(
         self,
         study: optuna.study.Study,
@@ -289,3 +392,12 @@ class NelderMeadSampler(optunahub.samplers.SimpleBaseSampler):
 
     def reseed_rng(self) -> None:
         self._independent_sampler.reseed_rng()
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import optuna
+import optunahub
+
+
+nelder_mead = optunahub.load_local_module(package="samplers/nelder_mead", registry_root="package/")
+
+_SEARCH_SPACE = {
+    "x": optuna.distributions.FloatDistribution(-5, 5),
+    "y": optuna.distributions.FloatDistribution(-5, 5),
+    "z": optuna.distributions.FloatDistribution(-5, 5),
+}
+
+
+def _objective(trial: optuna.Trial) -> float:
+    # The plateaus of the rounded sphere function make the contractions fail.
+    return float(np.round(sum(trial.suggest_float(name, -5, 5) ** 2 for name in _SEARCH_SPACE)))
+
+
+# The class is typed as ``Any`` since ``mypy`` cannot resolve the classes of a loaded module.
+_NelderMeadSampler: Any = nelder_mead.NelderMeadSampler
+
+
+class _TrialsDataframeNelderMeadSampler(_NelderMeadSampler):
+    # The objective value of the previous trial is read from the history as before.
+    def _pop_result(self, study: optuna.Study, number: int) -> float | None:
+        assert number == len(study.trials) - 2
+        return study.trials_dataframe()["value"].values[-2]
+
+
+def _optimize(
+    sampler: optuna.samplers.BaseSampler, n_trials: int
+) -> tuple[list[dict[str, Any]], list[str]]:
+    study = optuna.create_study(sampler=sampler)
+    states = []
+    for _ in range(n_trials):
+        trial = study.ask()
+        study.tell(trial, _objective(trial))
+        states.append(sampler._NM_state)
+    return [t.params for t in study.trials], states
+
+
+def test_sequential_search_matches_trials_dataframe() -> None:
+    params, states = _optimize(nelder_mead.NelderMeadSampler(_SEARCH_SPACE, seed=0), 100)
+    expected_params, expected_states = _optimize(
+        _TrialsDataframeNelderMeadSampler(_SEARCH_SPACE, seed=0), 100
+    )
+    assert params == expected_params
+    assert states == expected_states
+    assert "Shrinkage" in states
+
+
+def test_sequential_batch_shrinkage_matches_shrinkage() -> None:
+    params, states = _optimize(nelder_mead.NelderMeadSampler(_SEARCH_SPACE, seed=0), 100)
+    batch_params, batch_states = _optimize(
+        nelder_mead.NelderMeadSampler(_SEARCH_SPACE, seed=0, batch_shrinkage=True), 100
+    )
+    assert batch_params == params
+    assert "Shrinkage_batch" in batch_states
+
+
+def test_batch_shrinkage_suggests_all_vertices_at_once() -> None:
+    sampler = nelder_mead.NelderMeadSampler(_SEARCH_SPACE, seed=0, batch_shrinkage=True)
+    study = optuna.create_study(sampler=sampler)
+    while True:
+        trial = study.ask()
+        # The relative params are sampled at the first suggestion.
+        value = _objective(trial)
+        if sampler._NM_state == "Shrinkage_batch":
+            break
+        study.tell(trial, value)
+
+    # The first shrinkage vertex is suggested to ``trial`` and the others to the next trials
+    # before any of them is told.
+    trials = [trial] + [study.ask() for _ in range(len(_SEARCH_SPACE) - 1)]
+    simplex = sampler._y.copy()
+    for i, t in enumerate(trials):
+        _objective(t)
+        expected = simplex[0] + 0.5 * (simplex[i + 1] - simplex[0])
+        params = np.asarray([t.params[name] for name in _SEARCH_SPACE])
+        np.testing.assert_allclose((params + 5) / 10, expected)
+        assert "simplex" in t.user_attrs
+
+    # The following trial is delegated to the independent sampler while waiting.
+    waiting_trial = study.ask()
+    _objective(waiting_trial)
+    assert "simplex" not in waiting_trial.user_attrs
+    assert sampler._NM_state == "Shrinkage_batch"
+
+    # The results are told in the reverse order and the search proceeds to the reflection.
+    for t in reversed(trials):
+        study.tell(t, _objective(t))
+    study.tell(waiting_trial, _objective(waiting_trial))
+    trial = study.ask()
+    _objective(trial)
+    assert "simplex" in trial.user_attrs
+    assert sampler._NM_state == "Reflection"
@@ -5,14 +5,18 @@ from collections.abc import Sequence
 from typing import Any
 from typing import TYPE_CHECKING
 
+import numpy as np
+from optuna._transform import _SearchSpaceTransform
 from optuna.distributions import BaseDistribution
 from optuna.samplers._lazy_random_state import LazyRandomState
 from optuna.samplers.nsgaii._constraints_evaluation import _constrained_dominates
-from optuna.samplers.nsgaii._crossover import perform_crossover
 from optuna.samplers.nsgaii._crossovers._base import BaseCrossover
-from optuna.study._multi_objective import _dominates
+from optuna.study import StudyDirection
 from optuna.trial import FrozenTrial
 
+from ._mutation import _is_contained
+from ._mutation import _NUMERICAL_DISTRIBUTIONS
+from ._mutation import _untransform_numerical_params
 from ._mutation import perform_mutation
 from ._mutations._base import BaseMutation
 
@@ -79,41 +83,171 @@ class NSGAIIwITChildGenerationStrategy:
         Returns:
             A dictionary containing the parameter names and parameter's values.
         """
-        dominates = _dominates if self._constraints_func is None else _constrained_dominates
-        # We choose a child based on the specified crossover method.
-        if self._rng.rng.rand() < self._crossover_prob:
-            child_params = perform_crossover(
-                self._crossover,
-                study,
-                parent_population,
-                search_space,
-                self._rng.rng,
-                self._swapping_prob,
-                dominates,
+        return self.generate(study, search_space, parent_population, 1)[0]
+
+    def generate(
+        self,
+        study: Study,
+        search_space: dict[str, BaseDistribution],
+        parent_population: list[FrozenTrial],
+        n_children: int,
+    ) -> list[dict[str, Any]]:
+        """Generate child parameters from the given parent population at once.
+
+        The parents are transformed once, and the parent selection, the crossover of categorical
+        parameters, the mutation and the untransformation are vectorized across the children.
+        The parameters that are not in a returned dictionary are sampled by ``sample_independent``.
+
+        Args:
+            study:
+                Target study object.
+            search_space:
+                A dictionary containing the parameter names and parameter's distributions.
+            parent_population:
+                A list of trials that are selected as parent population.
+            n_children:
+                The number of children to generate.
+        Returns:
+            A list of dictionaries containing the parameter names and parameter's values.
+        """
+        rng = self._rng.rng
+        population_size = len(parent_population)
+        numerical_search_space = {
+            name: distribution
+            for name, distribution in search_space.items()
+            if isinstance(distribution, _NUMERICAL_DISTRIBUTIONS)
+        }
+        categorical_names = [name for name in search_space if name not in numerical_search_space]
+
+        if len(numerical_search_space) > 0:
+            transform = _SearchSpaceTransform(numerical_search_space)
+            parents_numerical = np.stack(
+                [
+                    transform.transform({name: t.params[name] for name in numerical_search_space})
+                    for t in parent_population
+                ]
             )
+            bounds = transform.bounds
         else:
-            parent_population_size = len(parent_population)
-            parent_params = parent_population[self._rng.rng.choice(parent_population_size)].params
-            child_params = {name: parent_params[name] for name in search_space.keys()}
+            parents_numerical = np.empty((population_size, 0))
+            bounds = np.empty((0, 2))
+        parents_categorical: np.ndarray = np.empty(
+            (population_size, len(categorical_names)), dtype=object
+        )
+        for i, t in enumerate(parent_population):
+            parents_categorical[i] = [t.params[name] for name in categorical_names]
+
+        # We choose a child based on the specified crossover method.
+        crossed = rng.rand(n_children) < self._crossover_prob
+        copied_ids = rng.choice(population_size, size=n_children)
+        trans_children = parents_numerical[copied_ids]
+        categorical_children = parents_categorical[copied_ids]
+
+        rows = np.flatnonzero(crossed)
+        while len(rows) > 0:  # Repeat while parameters lie outside search space boundaries.
+            parent_ids = self._select_parents(study, parent_population, len(rows))
+            masks = rng.rand(len(rows), len(categorical_names)) >= self._swapping_prob
+            categorical_children[rows] = np.where(
+                masks,
+                parents_categorical[parent_ids[:, -1]],
+                parents_categorical[parent_ids[:, 0]],
+            )
+            if len(numerical_search_space) > 0:
+                trans_children[rows] = np.stack(
+                    [
+                        self._crossover.crossover(parents_numerical[ids], rng, study, bounds)
+                        for ids in parent_ids
+                    ]
+                )
 
-        n_params = len(child_params)
+            contained: np.ndarray = np.ones(len(rows), dtype=bool)
+            for j, distribution in enumerate(numerical_search_space.values()):
+                contained &= _is_contained(
+                    _untransform_numerical_params(trans_children[rows, j], distribution),
+                    distribution,
+                )
+            rows = rows[~contained]
+
+        n_params = len(search_space)
         if self._mutation_prob is None:
             mutation_prob = 1.0 / max(1.0, n_params)
         else:
             mutation_prob = self._mutation_prob
 
-        params = {}
-        for param_name in child_params.keys():
-            if self._rng.rng.rand() >= mutation_prob:
-                params[param_name] = child_params[param_name]
+        mutated = dict(zip(search_space, rng.rand(n_params, n_children) < mutation_prob))
+        if len(numerical_search_space) > 0:
+            rows, columns = np.nonzero(
+                np.column_stack([mutated[name] for name in numerical_search_space])
+            )
+            trans_children[rows, columns] = perform_mutation(
+                self._mutation, rng, trans_children[rows, columns], bounds[columns]
+            )
+
+        child_values: dict[str, list[Any]] = {
+            name: _untransform_numerical_params(trans_children[:, j], distribution).tolist()
+            for j, (name, distribution) in enumerate(numerical_search_space.items())
+        }
+        for j, name in enumerate(categorical_names):
+            child_values[name] = categorical_children[:, j].tolist()
+
+        children = []
+        for i in range(n_children):
+            parent_params = None if crossed[i] else parent_population[copied_ids[i]].params
+            params = {}
+            for param_name in search_space:
+                if mutated[param_name][i]:
+                    # For categorical variables, the parameter is subject to sample_independent.
+                    if param_name in numerical_search_space:
+                        params[param_name] = child_values[param_name][i]
+                elif parent_params is not None:
+                    params[param_name] = parent_params[param_name]
+                else:
+                    params[param_name] = child_values[param_name][i]
+            children.append(params)
+
+        return children
+
+    def _select_parents(
+        self, study: Study, parent_population: list[FrozenTrial], n_children: int
+    ) -> np.ndarray:
+        # Each parent is selected by a binary tournament between two different trials that are
+        # not selected as the other parents of the same child.
+        rng = self._rng.rng
+        population_size = len(parent_population)
+        parent_ids = np.empty((n_children, self._crossover.n_parents), dtype=int)
+        for i in range(self._crossover.n_parents):
+            n_candidates = population_size - i
+            candidates = np.empty((n_children, 2), dtype=int)
+            candidates[:, 0] = rng.choice(n_candidates, size=n_children)
+            if n_candidates > 1:
+                candidates[:, 1] = rng.choice(n_candidates - 1, size=n_children)
+                candidates[:, 1] += candidates[:, 1] >= candidates[:, 0]
             else:
-                mutation_value = perform_mutation(
-                    self._mutation,
-                    self._rng.rng,
-                    search_space[param_name],
-                    child_params[param_name],
-                )
-                if mutation_value is not None:
-                    params[param_name] = mutation_value
+                candidates[:, 1] = candidates[:, 0]
+            for selected in np.sort(parent_ids[:, :i], axis=1).T:
+                candidates += candidates >= selected[:, np.newaxis]
+
+            dominates = self._dominates(study, parent_population, candidates)
+            parent_ids[:, i] = np.where(dominates, candidates[:, 0], candidates[:, 1])
+
+        return parent_ids
+
+    def _dominates(
+        self, study: Study, parent_population: list[FrozenTrial], candidates: np.ndarray
+    ) -> np.ndarray:
+        if self._constraints_func is not None:
+            return np.array(
+                [
+                    _constrained_dominates(
+                        parent_population[i], parent_population[j], study.directions
+                    )
+                    for i, j in candidates
+                ],
+                dtype=bool,
+            )
 
-        return params
+        signs = np.array([-1.0 if d == StudyDirection.MAXIMIZE else 1.0 for d in study.directions])
+        values = np.array([t.values for t in parent_population]) * signs
+        values0 = values[candidates[:, 0]]
+        values1 = values[candidates[:, 1]]
+        return np.all(values0 <= values1, axis=1) & np.any(values0 != values1, axis=1)
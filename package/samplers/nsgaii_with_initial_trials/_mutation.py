@@ -1,8 +1,5 @@
 from __future__ import annotations
 
-import math
-from typing import Any
-
 import numpy as np
 from optuna.distributions import BaseDistribution
 from optuna.distributions import FloatDistribution
@@ -20,63 +17,65 @@ _NUMERICAL_DISTRIBUTIONS = (
 def perform_mutation(
     mutation: BaseMutation,
     rng: np.random.RandomState,
-    search_space: BaseDistribution,
-    value: float,
-) -> Any:
-    if isinstance(search_space, _NUMERICAL_DISTRIBUTIONS):
-        lb = search_space.low
-        ub = search_space.high
+    trans_values: np.ndarray,
+    search_space_bounds: np.ndarray,
+) -> np.ndarray:
+    """Mutate the values of numerical parameters at once in the transformed space.
 
-        mutation_value = mutation.mutation(value, rng, np.array([lb, ub]))
-        return _untransform_numerical_param(
-            mutation_value,
-            search_space,
-        )
-    else:
-        # For categorical variables, return None and subject to sample_independent.
-        return None
+    Args:
+        mutation:
+            The mutation to apply.
+        rng:
+            An instance of ``numpy.random.RandomState``.
+        trans_values:
+            A 1-dimensional ``numpy.ndarray`` of the transformed values to mutate.
+        search_space_bounds:
+            A ``numpy.ndarray`` with dimensions ``len(trans_values) x 2`` representing the bounds
+            of each value in the transformed space.
 
+    Returns:
+        A 1-dimensional ``numpy.ndarray`` of the mutated values in the transformed space.
+    """
+    if len(trans_values) == 0:
+        return trans_values
+    return mutation.batch_mutation(trans_values, rng, search_space_bounds)
 
-def _untransform_numerical_param(
-    trans_param: float, distribution: BaseDistribution, transform_log: bool = True
-) -> int | float:
+
+def _untransform_numerical_params(
+    trans_params: np.ndarray, distribution: BaseDistribution
+) -> np.ndarray:
+    # The vectorized version of ``optuna._transform._untransform_numerical_param``.
     d = distribution
 
     if isinstance(d, FloatDistribution):
         if d.log:
-            param = math.exp(trans_param) if transform_log else trans_param
-            if d.single():
-                pass
-            else:
-                param = min(param, np.nextafter(d.high, d.high - 1))
+            params = np.exp(trans_params)
+            if not d.single():
+                params = np.minimum(params, np.nextafter(d.high, d.high - 1))
         elif d.step is not None:
-            param = float(
-                np.clip(
-                    np.round((trans_param - d.low) / d.step) * d.step + d.low,
-                    d.low,
-                    d.high,
-                )
+            params = np.clip(
+                np.round((trans_params - d.low) / d.step) * d.step + d.low, d.low, d.high
             )
         else:
             if d.single():
-                param = trans_param
+                params = trans_params
             else:
-                param = min(trans_param, np.nextafter(d.high, d.high - 1))
+                params = np.minimum(trans_params, np.nextafter(d.high, d.high - 1))
+        return params.astype(float)
     elif isinstance(d, IntDistribution):
         if d.log:
-            if transform_log:
-                param = int(np.clip(np.round(math.exp(trans_param)), d.low, d.high))
-            else:
-                param = int(trans_param)
+            params = np.clip(np.round(np.exp(trans_params)), d.low, d.high)
         else:
-            param = int(
-                np.clip(
-                    np.round((trans_param - d.low) / d.step) * d.step + d.low,
-                    d.low,
-                    d.high,
-                )
+            params = np.clip(
+                np.round((trans_params - d.low) / d.step) * d.step + d.low, d.low, d.high
             )
+        return params.astype(int)
     else:
         assert False, "Should not reach. Unexpected distribution."
 
-    return param
+
+def _is_contained(params: np.ndarray, distribution: BaseDistribution) -> np.ndarray:
+    # The untransformed values are on the grid of the distribution, so that only the bounds need
+    # to be checked.
+    assert isinstance(distribution, _NUMERICAL_DISTRIBUTIONS)
+    return (distribution.low <= params) & (params <= distribution.high)
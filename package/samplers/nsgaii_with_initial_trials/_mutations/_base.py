@@ -32,3 +32,35 @@ class BaseMutation(abc.ABC):
         """
 
         raise NotImplementedError
+
+    def batch_mutation(
+        self,
+        values: np.ndarray,
+        rng: np.random.RandomState,
+        search_space_bounds: np.ndarray,
+    ) -> np.ndarray:
+        """Mutate the given values at once.
+
+        The default implementation calls :meth:`mutation` for each value. Subclasses can override
+        this method with a vectorized implementation.
+
+        Args:
+            values:
+                A 1-dimensional ``numpy.ndarray`` of the values to mutate.
+            rng:
+                An instance of ``numpy.random.RandomState``.
+            search_space_bounds:
+                A ``numpy.ndarray`` with dimensions ``len(values) x 2`` representing the bounds of
+                each value.
+
+        Returns:
+            A 1-dimensional ``numpy.ndarray`` of the mutated values.
+        """
+
+        return np.array(
+            [
+                self.mutation(value, rng, bounds)
+                for value, bounds in zip(values, search_space_bounds)
+            ],
+            dtype=float,
+        )
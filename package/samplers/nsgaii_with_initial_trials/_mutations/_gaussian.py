@@ -16,3 +16,9 @@ class GaussianMutation(BaseMutation):
         child_param = rng.normal(value, sigma)
 
         return child_param
+
+    def batch_mutation(
+        self, values: ndarray, rng: RandomState, search_space_bounds: ndarray
+    ) -> ndarray:
+        delta = search_space_bounds[:, 1] - search_space_bounds[:, 0]
+        return rng.normal(values, self._sigma_factor * delta)
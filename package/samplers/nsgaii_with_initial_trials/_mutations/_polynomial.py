@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import numpy as np
 from numpy import ndarray
 from numpy.random import RandomState
 
@@ -26,3 +27,16 @@ class PolynomialMutation(BaseMutation):
             child_param = value + delta_r * (ub - value)
 
         return child_param
+
+    def batch_mutation(
+        self, values: ndarray, rng: RandomState, search_space_bounds: ndarray
+    ) -> ndarray:
+        u = rng.rand(len(values))
+        lb = search_space_bounds[:, 0]
+        ub = search_space_bounds[:, 1]
+
+        delta_l = (2.0 * np.minimum(u, 0.5)) ** (1.0 / (self._eta + 1.0)) - 1.0
+        delta_r = 1.0 - (2.0 * (1.0 - np.maximum(u, 0.5))) ** (1.0 / (self._eta + 1.0))
+        return np.where(
+            u <= 0.5, values + delta_l * (values - lb), values + delta_r * (ub - values)
+        )
@@ -10,3 +10,9 @@ class UniformMutation(BaseMutation):
     def mutation(self, value: float, rng: RandomState, search_space_bonds: ndarray) -> float:
         delta = search_space_bonds[1] - search_space_bonds[0]
         return delta * rng.rand() + search_space_bonds[0]
+
+    def batch_mutation(
+        self, values: ndarray, rng: RandomState, search_space_bounds: ndarray
+    ) -> ndarray:
+        delta = search_space_bounds[:, 1] - search_space_bounds[:, 0]
+        return delta * rng.rand(len(values)) + search_space_bounds[:, 0]
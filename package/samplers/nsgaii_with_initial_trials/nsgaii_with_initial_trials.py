@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-from collections import defaultdict
 from collections.abc import Callable
 from collections.abc import Sequence
-import hashlib
+import os
+import threading
+import types
 from typing import Any
 from typing import TYPE_CHECKING
+import weakref
 
-import optuna
 from optuna.distributions import BaseDistribution
 from optuna.samplers import NSGAIISampler
 from optuna.samplers._lazy_random_state import LazyRandomState
@@ -15,6 +16,7 @@ from optuna.samplers.nsgaii._crossovers._base import BaseCrossover
 from optuna.samplers.nsgaii._crossovers._uniform import UniformCrossover
 from optuna.trial import FrozenTrial
 from optuna.trial import TrialState
+import optunahub
 
 from ._child_generation_strategy import NSGAIIwITChildGenerationStrategy
 from ._mutations._base import BaseMutation
@@ -25,6 +27,18 @@ if TYPE_CHECKING:
     from optuna.study import Study
 
 
+def _load_simple() -> types.ModuleType:
+    # ``samplers/simple`` provides ``GenerationIndex``. It is loaded from the registry this package
+    # is loaded from if it is there, e.g., in a clone of the registry.
+    registry_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if os.path.isfile(os.path.join(registry_root, "samplers", "simple", "__init__.py")):
+        return optunahub.load_local_module("samplers/simple", registry_root=registry_root)
+    return optunahub.load_module("samplers/simple")
+
+
+GenerationIndex = _load_simple().GenerationIndex
+
+
 # Define key names of `Trial.system_attrs`.
 _GENERATION_KEY = "nsga2wit:generation"
 _POPULATION_CACHE_KEY_PREFIX = "nsga2wit:population"
@@ -55,6 +69,15 @@ class NSGAIIwITSampler(NSGAIISampler):
         if crossover is None:
             crossover = UniformCrossover(swapping_prob)
 
+        child_generation_strategy = NSGAIIwITChildGenerationStrategy(
+            mutation=mutation,
+            mutation_prob=mutation_prob,
+            crossover=crossover,
+            crossover_prob=crossover_prob,
+            swapping_prob=swapping_prob,
+            constraints_func=constraints_func,
+            rng=LazyRandomState(seed),
+        )
         super().__init__(
             population_size=population_size,
             mutation_prob=mutation_prob,
@@ -64,17 +87,34 @@ class NSGAIIwITSampler(NSGAIISampler):
             seed=seed,
             constraints_func=constraints_func,
             elite_population_selection_strategy=elite_population_selection_strategy,
-            child_generation_strategy=NSGAIIwITChildGenerationStrategy(
-                mutation=mutation,
-                mutation_prob=mutation_prob,
-                crossover=crossover,
-                crossover_prob=crossover_prob,
-                swapping_prob=swapping_prob,
-                constraints_func=constraints_func,
-                rng=LazyRandomState(seed),
-            ),
+            child_generation_strategy=child_generation_strategy,
             after_trial_strategy=after_trial_strategy,
         )
+        # The trials sampled before this sampler is used are included in the first generation.
+        self._generation_index = GenerationIndex(
+            _GENERATION_KEY, _POPULATION_CACHE_KEY_PREFIX, default_generation=0
+        )
+
+        # The children of a generation are generated at once and handed out to the following
+        # trials. The key is the storage and the ID of the study, the generation and the trial
+        # numbers of the parent population, and the search space when they are generated. The
+        # storage is weakly referenced since every study of ``InMemoryStorage`` has the same ID.
+        self._batch_child_generation_strategy = child_generation_strategy
+        self._offspring_queue: list[dict[str, Any]] = []
+        self._offspring_key: (
+            tuple[weakref.ref, int, int, list[int], dict[str, BaseDistribution]] | None
+        ) = None
+        self._offspring_lock = threading.Lock()
+
+    def __getstate__(self) -> dict[Any, Any]:
+        state = self.__dict__.copy()
+        del state["_offspring_lock"]
+        state["_offspring_key"] = None
+        return state
+
+    def __setstate__(self, state: dict[Any, Any]) -> None:
+        self.__dict__.update(state)
+        self._offspring_lock = threading.Lock()
 
     def sample_relative(
         self,
@@ -82,7 +122,7 @@ class NSGAIIwITSampler(NSGAIISampler):
         trial: FrozenTrial,
         search_space: dict[str, BaseDistribution],
     ) -> dict[str, Any]:
-        parent_generation, parent_population = self._collect_parent_population(study)
+        parent_generation, parent_population = self._collect_parent_population(study, trial)
 
         generation = parent_generation + 1
         study._storage.set_trial_system_attr(trial._trial_id, _GENERATION_KEY, generation)
@@ -90,58 +130,29 @@ class NSGAIIwITSampler(NSGAIISampler):
         if parent_generation < 0:
             return {}
 
-        return self._child_generation_strategy(study, search_space, parent_population)
-
-    def _collect_parent_population(self, study: Study) -> tuple[int, list[FrozenTrial]]:
-        trials = study._get_trials(deepcopy=False, use_cache=True)
-
-        generation_to_runnings = defaultdict(list)
-        generation_to_population = defaultdict(list)
-        for trial in trials:
-            if _GENERATION_KEY not in trial.system_attrs:
-                generation = 0
-            else:
-                generation = trial.system_attrs[_GENERATION_KEY]
-
-            if trial.state != optuna.trial.TrialState.COMPLETE:
-                if trial.state == optuna.trial.TrialState.RUNNING:
-                    generation_to_runnings[generation].append(trial)
-                continue
-
-            generation_to_population[generation].append(trial)
-
-        hasher = hashlib.sha256()
-        parent_population: list[FrozenTrial] = []
-        parent_generation = -1
-        while True:
-            generation = parent_generation + 1
-            population = generation_to_population[generation]
-
-            if len(population) < self._population_size:
-                break
-
-            for trial in generation_to_runnings[generation]:
-                hasher.update(bytes(str(trial.number), "utf-8"))
-
-            cache_key = "{}:{}".format(_POPULATION_CACHE_KEY_PREFIX, hasher.hexdigest())
-            study_system_attrs = study._storage.get_study_system_attrs(study._study_id)
-            cached_generation, cached_population_numbers = study_system_attrs.get(
-                cache_key, (-1, [])
+        with self._offspring_lock:
+            offspring_key = (
+                weakref.ref(study._storage),
+                study._study_id,
+                parent_generation,
+                [t.number for t in parent_population],
+                search_space,
             )
-            if cached_generation >= generation:
-                generation = cached_generation
-                population = [trials[n] for n in cached_population_numbers]
-            else:
-                population.extend(parent_population)
-                population = self._elite_population_selection_strategy(study, population)
-
-                if len(generation_to_runnings[generation]) == 0:
-                    population_numbers = [t.number for t in population]
-                    study._storage.set_study_system_attr(
-                        study._study_id, cache_key, (generation, population_numbers)
-                    )
-
-            parent_generation = generation
-            parent_population = population
-
-        return parent_generation, parent_population
+            if self._offspring_key != offspring_key or len(self._offspring_queue) == 0:
+                self._offspring_queue = self._batch_child_generation_strategy.generate(
+                    study, search_space, parent_population, self._population_size
+                )
+                self._offspring_key = offspring_key
+            return self._offspring_queue.pop(0)
+
+    def _collect_parent_population(
+        self, study: Study, trial: FrozenTrial
+    ) -> tuple[int, list[FrozenTrial]]:
+        # The trial being sampled does not have the generation key yet and would be counted as a
+        # running trial of the first generation, which changes the population cache key.
+        return self._generation_index.collect_parent_population(
+            study,
+            self._population_size,
+            self._elite_population_selection_strategy,
+            sampling_trial_number=trial.number,
+        )
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import optuna
+import optunahub
+import pytest
+
+
+nsgaii = optunahub.load_local_module(
+    package="samplers/nsgaii_with_initial_trials", registry_root="package/"
+)
+
+
+@pytest.mark.parametrize(
+    "mutation",
+    [nsgaii.UniformMutation(), nsgaii.PolynomialMutation(), nsgaii.GaussianMutation()],
+)
+def test_batch_mutation_matches_mutation(mutation: Any) -> None:
+    rng = np.random.RandomState(0)
+    search_space_bounds = np.sort(rng.uniform(-10, 10, size=(20, 2)), axis=1)
+    values = rng.uniform(search_space_bounds[:, 0], search_space_bounds[:, 1])
+
+    rng = np.random.RandomState(1)
+    expected = np.array(
+        [
+            mutation.mutation(value, rng, bounds)
+            for value, bounds in zip(values, search_space_bounds)
+        ]
+    )
+    actual = mutation.batch_mutation(values, np.random.RandomState(1), search_space_bounds)
+    np.testing.assert_allclose(actual, expected)
+
+    # The default implementation of the base class also calls ``mutation`` for each value.
+    actual = nsgaii._mutations._base.BaseMutation.batch_mutation(
+        mutation, values, np.random.RandomState(1), search_space_bounds
+    )
+    np.testing.assert_allclose(actual, expected)
+
+
+@pytest.mark.parametrize(
+    "mutation",
+    [nsgaii.UniformMutation(), nsgaii.PolynomialMutation(), nsgaii.GaussianMutation()],
+)
+def test_log_scaled_param_is_mutated_in_log_space(mutation: Any) -> None:
+    population_size = 10
+    sampler = nsgaii.NSGAIIwITSampler(
+        population_size=population_size, mutation=mutation, mutation_prob=1.0, seed=0
+    )
+    study = optuna.create_study(directions=["minimize", "minimize"], sampler=sampler)
+    study.optimize(
+        lambda t: (t.suggest_float("x", 1e-5, 1.0, log=True), t.suggest_float("y", 0, 1)),
+        n_trials=10 * population_size,
+    )
+
+    # Mutating in the linear space and then exponentiating pushes the children to the upper
+    # bound, whereas the log space keeps most of them far from it.
+    xs = np.array([t.params["x"] for t in study.trials[population_size:]])
+    assert np.mean(xs > 0.5) < 0.5
+
+
+def test_reuse_for_another_study() -> None:
+    sampler = nsgaii.NSGAIIwITSampler(population_size=5, seed=0)
+
+    def objective(trial: optuna.Trial) -> tuple[float, float]:
+        x = trial.suggest_float("x", 0, 1)
+        return x, 1 - x
+
+    study = optuna.create_study(directions=["minimize", "minimize"], sampler=sampler)
+    study.optimize(objective, n_trials=30)
+
+    # Every study of ``InMemoryStorage`` has the same ID.
+    other_study = optuna.create_study(directions=["minimize", "minimize"], sampler=sampler)
+    other_study.optimize(objective, n_trials=12)
+    generations = [t.system_attrs["nsga2wit:generation"] for t in other_study.trials]
+    assert generations == [0] * 5 + [1] * 5 + [2] * 2
+
+
+@pytest.mark.parametrize(
+    "crossover", [optuna.samplers.nsgaii.UniformCrossover(), optuna.samplers.nsgaii.SPXCrossover()]
+)
+def test_tournament_candidates_are_different(crossover: Any) -> None:
+    population_size = 4
+    sampler = nsgaii.NSGAIIwITSampler(population_size=population_size, crossover=crossover, seed=0)
+    strategy = sampler._batch_child_generation_strategy
+    select_parents = strategy._select_parents
+    dominates = strategy._dominates
+    n_tournaments = 0
+
+    def _dominates(study: optuna.Study, parent_population: list, candidates: np.ndarray) -> Any:
+        nonlocal n_tournaments
+        n_tournaments += len(candidates)
+        assert np.all(candidates[:, 0] != candidates[:, 1])
+        return dominates(study, parent_population, candidates)
+
+    def _select_parents(*args: Any) -> np.ndarray:
+        parent_ids = select_parents(*args)
+        # The parents of each child are also different.
+        assert all(len(set(ids)) == crossover.n_parents for ids in parent_ids)
+        return parent_ids
+
+    strategy._dominates = _dominates
+    strategy._select_parents = _select_parents
+    study = optuna.create_study(directions=["minimize", "minimize"], sampler=sampler)
+    study.optimize(
+        lambda t: (t.suggest_float("x", 0, 1), t.suggest_float("y", 0, 1)),
+        n_trials=10 * population_size,
+    )
+    assert n_tournaments > 0
+
+
+def test_offspring_are_not_shared_between_studies() -> None:
+    population_size = 5
+    sampler = nsgaii.NSGAIIwITSampler(population_size=population_size, seed=0)
+    strategy = sampler._batch_child_generation_strategy
+    generate = strategy.generate
+    parent_numbers: list[list[int]] = []
+
+    def _generate(
+        study: optuna.Study, search_space: Any, parent_population: list, n_children: int
+    ) -> Any:
+        parent_numbers.append(sorted(t.number for t in parent_population))
+        return generate(study, search_space, parent_population, n_children)
+
+    def objective(trial: optuna.Trial) -> tuple[float, float]:
+        trial.suggest_float("x", 0, 1)
+        return trial.number, -trial.number
+
+    strategy.generate = _generate
+    # The parent populations of both studies have the same trial numbers, and the children of
+    # the first study are still queued when the second study needs them.
+    for _ in range(2):
+        study = optuna.create_study(directions=["minimize", "minimize"], sampler=sampler)
+        study.optimize(objective, n_trials=population_size + 1)
+    assert parent_numbers == [list(range(population_size))] * 2
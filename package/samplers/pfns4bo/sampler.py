@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from collections.abc import Sequence
+import hashlib
+import importlib.metadata
+import inspect
+import os
+import threading
+import types
 from typing import Any
 from typing import cast
 import warnings
 
+from filelock import FileLock
 import numpy as np
 import optuna._gp.search_space as gp_search_space
 from optuna._gp.search_space import sample_normalized_params
@@ -18,6 +26,7 @@ from optuna.study import StudyDirection
 from optuna.trial import FrozenTrial
 from optuna.trial import Trial
 from optuna.trial import TrialState
+import optunahub
 from pfns import bar_distribution
 from pfns import encoders
 from pfns import priors
@@ -28,6 +37,18 @@ from pfns.train import train
 import torch
 
 
+def _load_simple() -> types.ModuleType:
+    # ``samplers/simple`` provides ``TrialCursor``. It is loaded from the registry this package is
+    # loaded from if it is there, e.g., in a clone of the registry.
+    registry_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if os.path.isfile(os.path.join(registry_root, "samplers", "simple", "__init__.py")):
+        return optunahub.load_local_module("samplers/simple", registry_root=registry_root)
+    return optunahub.load_module("samplers/simple")
+
+
+TrialCursor = _load_simple().TrialCursor
+
+
 def get_vanilla_gp_config(device: str) -> dict[str, Any]:
     hps = {
         "outputscale": 1.0,
@@ -139,15 +160,91 @@ def get_heboplus_config(device: str) -> dict[str, Any]:
     return config
 
 
+_PRIOR_CONFIGS: dict[str, Callable[[str], dict[str, Any]]] = {
+    "vanilla gp": get_vanilla_gp_config,
+    "hebo": get_heboplus_config,
+}
+
+_DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "optunahub",
+    "pfns4bo",
+)
+
+
+# The minimum Euclidean distance between the queued candidates in the normalized search space.
+_MIN_CANDIDATE_DISTANCE = 1e-2
+
+
+def _select_diverse_candidates(
+    x_options: torch.Tensor, eis: torch.Tensor, k: int
+) -> list[np.ndarray]:
+    # Candidates are taken in the descending order of the acquisition function values, skipping
+    # those close to the ones already taken, e.g., those converged to the same local optimum.
+    candidates = x_options.detach().cpu().numpy()
+    selected: list[np.ndarray] = []
+    for i in torch.argsort(eis.flatten(), descending=True, stable=True).tolist():
+        if all(np.linalg.norm(candidates[i] - x) >= _MIN_CANDIDATE_DISTANCE for x in selected):
+            selected.append(candidates[i])
+            if len(selected) == k:
+                break
+    return selected
+
+
+def _get_model_cache_key(prior: str, seed: int | None) -> str:
+    # The key depends on the source code of the config function so that a model trained with an
+    # outdated config is never loaded.
+    content = "\n".join(
+        [
+            prior,
+            str(seed),
+            importlib.metadata.version("pfns"),
+            torch.__version__,
+            inspect.getsource(_PRIOR_CONFIGS[prior]),
+        ]
+    )
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def _train_model(prior: str, seed: int | None, device: str) -> torch.nn.Module:
+    with torch.random.fork_rng():
+        if seed is not None:
+            torch.manual_seed(seed)
+        _, _, trained_model, _ = train(**_PRIOR_CONFIGS[prior](device))
+    return trained_model
+
+
+def _load_or_train_model(
+    prior: str, seed: int | None, device: str, cache_dir: str
+) -> torch.nn.Module:
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"{_get_model_cache_key(prior, seed)}.pt")
+
+    # The lock ensures that only one process trains the model while the others wait for it.
+    with FileLock(f"{path}.lock"):
+        if not os.path.exists(path):
+            trained_model = _train_model(prior, seed, device)
+            torch.save(trained_model, f"{path}.tmp")
+            os.replace(f"{path}.tmp", path)
+            return trained_model
+
+    # NOTE: ``map_location`` does not accept device strings with an index such as ``"cpu:0"``,
+    # which is the default device of PFNs, so the model is moved after it is loaded.
+    model = torch.load(path, map_location="cpu", mmap=True, weights_only=False)
+    return model.to(device)
+
+
 class PFNs4BOSampler(BaseSampler):
     """A sampler based on the Prior-data Fitted Networks (PFNs) as the surrogate model.
 
     This sampler is based on the PFNs, which is a neural network-based surrogate model.
 
     .. note::
-        The default prior argument is ``"hebo"``. This trains the PFNs model in the
-        init of the sampler. If you want to use a pre-trained model, you can download
-        the model checkpoint from the following link:
+        The default prior argument is ``"hebo"``. This trains the PFNs model in the init of
+        the sampler, and the trained model is cached in ``cache_dir`` so that other processes
+        and studies with the same prior and seed load it instead of training it again. If you
+        want to use a pre-trained model, you can download the model checkpoint from the
+        following link:
         https://github.com/automl/PFNs4BO/tree/main/pfns4bo/final_models
         and load it using the following code:
 
@@ -173,8 +270,12 @@ class PFNs4BOSampler(BaseSampler):
             If a torch.nn.Module object, it should be a trained model.
         model_path:
             A file path to save the trained model. If None, the model will not be saved.
+        cache_dir:
+            A directory to cache the trained models, which are keyed by ``prior``, ``seed``, and
+            the config of the prior. If None, ``~/.cache/optunahub/pfns4bo`` is used. This is
+            ignored if ``prior`` is a model.
         seed:
-            Seed for random number generator.
+            Seed for random number generator. This is also used for training the model.
         independent_sampler:
             A sampler instance for independent sampling. If None, :class:`~optuna.samplers.RandomSampler`
             is used.
@@ -194,6 +295,11 @@ class PFNs4BOSampler(BaseSampler):
             - ``"ucb"``: Upper confidence bound.
             - ``"ei_or_rand"``: Expected improvement mixed with random sampling.
             - ``"mean"``: Mean of the model.
+        batch_size:
+            The number of candidates proposed by one optimization of the acquisition function.
+            The best ``batch_size`` candidates that are not too close to each other are queued
+            and used for the following trials until a new trial is completed, which discards the
+            queue. This reduces the number of optimizations when the trials run in parallel.
     """
 
     def __init__(
@@ -201,6 +307,7 @@ class PFNs4BOSampler(BaseSampler):
         *,
         prior: str | torch.nn.Module = "hebo",
         model_path: str | None = None,
+        cache_dir: str | None = None,
         seed: int | None = None,
         independent_sampler: BaseSampler | None = None,
         n_startup_trials: int = 10,
@@ -208,11 +315,16 @@ class PFNs4BOSampler(BaseSampler):
         num_candidates: int = 100,
         pre_sample_size: int = 100_000,
         acquisition_function_type: str = "ei",
+        batch_size: int = 1,
     ) -> None:
+        if batch_size < 1:
+            raise ValueError(f"`batch_size` must be positive, but got {batch_size}.")
+
         self._num_grad_steps = num_grad_steps
         self._num_candidates = num_candidates
         self._pre_sample_size = pre_sample_size
         self._acquisition_function_type = acquisition_function_type
+        self._batch_size = batch_size
 
         self._rng = LazyRandomState(seed)
         self._independent_sampler = independent_sampler or RandomSampler(seed=seed)
@@ -221,12 +333,20 @@ class PFNs4BOSampler(BaseSampler):
 
         self._device = utils.default_device
 
+        # The proposed parameters for the following trials and the number of completed trials
+        # and the search space when they are proposed. The cursor only identifies the study
+        # they are proposed for.
+        self._proposal_queue: list[dict[str, Any]] = []
+        self._proposal_key: tuple[int, dict[str, BaseDistribution]] | None = None
+        self._proposal_cursor = TrialCursor()
+        self._proposal_lock = threading.Lock()
+
         if isinstance(prior, torch.nn.Module):
             trained_model = prior
-        elif prior == "vanilla gp":
-            _, _, trained_model, _ = train(**get_vanilla_gp_config(self._device))
-        elif prior == "hebo":
-            _, _, trained_model, _ = train(**get_heboplus_config(self._device))
+        elif prior in _PRIOR_CONFIGS:
+            trained_model = _load_or_train_model(
+                prior, seed, self._device, cache_dir or _DEFAULT_CACHE_DIR
+            )
         else:
             raise ValueError("You should specify `prior` as 'vanilla gp', 'hebo', or a model.")
 
@@ -236,6 +356,15 @@ class PFNs4BOSampler(BaseSampler):
         if model_path is not None:
             torch.save(trained_model, model_path)
 
+    def __getstate__(self) -> dict[Any, Any]:
+        state = self.__dict__.copy()
+        del state["_proposal_lock"]
+        return state
+
+    def __setstate__(self, state: dict[Any, Any]) -> None:
+        self.__dict__.update(state)
+        self._proposal_lock = threading.Lock()
+
     def sample_relative(
         self, study: Study, trial: Trial, search_space: dict[str, BaseDistribution]
     ) -> dict[str, Any]:
@@ -250,6 +379,21 @@ class PFNs4BOSampler(BaseSampler):
         if len(trials) < self._n_startup_trials:
             return {}
 
+        with self._proposal_lock:
+            proposal_key = (len(trials), search_space)
+            if (
+                not self._proposal_cursor.tracks(study, [])
+                or self._proposal_key != proposal_key
+                or len(self._proposal_queue) == 0
+            ):
+                self._proposal_queue = self._propose(study, trials, search_space)
+                self._proposal_key = proposal_key
+                self._proposal_cursor.reset(study)
+            return self._proposal_queue.pop(0)
+
+    def _propose(
+        self, study: Study, trials: list[FrozenTrial], search_space: dict[str, BaseDistribution]
+    ) -> list[dict[str, Any]]:
         (
             internal_search_space,
             normalized_params,
@@ -294,8 +438,10 @@ class PFNs4BOSampler(BaseSampler):
                 acq_function=self._acquisition_function_type,
             )
 
-        normalized_param = x_options[torch.argmax(eis)]
-        return gp_search_space.get_unnormalized_param(search_space, normalized_param)
+        return [
+            gp_search_space.get_unnormalized_param(search_space, normalized_param)
+            for normalized_param in _select_diverse_candidates(x_options, eis, self._batch_size)
+        ]
 
     def infer_relative_search_space(
         self, study: Study, trial: Trial
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import os
+from typing import Any
+
+import optuna
+import optunahub
+import pytest
+import torch
+
+
+pytest.importorskip("pfns")
+
+
+pfns4bo = optunahub.load_local_module(package="samplers/pfns4bo", registry_root="package/")
+
+
+def _fake_model() -> torch.nn.Module:
+    return torch.nn.Linear(2, 1)
+
+
+def _assert_same_model(a: torch.nn.Module, b: torch.nn.Module) -> None:
+    assert a.state_dict().keys() == b.state_dict().keys()
+    for name, param in a.state_dict().items():
+        assert torch.equal(param, b.state_dict()[name])
+
+
+def test_model_is_trained_once_and_saved_atomically(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Any
+) -> None:
+    n_trains = 0
+
+    def _train_model(prior: str, seed: int | None, device: str) -> torch.nn.Module:
+        nonlocal n_trains
+        n_trains += 1
+        return _fake_model()
+
+    saved_paths: list[str] = []
+    save = torch.save
+
+    def _save(obj: Any, f: str, *args: Any, **kwargs: Any) -> None:
+        saved_paths.append(f)
+        save(obj, f, *args, **kwargs)
+
+    monkeypatch.setattr(pfns4bo.sampler, "_train_model", _train_model)
+    monkeypatch.setattr(torch, "save", _save)
+
+    pfns4bo.PFNs4BOSampler(prior="vanilla gp", cache_dir=str(tmp_path), seed=0)
+    assert n_trains == 1
+
+    path = os.path.join(tmp_path, f"{pfns4bo.sampler._get_model_cache_key('vanilla gp', 0)}.pt")
+    assert os.path.exists(path)
+    # The model is written to a temporary file first and moved to the cache path.
+    assert saved_paths == [f"{path}.tmp"]
+    assert not os.path.exists(f"{path}.tmp")
+
+
+def test_cached_model_is_loaded(monkeypatch: pytest.MonkeyPatch, tmp_path: Any) -> None:
+    monkeypatch.setattr(pfns4bo.sampler, "_train_model", lambda *args: _fake_model())
+    model = pfns4bo.PFNs4BOSampler(prior="vanilla gp", cache_dir=str(tmp_path))._model
+
+    def _train_model(prior: str, seed: int | None, device: str) -> torch.nn.Module:
+        raise AssertionError("The cached model must be loaded instead.")
+
+    monkeypatch.setattr(pfns4bo.sampler, "_train_model", _train_model)
+    sampler = pfns4bo.PFNs4BOSampler(prior="vanilla gp", cache_dir=str(tmp_path))
+    _assert_same_model(sampler._model, model)
+
+    # A different seed does not hit the cache.
+    with pytest.raises(AssertionError):
+        pfns4bo.PFNs4BOSampler(prior="vanilla gp", cache_dir=str(tmp_path), seed=1)
+
+
+def test_model_path(monkeypatch: pytest.MonkeyPatch, tmp_path: Any) -> None:
+    monkeypatch.setattr(pfns4bo.sampler, "_train_model", lambda *args: _fake_model())
+
+    model_path = os.path.join(tmp_path, "model.pt")
+    sampler = pfns4bo.PFNs4BOSampler(
+        prior="vanilla gp", model_path=model_path, cache_dir=os.path.join(tmp_path, "cache")
+    )
+    model = sampler._model
+    _assert_same_model(torch.load(model_path, weights_only=False), model)
+
+    # A given model is also saved.
+    model_path = os.path.join(tmp_path, "given_model.pt")
+    model = _fake_model()
+    pfns4bo.PFNs4BOSampler(prior=model, model_path=model_path)
+    _assert_same_model(torch.load(model_path, weights_only=False), model)
+
+
+class _StubAcquisitionOptimizer:
+    def __init__(self, x_options: list[float], eis: list[float]) -> None:
+        self.n_calls = 0
+        self._x_options = torch.tensor(x_options)[:, None]
+        self._eis = torch.tensor(eis)
+
+    def __call__(self, **kwargs: Any) -> tuple[Any, torch.Tensor, torch.Tensor, Any, Any]:
+        self.n_calls += 1
+        return None, self._x_options, self._eis, None, None
+
+
+def _create_study(sampler: optuna.samplers.BaseSampler) -> optuna.Study:
+    study = optuna.create_study(sampler=sampler)
+    for x in [2.0, 8.0]:
+        study.enqueue_trial({"x": x})
+    study.optimize(lambda t: t.suggest_float("x", 0, 10), n_trials=2)
+    return study
+
+
+def _ask_x(study: optuna.Study) -> tuple[optuna.Trial, float]:
+    trial = study.ask()
+    return trial, trial.suggest_float("x", 0, 10)
+
+
+def test_batch_size_one_takes_argmax(monkeypatch: pytest.MonkeyPatch) -> None:
+    optimizer = _StubAcquisitionOptimizer([0.1, 0.9, 0.5], [0.2, 0.7, 0.5])
+    monkeypatch.setattr(pfns4bo.sampler, "optimize_acq_w_lbfgs", optimizer)
+
+    sampler = pfns4bo.PFNs4BOSampler(prior=_fake_model(), n_startup_trials=2)
+    study = _create_study(sampler)
+    for _ in range(2):
+        _, x = _ask_x(study)
+        assert x == pytest.approx(9.0)
+    # Every trial optimizes the acquisition function.
+    assert optimizer.n_calls == 2
+
+
+def test_proposals_are_queued(monkeypatch: pytest.MonkeyPatch) -> None:
+    # The second candidate is skipped since it is too close to the first one.
+    optimizer = _StubAcquisitionOptimizer([0.9, 0.9001, 0.1, 0.5, 0.3], [0.9, 0.8, 0.7, 0.6, 0.1])
+    monkeypatch.setattr(pfns4bo.sampler, "optimize_acq_w_lbfgs", optimizer)
+
+    sampler = pfns4bo.PFNs4BOSampler(prior=_fake_model(), n_startup_trials=2, batch_size=3)
+    study = _create_study(sampler)
+    trials_and_xs = [_ask_x(study) for _ in range(3)]
+    assert [x for _, x in trials_and_xs] == pytest.approx([9.0, 1.0, 5.0])
+    assert optimizer.n_calls == 1
+
+    # The queue is proposed again once it becomes empty.
+    _ask_x(study)
+    assert optimizer.n_calls == 2
+
+    # A completed trial discards the rest of the queue.
+    study.tell(trials_and_xs[0][0], 0.0)
+    _, x = _ask_x(study)
+    assert x == pytest.approx(9.0)
+    assert optimizer.n_calls == 3
+
+
+def test_proposals_are_not_reused_for_another_study(monkeypatch: pytest.MonkeyPatch) -> None:
+    optimizer = _StubAcquisitionOptimizer([0.9, 0.1, 0.5], [0.9, 0.7, 0.6])
+    monkeypatch.setattr(pfns4bo.sampler, "optimize_acq_w_lbfgs", optimizer)
+
+    sampler = pfns4bo.PFNs4BOSampler(prior=_fake_model(), n_startup_trials=2, batch_size=3)
+    _ask_x(_create_study(sampler))
+    assert optimizer.n_calls == 1
+
+    # Every study of ``InMemoryStorage`` has the same study ID.
+    _, x = _ask_x(_create_study(sampler))
+    assert x == pytest.approx(9.0)
+    assert optimizer.n_calls == 2
+
+
+def test_invalid_batch_size() -> None:
+    with pytest.raises(ValueError):
+        pfns4bo.PFNs4BOSampler(prior=_fake_model(), batch_size=0)
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import base64
+from collections import OrderedDict
 from collections.abc import Callable
 from collections.abc import Sequence
 import copy
+import io
 import math
 import pickle
 from typing import Any
@@ -34,6 +37,8 @@ _logger = logging.get_logger(__name__)
 _EPS = 1e-10
 # The value of system_attrs must be less than 2046 characters on RDBStorage.
 _SYSTEM_ATTR_MAX_LENGTH = 2045
+# The number of restored optimizers kept in memory.
+_OPTIMIZER_CACHE_SIZE = 8
 
 
 class _CmaEsAttrKeys(NamedTuple):
@@ -81,6 +86,7 @@ class RestartCmaEsSampler(BaseSampler):
         self._with_margin = with_margin
         self._lr_adapt = lr_adapt
         self._source_trials = source_trials
+        self._optimizer_cache = _OptimizerCache(_OPTIMIZER_CACHE_SIZE)
 
         if self._restart_strategy:
             warn_experimental_argument("restart_strategy")
@@ -283,10 +289,7 @@ class RestartCmaEsSampler(BaseSampler):
                 )
 
             # Store optimizer.
-            optimizer_str = pickle.dumps(optimizer).hex()
-            optimizer_attrs = self._split_optimizer_str(optimizer_str, n_restarts)
-            for key in optimizer_attrs:
-                study._storage.set_trial_system_attr(trial._trial_id, key, optimizer_attrs[key])
+            self._store_optimizer(study, trial, optimizer, n_restarts)
 
         # Caution: optimizer should update its seed value.
         seed = self._cma_rng.rng.randint(1, 2**16) + trial.number
@@ -376,34 +379,55 @@ class RestartCmaEsSampler(BaseSampler):
             for i in range(len(optimizer_attrs))
         )
 
-    def _split_optimizer_str(self, optimizer_str: str, n_restarts: int = 0) -> dict[str, str]:
-        optimizer_len = len(optimizer_str)
-        attrs = {}
-        for i in range(math.ceil(optimizer_len / _SYSTEM_ATTR_MAX_LENGTH)):
-            start = i * _SYSTEM_ATTR_MAX_LENGTH
-            end = min((i + 1) * _SYSTEM_ATTR_MAX_LENGTH, optimizer_len)
-            attrs["{}:{}".format(self._attr_keys.optimizer(n_restarts), i)] = optimizer_str[
-                start:end
-            ]
-        return attrs
+    def _store_optimizer(
+        self, study: "optuna.Study", trial: FrozenTrial, optimizer: "CmaClass", n_restarts: int
+    ) -> None:
+        # The optimizer is stored once per generation as a compressed binary snapshot of its
+        # state, e.g., the mean vector, the step size, the covariance matrix, and the evolution
+        # paths, which is much smaller than the hex-encoded pickle.
+        snapshot_str = base64.b64encode(_dump_optimizer(optimizer)).decode("ascii")
+        snapshot_key = self._attr_keys.optimizer(n_restarts) + ":snapshot"
+        n_chunks = math.ceil(len(snapshot_str) / _SYSTEM_ATTR_MAX_LENGTH)
+        for i in range(n_chunks):
+            chunk = snapshot_str[i * _SYSTEM_ATTR_MAX_LENGTH : (i + 1) * _SYSTEM_ATTR_MAX_LENGTH]
+            study._storage.set_trial_system_attr(trial._trial_id, f"{snapshot_key}:{i}", chunk)
+        # NOTE: The header is written last so that a snapshot is never read partially.
+        study._storage.set_trial_system_attr(trial._trial_id, snapshot_key, n_chunks)
+        self._optimizer_cache.put((trial._trial_id, n_restarts), copy.deepcopy(optimizer))
 
     def _restore_optimizer(
         self,
         completed_trials: "list[optuna.trial.FrozenTrial]",
         n_restarts: int = 0,
     ) -> "CmaClass" | None:
-        # Restore a previous CMA object.
+        optimizer_key = self._attr_keys.optimizer(n_restarts)
+        snapshot_key = optimizer_key + ":snapshot"
+        legacy_key = optimizer_key + ":0"
+        # Restore a previous CMA object. Only the trial that updated the optimizer has the
+        # snapshot, so the scan stops within about one generation.
         for trial in reversed(completed_trials):
-            optimizer_attrs = {
-                key: value
-                for key, value in trial.system_attrs.items()
-                if key.startswith(self._attr_keys.optimizer(n_restarts))
-            }
-            if len(optimizer_attrs) == 0:
-                continue
-
-            optimizer_str = self._concat_optimizer_attrs(optimizer_attrs, n_restarts)
-            return pickle.loads(bytes.fromhex(optimizer_str))
+            if snapshot_key in trial.system_attrs:
+                cache_key = (trial._trial_id, n_restarts)
+                optimizer = self._optimizer_cache.get(cache_key)
+                if optimizer is None:
+                    snapshot_str = "".join(
+                        trial.system_attrs[f"{snapshot_key}:{i}"]
+                        for i in range(trial.system_attrs[snapshot_key])
+                    )
+                    optimizer = _load_optimizer(base64.b64decode(snapshot_str))
+                    self._optimizer_cache.put(cache_key, optimizer)
+                # The cached optimizer must not be modified by ``tell`` and ``ask``.
+                return copy.deepcopy(optimizer)
+
+            if legacy_key in trial.system_attrs:
+                # Optimizers stored as hex-encoded pickles by the previous versions.
+                optimizer_attrs = {
+                    key: value
+                    for key, value in trial.system_attrs.items()
+                    if key.startswith(optimizer_key) and key[len(optimizer_key) + 1 :].isdigit()
+                }
+                optimizer_str = self._concat_optimizer_attrs(optimizer_attrs, n_restarts)
+                return pickle.loads(bytes.fromhex(optimizer_str))
         return None
 
     def _init_optimizer(
@@ -574,3 +598,83 @@ def _is_compatible_search_space(
 ) -> bool:
     intersection_size = len(set(trans._search_space.keys()).intersection(search_space.keys()))
     return intersection_size == len(trans._search_space) == len(search_space)
+
+
+class _OptimizerCache:
+    """An LRU cache of the optimizers restored from the snapshots in the storage."""
+
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize = maxsize
+        self._optimizers: OrderedDict[tuple[int, int], CmaClass] = OrderedDict()
+
+    def get(self, key: tuple[int, int]) -> "CmaClass" | None:
+        optimizer = self._optimizers.get(key)
+        if optimizer is not None:
+            self._optimizers.move_to_end(key)
+        return optimizer
+
+    def put(self, key: tuple[int, int], optimizer: "CmaClass") -> None:
+        self._optimizers[key] = optimizer
+        self._optimizers.move_to_end(key)
+        while len(self._optimizers) > self._maxsize:
+            self._optimizers.popitem(last=False)
+
+
+def _get_state(obj: Any) -> dict[str, Any]:
+    # NOTE: ``cmaes.CMA`` and ``cmaes.SepCMA`` define ``__getstate__``, which drops ``_rng`` and
+    # compresses the symmetric covariance matrix.
+    getstate = getattr(type(obj), "__getstate__", None)
+    state = dict(getstate(obj) if getstate is not None else obj.__dict__)
+    state.pop("_rng", None)
+    return state
+
+
+def _flatten_state(obj: Any, prefix: str, arrays: dict[str, np.ndarray]) -> None:
+    arrays[prefix + "__class__"] = np.array(type(obj).__name__)
+    none_keys = []
+    for key, value in _get_state(obj).items():
+        if value is None:
+            none_keys.append(key)
+        elif isinstance(value, (cmaes.CMA, cmaes.SepCMA)):
+            # ``cmaes.CMAwM`` wraps ``cmaes.CMA``.
+            _flatten_state(value, f"{prefix}{key}/", arrays)
+        else:
+            arrays[prefix + key] = np.asarray(value)
+    arrays[prefix + "__none__"] = np.array(none_keys, dtype=str)
+
+
+def _unflatten_state(arrays: dict[str, np.ndarray], prefix: str) -> Any:
+    cls = getattr(cmaes, str(arrays[prefix + "__class__"]))
+    state: dict[str, Any] = {key: None for key in arrays[prefix + "__none__"].tolist()}
+    nested_keys = set()
+    for name, value in arrays.items():
+        if not name.startswith(prefix) or name.endswith(("__class__", "__none__")):
+            continue
+        key = name[len(prefix) :]
+        if "/" in key:
+            nested_keys.add(key.split("/")[0])
+        else:
+            state[key] = value.item() if value.ndim == 0 else value
+    for key in nested_keys:
+        state[key] = _unflatten_state(arrays, f"{prefix}{key}/")
+
+    obj = cls.__new__(cls)
+    if "__setstate__" in vars(cls):
+        obj.__setstate__(state)
+    else:
+        obj.__dict__.update(state)
+    return obj
+
+
+def _dump_optimizer(optimizer: "CmaClass") -> bytes:
+    arrays: dict[str, np.ndarray] = {}
+    _flatten_state(optimizer, "", arrays)
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **arrays)  # type: ignore[arg-type]
+    return buffer.getvalue()
+
+
+def _load_optimizer(data: bytes) -> "CmaClass":
+    with np.load(io.BytesIO(data), allow_pickle=False) as npz:
+        arrays = {key: npz[key] for key in npz.files}
+    return _unflatten_state(arrays, "")
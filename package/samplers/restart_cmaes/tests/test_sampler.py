@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import math
+import pickle
+from typing import Any
+
+import cmaes
+import numpy as np
+import optuna
+import optunahub
+import pytest
+
+
+restart_cmaes = optunahub.load_local_module(
+    package="samplers/restart_cmaes", registry_root="package/"
+)
+
+
+def _objective(trial: optuna.Trial) -> float:
+    x = trial.suggest_float("x", -5, 5)
+    y = trial.suggest_int("y", -5, 5)
+    z = trial.suggest_float("z", 1e-3, 1, log=True)
+    return x**2 + (y - 1) ** 2 + np.log(z) ** 2
+
+
+def _assert_same_state(a: Any, b: Any) -> None:
+    assert type(a) is type(b)
+    state = restart_cmaes.restart_cmaes._get_state(a)
+    other_state = restart_cmaes.restart_cmaes._get_state(b)
+    assert state.keys() == other_state.keys()
+    for key, value in state.items():
+        if isinstance(value, (cmaes.CMA, cmaes.SepCMA)):
+            _assert_same_state(value, other_state[key])
+        else:
+            np.testing.assert_equal(other_state[key], value)
+
+
+def _assert_same_optimizer(a: Any, b: Any) -> None:
+    # NOTE: ``cmaes.CMA`` compresses the covariance matrix to its upper triangle on pickling,
+    # so that the optimizer is compared with its pickled copy to be exact.
+    b = pickle.loads(pickle.dumps(b))
+    _assert_same_state(a, b)
+    # The restored optimizers also sample the same solutions for the same seed.
+    a._rng.seed(1)
+    b._rng.seed(1)
+    for _ in range(3):
+        np.testing.assert_equal(a.ask(), b.ask())
+
+
+def _create_optimizer(optimizer_cls: type) -> Any:
+    bounds = np.array([[-5.0, 5.0]] * 3)
+    if optimizer_cls is cmaes.CMAwM:
+        steps = np.array([0.0, 1.0, 0.0])
+        optimizer = cmaes.CMAwM(mean=np.zeros(3), sigma=2.0, bounds=bounds, steps=steps, seed=0)
+    else:
+        optimizer = optimizer_cls(mean=np.zeros(3), sigma=2.0, bounds=bounds, seed=0)
+
+    # Proceed a few generations so that the evolution paths and the covariance are updated.
+    for _ in range(3):
+        solutions = []
+        for _ in range(optimizer.population_size):
+            x = optimizer.ask()
+            x_for_tell = x[1] if optimizer_cls is cmaes.CMAwM else x
+            solutions.append((x_for_tell, float(np.sum(x_for_tell**2))))
+        optimizer.tell(solutions)
+    return optimizer
+
+
+@pytest.mark.parametrize("optimizer_cls", [cmaes.CMA, cmaes.SepCMA, cmaes.CMAwM])
+def test_dump_and_load_optimizer(optimizer_cls: type) -> None:
+    optimizer = _create_optimizer(optimizer_cls)
+    data = restart_cmaes.restart_cmaes._dump_optimizer(optimizer)
+    _assert_same_optimizer(restart_cmaes.restart_cmaes._load_optimizer(data), optimizer)
+
+
+def _legacy_optimizer_attrs(optimizer_key: str, optimizer: Any) -> dict[str, str]:
+    # The optimizers were stored as hex-encoded pickles by the previous versions.
+    optimizer_str = pickle.dumps(optimizer).hex()
+    chunk_size = restart_cmaes.restart_cmaes._SYSTEM_ATTR_MAX_LENGTH
+    return {
+        f"{optimizer_key}:{i}": optimizer_str[i * chunk_size : (i + 1) * chunk_size]
+        for i in range(math.ceil(len(optimizer_str) / chunk_size))
+    }
+
+
+@pytest.mark.parametrize("restart_strategy", [None, "ipop"])
+def test_restore_legacy_optimizer(restart_strategy: str | None) -> None:
+    sampler = restart_cmaes.RestartCmaEsSampler(seed=0, restart_strategy=restart_strategy)
+    optimizer = _create_optimizer(cmaes.CMA)
+
+    system_attrs: dict[str, Any] = _legacy_optimizer_attrs(
+        sampler._attr_keys.optimizer(0), optimizer
+    )
+    assert len(system_attrs) > 1
+    system_attrs[sampler._attr_keys.generation(0)] = optimizer.generation
+    trial = optuna.trial.create_trial(value=0.0, system_attrs=system_attrs)
+
+    _assert_same_optimizer(sampler._restore_optimizer([trial]), optimizer)
+
+
+def test_continue_legacy_study() -> None:
+    sampler = restart_cmaes.RestartCmaEsSampler(seed=0, popsize=4)
+    study = optuna.create_study(sampler=sampler)
+    study.optimize(_objective, n_trials=10)
+
+    # Copy the study with the snapshots replaced by the hex-encoded pickles.
+    optimizer_key = sampler._attr_keys.optimizer(0)
+    snapshot_key = optimizer_key + ":snapshot"
+    legacy_study = optuna.create_study()
+    for trial in study.trials:
+        system_attrs = {
+            key: value
+            for key, value in trial.system_attrs.items()
+            if not key.startswith(snapshot_key)
+        }
+        if snapshot_key in trial.system_attrs:
+            optimizer = sampler._restore_optimizer([trial])
+            system_attrs.update(_legacy_optimizer_attrs(optimizer_key, optimizer))
+        legacy_study.add_trial(
+            optuna.trial.create_trial(
+                params=trial.params,
+                distributions=trial.distributions,
+                value=trial.value,
+                system_attrs=system_attrs,
+            )
+        )
+    assert not any(snapshot_key in t.system_attrs for t in legacy_study.trials)
+
+    legacy_sampler = restart_cmaes.RestartCmaEsSampler(seed=0, popsize=4)
+    legacy_optimizer = legacy_sampler._restore_optimizer(legacy_study.trials)
+    _assert_same_optimizer(legacy_optimizer, sampler._restore_optimizer(study.trials))
+
+    legacy_study.sampler = legacy_sampler
+    legacy_study.optimize(_objective, n_trials=10)
+    # The next generations are stored as snapshots.
+    optimizer = legacy_sampler._restore_optimizer(legacy_study.trials)
+    assert optimizer.generation > legacy_optimizer.generation
+    assert any(snapshot_key in t.system_attrs for t in legacy_study.trials[10:])
+
+
+def test_optimizer_cache_is_lru() -> None:
+    cache = restart_cmaes.restart_cmaes._OptimizerCache(2)
+    optimizers = [_create_optimizer(cmaes.CMA) for _ in range(3)]
+    cache.put((0, 0), optimizers[0])
+    cache.put((1, 0), optimizers[1])
+    assert cache.get((0, 0)) is optimizers[0]
+
+    # The least recently used optimizer is evicted.
+    cache.put((2, 0), optimizers[2])
+    assert cache.get((1, 0)) is None
+    assert cache.get((0, 0)) is optimizers[0]
+    assert cache.get((2, 0)) is optimizers[2]
+    assert cache.get((0, 1)) is None
+
+
+def test_restore_latest_generation() -> None:
+    sampler = restart_cmaes.RestartCmaEsSampler(seed=0, popsize=4)
+    study = optuna.create_study(sampler=sampler)
+    study.optimize(_objective, n_trials=20)
+
+    snapshot_key = sampler._attr_keys.optimizer(0) + ":snapshot"
+    generation_key = sampler._attr_keys.generation(0)
+    snapshot_trials = [t for t in study.trials if snapshot_key in t.system_attrs]
+    assert len(snapshot_trials) > 2
+
+    # The snapshot of the latest generation is restored even though the older ones are cached.
+    optimizer = sampler._restore_optimizer(study.trials)
+    assert optimizer.generation == study.trials[-1].system_attrs[generation_key]
+    assert optimizer.generation == snapshot_trials[-1].system_attrs[generation_key]
+
+    # The restored optimizer is a copy of the cached one.
+    cache_key = (snapshot_trials[-1]._trial_id, 0)
+    cached_optimizer = sampler._optimizer_cache.get(cache_key)
+    assert optimizer is not cached_optimizer
+    optimizer.tell([(optimizer.ask(), 0.0) for _ in range(optimizer.population_size)])
+    assert cached_optimizer.generation == snapshot_trials[-1].system_attrs[generation_key]
+
+    # The optimizer restored from the storage is the same as the cached one.
+    restored_optimizer = restart_cmaes.RestartCmaEsSampler(seed=0)._restore_optimizer(study.trials)
+    _assert_same_optimizer(restored_optimizer, cached_optimizer)
@@ -10,6 +10,20 @@ from optuna.samplers import RandomSampler
 from optuna.search_space import IntersectionSearchSpace
 from optuna.trial import FrozenTrial
 
+from ._generation_index import GenerationIndex
+from ._observation_cache import ObservationCache
+from ._trial_cursor import TrialCursor
+from ._trial_history import TrialHistory
+
+
+__all__ = [
+    "GenerationIndex",
+    "ObservationCache",
+    "SimpleBaseSampler",
+    "TrialCursor",
+    "TrialHistory",
+]
+
 
 class SimpleBaseSampler(BaseSampler, abc.ABC):
     def __init__(
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import bisect
+from collections.abc import Callable
+import hashlib
+import threading
+from typing import Any
+from typing import TYPE_CHECKING
+
+from optuna.trial import FrozenTrial
+from optuna.trial import TrialState
+
+from ._trial_cursor import TrialCursor
+
+
+if TYPE_CHECKING:
+    from optuna.study import Study
+
+
+class GenerationIndex:
+    """Index of the trials of each generation of a genetic algorithm.
+
+    The numbers of the completed trials of each generation are updated incrementally by
+    :meth:`collect_parent_population`, which reads the trials finished since the previous call
+    from a :class:`TrialCursor`. The index starts over when the cursor does, e.g., when the
+    sampler is reused for another study.
+
+    The parent population of each generation is cached in the study system attrs so that all the
+    workers use the same population, and the cache is mirrored in memory so that the storage is
+    only read when a new generation may have to be selected.
+
+    The last resolved parent population is remembered together with the running trials of the
+    generations up to it, and the next call resumes from there. The generations are replayed from
+    the first one only when these running trials change, e.g., one of them has finished.
+
+    Args:
+        generation_key:
+            The key of the trial system attr that holds the generation of the trial.
+        population_cache_key_prefix:
+            The prefix of the key of the study system attr that holds the cached population.
+        default_generation:
+            The generation of the trials without ``generation_key``. If :obj:`None`, such trials
+            are ignored.
+    """
+
+    def __init__(
+        self,
+        generation_key: str,
+        population_cache_key_prefix: str,
+        default_generation: int | None = None,
+    ) -> None:
+        self._generation_key = generation_key
+        self._population_cache_key_prefix = population_cache_key_prefix
+        self._default_generation = default_generation
+        self._cursor = TrialCursor()
+        self._reset()
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[Any, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[Any, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _reset(self) -> None:
+        # The sorted numbers of the completed trials of each generation.
+        self._generation_to_population: dict[int, list[int]] = {}
+        self._population_cache: dict[str, tuple[int, list[int]]] = {}
+        # The last resolved parent generation, the numbers of its population, the numbers of the
+        # running trials hashed to reach it and those of the running trials of the generations up
+        # to it.
+        self._resolved: tuple[int, list[int], list[int], list[int]] = (-1, [], [], [])
+
+    def _get_generation(self, trial: FrozenTrial) -> int | None:
+        return trial.system_attrs.get(self._generation_key, self._default_generation)
+
+    def _sync(
+        self, study: Study, trials: list[FrozenTrial], sampling_trial_number: int | None
+    ) -> dict[int, list[FrozenTrial]]:
+        finished_trials, restarted = self._cursor.update(study, trials)
+        if restarted:
+            self._reset()
+
+        for trial in finished_trials:
+            generation = self._get_generation(trial)
+            if trial.state == TrialState.COMPLETE and generation is not None:
+                bisect.insort(
+                    self._generation_to_population.setdefault(generation, []), trial.number
+                )
+
+        generation_to_runnings: dict[int, list[FrozenTrial]] = {}
+        # The unfinished trial numbers are sorted.
+        for trial in (trials[n] for n in self._cursor.unfinished):
+            generation = self._get_generation(trial)
+            if (
+                trial.state == TrialState.RUNNING
+                and generation is not None
+                and trial.number != sampling_trial_number
+            ):
+                generation_to_runnings.setdefault(generation, []).append(trial)
+        return generation_to_runnings
+
+    @staticmethod
+    def _get_running_numbers(
+        generation_to_runnings: dict[int, list[FrozenTrial]], max_generation: int
+    ) -> list[int]:
+        return [
+            trial.number
+            for generation in sorted(generation_to_runnings)
+            if generation <= max_generation
+            for trial in generation_to_runnings[generation]
+        ]
+
+    def _get_cached_population(
+        self, study: Study, cache_key: str, generation: int
+    ) -> tuple[int, list[int]]:
+        cached = self._population_cache.get(cache_key, (-1, []))
+        if cached[0] < generation:
+            study_system_attrs = study._storage.get_study_system_attrs(study._study_id)
+            if cache_key in study_system_attrs:
+                cached_generation, cached_population_numbers = study_system_attrs[cache_key]
+                cached = (cached_generation, list(cached_population_numbers))
+                self._population_cache[cache_key] = cached
+        return cached
+
+    def collect_parent_population(
+        self,
+        study: Study,
+        population_size: int,
+        elite_population_selection_strategy: Callable[
+            [Study, list[FrozenTrial]], list[FrozenTrial]
+        ],
+        sampling_trial_number: int | None = None,
+    ) -> tuple[int, list[FrozenTrial]]:
+        """Collect the latest parent population.
+
+        Args:
+            study:
+                The study.
+            population_size:
+                The number of completed trials needed to select the next generation.
+            elite_population_selection_strategy:
+                The strategy to select the parent population of the next generation from the
+                trials of the current generation and the parent population.
+            sampling_trial_number:
+                The number of the trial being sampled. It is not counted as a running trial of
+                any generation since its generation is determined by the returned population.
+
+        Returns:
+            The generation and the trials of the parent population.
+        """
+        with self._lock:
+            trials = study._get_trials(deepcopy=False, use_cache=True)
+            generation_to_runnings = self._sync(study, trials, sampling_trial_number)
+
+            parent_generation, parent_population_numbers, hashed_numbers, runnings = self._resolved
+            if runnings != self._get_running_numbers(generation_to_runnings, parent_generation):
+                # The populations of the resolved generations may change, so replay them.
+                parent_generation, parent_population_numbers, hashed_numbers = -1, [], []
+
+            hasher = hashlib.sha256()
+            for number in hashed_numbers:
+                hasher.update(bytes(str(number), "utf-8"))
+            hashed_numbers = hashed_numbers.copy()
+            parent_population = [trials[n] for n in parent_population_numbers]
+            while True:
+                generation = parent_generation + 1
+                population_numbers = self._generation_to_population.get(generation, [])
+
+                if len(population_numbers) < population_size:
+                    break
+
+                for trial in generation_to_runnings.get(generation, []):
+                    hasher.update(bytes(str(trial.number), "utf-8"))
+                    hashed_numbers.append(trial.number)
+
+                cache_key = "{}:{}".format(self._population_cache_key_prefix, hasher.hexdigest())
+                cached_generation, cached_population_numbers = self._get_cached_population(
+                    study, cache_key, generation
+                )
+                if cached_generation >= generation:
+                    generation = cached_generation
+                    population = [trials[n] for n in cached_population_numbers]
+                else:
+                    population = [trials[n] for n in population_numbers]
+                    population.extend(parent_population)
+                    population = elite_population_selection_strategy(study, population)
+
+                    if len(generation_to_runnings.get(generation, [])) == 0:
+                        cached = (generation, [t.number for t in population])
+                        self._population_cache[cache_key] = cached
+                        study._storage.set_study_system_attr(study._study_id, cache_key, cached)
+
+                parent_generation = generation
+                parent_population = population
+
+            self._resolved = (
+                parent_generation,
+                [t.number for t in parent_population],
+                hashed_numbers,
+                self._get_running_numbers(generation_to_runnings, parent_generation),
+            )
+            return parent_generation, parent_population
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+import numpy as np
+from optuna import Study
+from optuna.distributions import BaseDistribution
+from optuna.trial import FrozenTrial
+
+from ._trial_cursor import TrialCursor
+
+
+_INITIAL_CAPACITY = 64
+
+
+class ObservationCache:
+    """Cache of the internal representations of the parameters of finished trials.
+
+    TPE builds Parzen estimators from different subsets of the finished trials, e.g., the below
+    and above trials, every time it samples, and converting the parameters of all the trials
+    dominates the sampling time for a long history. This class converts the parameters of each
+    trial only once and stores them in growable arrays indexed by trial numbers, so that the
+    observations of any subset are gathered by array indexing.
+
+    Only the conversion is cached. The Parzen estimators themselves are built from the gathered
+    observations on every call, since their kernels depend on the whole subset.
+
+    The cache is cleared when a different study is given, e.g., another study of the same
+    :class:`~optuna.storages.InMemoryStorage`, which has the same study ID.
+    """
+
+    def __init__(self) -> None:
+        # The cursor only identifies the study, since the trials are given by the caller.
+        self._cursor = TrialCursor()
+        self._lock = threading.Lock()
+        self._reset()
+
+    def __getstate__(self) -> dict[Any, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[Any, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _reset(self) -> None:
+        self._capacity = _INITIAL_CAPACITY
+        # NaN represents that the parameter is not in the trial.
+        self._values: dict[str, np.ndarray] = {}
+        self._is_cached: dict[str, np.ndarray] = {}
+
+    def get(
+        self, study: Study, trials: list[FrozenTrial], search_space: dict[str, BaseDistribution]
+    ) -> dict[str, np.ndarray]:
+        """Return the internal representations of the trials that contain all the parameters.
+
+        Args:
+            study:
+                The study of the trials.
+            trials:
+                The finished trials whose parameters are returned.
+            search_space:
+                The search space of the parameters to return.
+
+        Returns:
+            The internal representations of each parameter of the trials that contain all the
+            parameters in ``search_space``, in the order of ``trials``.
+        """
+        with self._lock:
+            if not self._cursor.tracks(study, []):
+                self._cursor.reset(study)
+                self._reset()
+
+            numbers = np.fromiter((t.number for t in trials), dtype=int, count=len(trials))
+            if len(numbers) > 0:
+                self._reserve(int(numbers.max()) + 1)
+
+            observations = {}
+            for param_name in search_space:
+                if param_name not in self._values:
+                    self._values[param_name] = np.full(self._capacity, np.nan)
+                    self._is_cached[param_name] = np.zeros(self._capacity, dtype=bool)
+                values = self._values[param_name]
+                is_cached = self._is_cached[param_name]
+                for index in np.flatnonzero(~is_cached[numbers]):
+                    trial = trials[index]
+                    if param_name in trial.params:
+                        values[trial.number] = trial.distributions[param_name].to_internal_repr(
+                            trial.params[param_name]
+                        )
+                    is_cached[trial.number] = True
+                observations[param_name] = values[numbers]
+
+            contains_all: np.ndarray = np.ones(len(numbers), dtype=bool)
+            for param_values in observations.values():
+                contains_all &= ~np.isnan(param_values)
+            return {
+                param_name: param_values[contains_all]
+                for param_name, param_values in observations.items()
+            }
+
+    def _reserve(self, n_rows: int) -> None:
+        if n_rows <= self._capacity:
+            return
+
+        while self._capacity < n_rows:
+            self._capacity *= 2
+        for param_name in self._values:
+            values = np.full(self._capacity, np.nan)
+            values[: len(self._values[param_name])] = self._values[param_name]
+            self._values[param_name] = values
+            is_cached: np.ndarray = np.zeros(self._capacity, dtype=bool)
+            is_cached[: len(self._is_cached[param_name])] = self._is_cached[param_name]
+            self._is_cached[param_name] = is_cached
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+import itertools
+from typing import Any
+import weakref
+
+from optuna import Study
+from optuna.trial import FrozenTrial
+
+
+class TrialCursor:
+    """Cursor that hands out each finished trial of a study once.
+
+    :meth:`advance` only visits the trials that were unfinished at the previous call and the
+    trials created since then, so that its cost does not depend on the number of trials handed
+    out before, even if a trial stays running, e.g., because its worker died.
+
+    The cursor is bound to one study. A study is identified by its storage object and its ID, since
+    every study of :class:`~optuna.storages.InMemoryStorage` has the same ID. The storage is
+    weakly referenced, so that it cannot be confused with a new storage at the same address, and
+    an unpickled cursor is bound to no study.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def __getstate__(self) -> dict[Any, Any]:
+        state = self.__dict__.copy()
+        state["_storage_ref"] = None
+        return state
+
+    @property
+    def n_visited(self) -> int:
+        """The number of the trials visited so far."""
+        return self._n_visited
+
+    @property
+    def unfinished(self) -> list[int]:
+        """The numbers of the visited trials that were unfinished at the last visit."""
+        return self._unfinished
+
+    def reset(
+        self, study: Study | None = None, n_visited: int = 0, unfinished: Iterable[int] = ()
+    ) -> None:
+        """Bind the cursor to a study.
+
+        Args:
+            study:
+                The study to bind the cursor to. If :obj:`None`, the cursor is bound to no study.
+            n_visited:
+                The number of the trials that are already visited.
+            unfinished:
+                The numbers of the visited trials that are not finished yet.
+        """
+        self._storage_ref: weakref.ref | None = None
+        self._study_id: int | None = None
+        if study is not None:
+            self._storage_ref = weakref.ref(study._storage)
+            self._study_id = study._study_id
+        self._n_visited = n_visited
+        self._unfinished = list(unfinished)
+
+    def tracks(self, study: Study, trials: list[FrozenTrial]) -> bool:
+        """Return whether the cursor is bound to the study and can continue with the trials."""
+        return (
+            self._storage_ref is not None
+            and self._storage_ref() is study._storage
+            and self._study_id == study._study_id
+            and self._n_visited <= len(trials)
+        )
+
+    def visited(self, number: int) -> bool:
+        """Return whether the trial with the number was handed out as a finished trial."""
+        return number < self._n_visited and number not in self._unfinished
+
+    def advance(self, trials: list[FrozenTrial]) -> list[FrozenTrial]:
+        """Return the trials finished since the previous call.
+
+        Args:
+            trials:
+                All the trials of the study ordered by their numbers.
+
+        Returns:
+            The finished trials ordered by their numbers.
+        """
+        finished = []
+        unfinished = []
+        for trial in itertools.chain(
+            (trials[n] for n in self._unfinished), trials[self._n_visited :]
+        ):
+            if trial.state.is_finished():
+                finished.append(trial)
+            else:
+                unfinished.append(trial.number)
+
+        self._n_visited = len(trials)
+        self._unfinished = unfinished
+        return finished
+
+    def update(
+        self, study: Study, trials: list[FrozenTrial] | None = None
+    ) -> tuple[list[FrozenTrial], bool]:
+        """Return the trials of the study finished since the previous call.
+
+        Args:
+            study:
+                The study.
+            trials:
+                All the trials of the study ordered by their numbers. If :obj:`None`, they are
+                read from the study.
+
+        Returns:
+            The finished trials ordered by their numbers, and whether the cursor started over
+            because the study is not the one it was bound to. In the latter case, all the
+            finished trials of the study are returned, and the caller should drop the state
+            built from the trials of the previous study.
+        """
+        if trials is None:
+            trials = study._get_trials(deepcopy=False, use_cache=True)
+        restarted = not self.tracks(study, trials)
+        if restarted:
+            self.reset(study)
+        return self.advance(trials), restarted
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from collections.abc import Container
+import threading
+from typing import Any
+
+import numpy as np
+from optuna import Study
+from optuna.distributions import BaseDistribution
+from optuna.trial import FrozenTrial
+from optuna.trial import TrialState
+
+from ._trial_cursor import TrialCursor
+
+
+_INITIAL_CAPACITY = 64
+
+
+class TrialHistory:
+    """Incremental cache of the parameters and objective values of finished trials.
+
+    Samplers built on ``SimpleBaseSampler`` typically collect all finished trials and rebuild
+    NumPy arrays from ``trial.params`` every time ``sample_relative`` is called. This class keeps
+    preallocated float64 matrices that grow geometrically and only appends the trials finished
+    since the last call to :meth:`update`, so that the cost of each update is proportional to
+    the number of new trials rather than to the total history.
+
+    The rows are ordered by the time the trials are observed by :meth:`update`, which is not
+    necessarily the order of the trial numbers when trials run in parallel. Use
+    :attr:`trial_numbers` if the order matters.
+
+    Args:
+        search_space:
+            The search space of the parameters to cache. Trials that do not contain all the
+            parameters in ``search_space`` with the identical distributions are skipped.
+            Parameters are stored in their internal representations, e.g., indices for
+            categorical parameters.
+        states:
+            Trial states to cache. Objective values of trials without values, e.g., pruned
+            trials, are stored as ``nan``.
+    """
+
+    def __init__(
+        self,
+        search_space: dict[str, BaseDistribution],
+        states: Container[TrialState] = (TrialState.COMPLETE,),
+    ) -> None:
+        self._search_space = search_space
+        self._states = states
+        self._cursor = TrialCursor()
+        self._lock = threading.Lock()
+        self._reset()
+
+    def __getstate__(self) -> dict[Any, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[Any, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _reset(self) -> None:
+        self._n_rows = 0
+        self._params: np.ndarray = np.empty(
+            (_INITIAL_CAPACITY, len(self._search_space)), dtype=np.float64
+        )
+        self._values: np.ndarray | None = None
+        self._trial_numbers: np.ndarray = np.empty(_INITIAL_CAPACITY, dtype=np.int64)
+
+    @property
+    def search_space(self) -> dict[str, BaseDistribution]:
+        return self._search_space
+
+    @property
+    def params(self) -> np.ndarray:
+        """A view of the cached parameters with the shape of ``(n_trials, n_params)``.
+
+        The view is invalidated by the next :meth:`update` and must not be modified.
+        """
+        return self._params[: self._n_rows]
+
+    @property
+    def values(self) -> np.ndarray:
+        """A view of the cached objective values with the shape of ``(n_trials, n_objectives)``.
+
+        The view is invalidated by the next :meth:`update` and must not be modified.
+        """
+        if self._values is None:
+            return np.empty((0, 0), dtype=np.float64)
+        return self._values[: self._n_rows]
+
+    @property
+    def trial_numbers(self) -> np.ndarray:
+        """A view of the trial numbers corresponding to each row."""
+        return self._trial_numbers[: self._n_rows]
+
+    def __len__(self) -> int:
+        return self._n_rows
+
+    def update(self, study: Study) -> int:
+        """Append the trials finished since the last call.
+
+        Args:
+            study:
+                The study to read trials from. If a different study is given, the cache is
+                cleared.
+
+        Returns:
+            The number of appended trials.
+        """
+        with self._lock:
+            finished_trials, restarted = self._cursor.update(study)
+            if restarted:
+                self._reset()
+
+            new_trials = [
+                t for t in finished_trials if t.state in self._states and self._contains(t)
+            ]
+            self._append(new_trials, n_objectives=len(study.directions))
+            return len(new_trials)
+
+    def _contains(self, trial: FrozenTrial) -> bool:
+        return all(
+            name in trial.params and trial.distributions[name] == distribution
+            for name, distribution in self._search_space.items()
+        )
+
+    def _append(self, trials: list[FrozenTrial], n_objectives: int) -> None:
+        if len(trials) == 0:
+            return
+
+        if self._values is None:
+            self._values = np.empty((len(self._params), n_objectives), dtype=np.float64)
+
+        self._reserve(self._n_rows + len(trials))
+        new_rows = slice(self._n_rows, self._n_rows + len(trials))
+        self._params[new_rows] = [
+            [d.to_internal_repr(t.params[name]) for name, d in self._search_space.items()]
+            for t in trials
+        ]
+        self._values[new_rows] = [
+            t.values if t.values is not None else [np.nan] * n_objectives for t in trials
+        ]
+        self._trial_numbers[new_rows] = [t.number for t in trials]
+        self._n_rows += len(trials)
+
+    def _reserve(self, n_rows: int) -> None:
+        capacity = len(self._params)
+        if n_rows <= capacity:
+            return
+
+        while capacity < n_rows:
+            capacity *= 2
+        self._params = _resize(self._params, capacity)
+        self._trial_numbers = _resize(self._trial_numbers, capacity)
+        if self._values is not None:
+            self._values = _resize(self._values, capacity)
+
+
+def _resize(array: np.ndarray, capacity: int) -> np.ndarray:
+    resized = np.empty((capacity,) + array.shape[1:], dtype=array.dtype)
+    resized[: len(array)] = array
+    return resized
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from collections import defaultdict
+import hashlib
+from typing import Any
+
+import numpy as np
+import optuna
+from optuna.study import Study
+from optuna.trial import FrozenTrial
+from optuna.trial import TrialState
+import optunahub
+import pytest
+
+
+GenerationIndex = optunahub.load_local_module(
+    package="samplers/simple", registry_root="package/"
+).GenerationIndex
+
+_GENERATION_KEY = "test:generation"
+_POPULATION_SIZE = 3
+
+
+def _select_elites(study: Study, population: list[FrozenTrial]) -> list[FrozenTrial]:
+    return sorted(population, key=lambda t: (t.values[0], t.number))[:_POPULATION_SIZE]
+
+
+def _collect_parent_population_by_rescan(
+    study: Study, sampling_trial_number: int | None
+) -> tuple[int, list[FrozenTrial]]:
+    # The full rescan of all the trials, which the index replaced.
+    trials = study._get_trials(deepcopy=False, use_cache=True)
+
+    generation_to_runnings = defaultdict(list)
+    generation_to_population = defaultdict(list)
+    for trial in trials:
+        generation = trial.system_attrs.get(_GENERATION_KEY, 0)
+        if trial.state != TrialState.COMPLETE:
+            if trial.state == TrialState.RUNNING and trial.number != sampling_trial_number:
+                generation_to_runnings[generation].append(trial)
+            continue
+        generation_to_population[generation].append(trial)
+
+    hasher = hashlib.sha256()
+    parent_population: list[FrozenTrial] = []
+    parent_generation = -1
+    while True:
+        generation = parent_generation + 1
+        population = generation_to_population[generation]
+        if len(population) < _POPULATION_SIZE:
+            break
+
+        for trial in generation_to_runnings[generation]:
+            hasher.update(bytes(str(trial.number), "utf-8"))
+
+        cache_key = "rescan:{}".format(hasher.hexdigest())
+        study_system_attrs = study._storage.get_study_system_attrs(study._study_id)
+        cached_generation, cached_population_numbers = study_system_attrs.get(cache_key, (-1, []))
+        if cached_generation >= generation:
+            generation = cached_generation
+            population = [trials[n] for n in cached_population_numbers]
+        else:
+            population = _select_elites(study, population + parent_population)
+            if len(generation_to_runnings[generation]) == 0:
+                study._storage.set_study_system_attr(
+                    study._study_id, cache_key, (generation, [t.number for t in population])
+                )
+
+        parent_generation = generation
+        parent_population = population
+
+    return parent_generation, parent_population
+
+
+def _ask(study: Study, index: Any) -> tuple[optuna.Trial, int, list[int]]:
+    trial = study.ask()
+    generation, population = index.collect_parent_population(
+        study, _POPULATION_SIZE, _select_elites, sampling_trial_number=trial.number
+    )
+    expected_generation, expected_population = _collect_parent_population_by_rescan(
+        study, trial.number
+    )
+    assert generation == expected_generation
+    assert [t.number for t in population] == [t.number for t in expected_population]
+
+    study._storage.set_trial_system_attr(trial._trial_id, _GENERATION_KEY, generation + 1)
+    return trial, generation, [t.number for t in population]
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_matches_full_rescan(seed: int) -> None:
+    rng = np.random.RandomState(seed)
+    study = optuna.create_study()
+    index = GenerationIndex(_GENERATION_KEY, "index", 0)
+
+    # The first trial stays running throughout the test.
+    _ask(study, index)
+    running: list[optuna.Trial] = []
+    for _ in range(80):
+        if len(running) == 0 or rng.rand() < 0.5:
+            running.append(_ask(study, index)[0])
+            continue
+
+        # The trials are told in a random order.
+        trial = running.pop(rng.randint(len(running)))
+        if rng.rand() < 0.1:
+            study.tell(trial, state=TrialState.FAIL)
+        else:
+            study.tell(trial, rng.rand())
+
+    assert _ask(study, index)[1] > 2
+
+
+def test_reads_cached_population() -> None:
+    storage = optuna.storages.InMemoryStorage()
+    study = optuna.create_study(storage=storage)
+    index = GenerationIndex(_GENERATION_KEY, "index", 0)
+    for _ in range(3 * _POPULATION_SIZE):
+        trial, _, _ = _ask(study, index)
+        study.tell(trial, trial.number % 4)
+    _, generation, population_numbers = _ask(study, index)
+    assert generation == 2
+
+    def _select_elites_without_cache(
+        study: Study, population: list[FrozenTrial]
+    ) -> list[FrozenTrial]:
+        raise AssertionError("The population must be read from the study system attrs.")
+
+    # Another worker reads the populations cached by the first worker.
+    other_study = optuna.load_study(study_name=study.study_name, storage=storage)
+    other_index = GenerationIndex(_GENERATION_KEY, "index", 0)
+    other_generation, other_population = other_index.collect_parent_population(
+        other_study, _POPULATION_SIZE, _select_elites_without_cache
+    )
+    assert other_generation == generation
+    assert [t.number for t in other_population] == population_numbers
+
+
+def test_reuse_for_another_study() -> None:
+    index = GenerationIndex(_GENERATION_KEY, "index", 0)
+    study = optuna.create_study()
+    for _ in range(4 * _POPULATION_SIZE):
+        trial, _, _ = _ask(study, index)
+        study.tell(trial, trial.number % 4)
+
+    # Every study of ``InMemoryStorage`` has the same ID.
+    other_study = optuna.create_study()
+    for _ in range(2 * _POPULATION_SIZE):
+        trial, _, _ = _ask(other_study, index)
+        other_study.tell(trial, trial.number % 3)
+    assert _ask(other_study, index)[1] == 1
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import pickle
+from typing import Any
+from unittest.mock import patch
+
+import numpy as np
+import optuna
+from optuna.distributions import CategoricalDistribution
+from optuna.distributions import FloatDistribution
+import optunahub
+
+
+ObservationCache = optunahub.load_local_module(
+    package="samplers/simple", registry_root="package/"
+).ObservationCache
+
+search_space = {
+    "x": FloatDistribution(-5, 5),
+    "c": CategoricalDistribution(["a", "b"]),
+}
+
+
+def _create_study(n_trials: int) -> optuna.Study:
+    study = optuna.create_study(sampler=optuna.samplers.RandomSampler(seed=0))
+    for i in range(n_trials):
+        trial = study.ask()
+        trial.suggest_float("x", -5, 5)
+        if i % 3 != 0:
+            # The trials without ``c`` are not observations of the search space.
+            trial.suggest_categorical("c", ["a", "b"])
+        study.tell(trial, float(i))
+    return study
+
+
+def _expected(trials: list[optuna.trial.FrozenTrial]) -> dict[str, np.ndarray]:
+    trials = [t for t in trials if all(name in t.params for name in search_space)]
+    return {
+        name: np.asarray([d.to_internal_repr(t.params[name]) for t in trials])
+        for name, d in search_space.items()
+    }
+
+
+def _assert_observations(actual: dict[str, np.ndarray], expected: dict[str, np.ndarray]) -> None:
+    assert actual.keys() == expected.keys()
+    for name in expected:
+        np.testing.assert_array_equal(actual[name], expected[name])
+
+
+def _count_conversions() -> Any:
+    return patch.object(
+        FloatDistribution,
+        "to_internal_repr",
+        autospec=True,
+        side_effect=lambda self, value: float(value),
+    )
+
+
+def test_get_converts_each_trial_once() -> None:
+    study = _create_study(200)
+    trials = study.get_trials(deepcopy=False)
+    subset = trials[150:] + trials[:20]
+    expected, expected_subset = _expected(trials), _expected(subset)
+    cache = ObservationCache()
+
+    with _count_conversions() as to_internal_repr:
+        observations = cache.get(study, trials, search_space)
+        assert to_internal_repr.call_count == len(trials)
+
+        # Any subset, e.g., in another order, is gathered from the cache.
+        observations_subset = cache.get(study, subset, search_space)
+        assert to_internal_repr.call_count == len(trials)
+
+    _assert_observations(observations, expected)
+    _assert_observations(observations_subset, expected_subset)
+
+
+def test_get_after_new_trials() -> None:
+    study = _create_study(10)
+    cache = ObservationCache()
+    cache.get(study, study.get_trials(deepcopy=False), search_space)
+
+    study = _create_study(100)
+    trials = study.get_trials(deepcopy=False)
+    # The capacity grows for the trials with larger numbers.
+    _assert_observations(cache.get(study, trials, search_space), _expected(trials))
+
+
+def test_reuse_for_another_study() -> None:
+    study = _create_study(10)
+    cache = ObservationCache()
+    cache.get(study, study.get_trials(deepcopy=False), search_space)
+
+    # Every study of ``InMemoryStorage`` has the same ID, and the trials have other parameters.
+    another_study = optuna.create_study()
+    for i in range(10):
+        trial = another_study.ask()
+        trial.suggest_float("x", 0, 1)
+        trial.suggest_categorical("c", ["a", "b"])
+        another_study.tell(trial, float(i))
+    trials = another_study.get_trials(deepcopy=False)
+    _assert_observations(cache.get(another_study, trials, search_space), _expected(trials))
+
+
+def test_pickle() -> None:
+    study = _create_study(10)
+    trials = study.get_trials(deepcopy=False)
+    cache = ObservationCache()
+    cache.get(study, trials, search_space)
+
+    restored = pickle.loads(pickle.dumps(cache))
+    _assert_observations(restored.get(study, trials, search_space), _expected(trials))
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import pickle
+
+import optuna
+from optuna.trial import TrialState
+import optunahub
+
+
+TrialCursor = optunahub.load_local_module(
+    package="samplers/simple", registry_root="package/"
+).TrialCursor
+
+
+def _numbers(trials: list[optuna.trial.FrozenTrial]) -> list[int]:
+    return [t.number for t in trials]
+
+
+def test_update_hands_out_finished_trials_once() -> None:
+    study = optuna.create_study()
+    cursor = TrialCursor()
+    running_trial = study.ask()
+    study.tell(study.ask(), 1.0)
+    study.tell(study.ask(), state=TrialState.FAIL)
+
+    finished_trials, restarted = cursor.update(study)
+    assert _numbers(finished_trials) == [1, 2] and restarted
+    assert cursor.unfinished == [0]
+    assert not cursor.visited(0) and cursor.visited(1)
+
+    assert cursor.update(study) == ([], False)
+    study.tell(study.ask(), 2.0)
+    study.tell(running_trial, 0.0)
+    finished_trials, restarted = cursor.update(study)
+    assert _numbers(finished_trials) == [0, 3] and not restarted
+    assert cursor.unfinished == [] and cursor.n_visited == 4
+
+
+def test_update_restarts_for_another_study() -> None:
+    storage = optuna.storages.InMemoryStorage()
+    study = optuna.create_study(storage=storage)
+    cursor = TrialCursor()
+    for i in range(5):
+        study.tell(study.ask(), float(i))
+    cursor.update(study)
+
+    # Another study object of the same study continues.
+    same_study = optuna.load_study(study_name=study.study_name, storage=storage)
+    same_study.tell(same_study.ask(), 5.0)
+    finished_trials, restarted = cursor.update(same_study)
+    assert _numbers(finished_trials) == [5] and not restarted
+
+    # Every study of ``InMemoryStorage`` has the same ID, so the storages tell the studies apart.
+    for n_trials in [2, 10]:
+        other_study = optuna.create_study()
+        assert other_study._study_id == study._study_id
+        for i in range(n_trials):
+            other_study.tell(other_study.ask(), float(i))
+        finished_trials, restarted = cursor.update(other_study)
+        assert _numbers(finished_trials) == list(range(n_trials)) and restarted
+
+    # Another study in the same storage.
+    other_study = optuna.create_study(storage=storage)
+    other_study.tell(other_study.ask(), 0.0)
+    finished_trials, restarted = cursor.update(other_study)
+    assert _numbers(finished_trials) == [0] and restarted
+
+
+def test_update_restarts_when_trials_are_fewer() -> None:
+    study = optuna.create_study()
+    cursor = TrialCursor()
+    for i in range(5):
+        study.tell(study.ask(), float(i))
+    cursor.update(study)
+
+    trials = study.get_trials(deepcopy=False)[:3]
+    finished_trials, restarted = cursor.update(study, trials)
+    assert _numbers(finished_trials) == [0, 1, 2] and restarted
+
+
+def test_reset_with_visited_trials() -> None:
+    study = optuna.create_study()
+    cursor = TrialCursor()
+    for i in range(5):
+        study.tell(study.ask(), float(i))
+    study.ask()
+
+    cursor.reset(study, n_visited=3, unfinished=[1])
+    trials = study.get_trials(deepcopy=False)
+    assert cursor.tracks(study, trials)
+    assert _numbers(cursor.advance(trials)) == [1, 3, 4]
+    assert cursor.unfinished == [5]
+
+
+def test_unpickled_cursor_restarts() -> None:
+    study = optuna.create_study()
+    cursor = TrialCursor()
+    study.tell(study.ask(), 0.0)
+    cursor.update(study)
+
+    restored_cursor = pickle.loads(pickle.dumps(cursor))
+    finished_trials, restarted = restored_cursor.update(study)
+    assert _numbers(finished_trials) == [0] and restarted
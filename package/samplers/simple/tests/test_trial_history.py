@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import pickle
+
+import numpy as np
+import optuna
+from optuna.distributions import CategoricalDistribution
+from optuna.distributions import FloatDistribution
+from optuna.trial import TrialState
+import optunahub
+
+
+TrialHistory = optunahub.load_local_module(
+    package="samplers/simple", registry_root="package/"
+).TrialHistory
+
+search_space = {
+    "x": FloatDistribution(-5, 5),
+    "c": CategoricalDistribution(["a", "b"]),
+}
+
+
+def _tell(study: optuna.Study, trial: optuna.Trial, value: float) -> None:
+    trial.suggest_float("x", -5, 5)
+    trial.suggest_categorical("c", ["a", "b"])
+    study.tell(trial, value)
+
+
+def test_update_appends_only_new_trials() -> None:
+    study = optuna.create_study()
+    history = TrialHistory(search_space)
+    assert history.update(study) == 0
+    assert history.params.shape == (0, 2)
+
+    for i in range(100):
+        trial = study.ask(search_space)
+        study.tell(trial, i / 100)
+
+    assert history.update(study) == 100
+    assert history.update(study) == 0
+    assert history.params.shape == (100, 2)
+    assert np.all((0 <= history.params[:, 1]) & (history.params[:, 1] <= 1))
+    assert np.array_equal(history.values[:, 0], np.arange(100) / 100)
+    assert np.array_equal(history.trial_numbers, np.arange(100))
+
+
+def test_update_with_running_trials() -> None:
+    study = optuna.create_study()
+    history = TrialHistory(search_space)
+    running_trial = study.ask()
+    _tell(study, study.ask(), 1.0)
+    assert history.update(study) == 1
+
+    _tell(study, study.ask(), 2.0)
+    assert history.update(study) == 1
+    _tell(study, running_trial, 0.0)
+    assert history.update(study) == 1
+    assert history.trial_numbers.tolist() == [1, 2, 0]
+    assert history.values[:, 0].tolist() == [1.0, 2.0, 0.0]
+
+
+def test_update_with_stale_running_trial() -> None:
+    study = optuna.create_study()
+    history = TrialHistory(search_space)
+    study.ask()
+    for i in range(10):
+        _tell(study, study.ask(), float(i))
+        assert history.update(study) == 1
+
+    # Only the running trial is revisited.
+    assert history._cursor.unfinished == [0]
+    assert history.trial_numbers.tolist() == list(range(1, 11))
+
+
+def test_update_skips_trials_out_of_search_space() -> None:
+    study = optuna.create_study()
+    history = TrialHistory(search_space, states=(TrialState.COMPLETE, TrialState.PRUNED))
+    _tell(study, study.ask(), 1.0)
+    trial = study.ask()
+    trial.suggest_float("x", -5, 5)
+    study.tell(trial, 1.0)
+    trial = study.ask()
+    trial.suggest_float("x", -5, 5)
+    trial.suggest_categorical("c", ["a", "b"])
+    study.tell(trial, state=TrialState.PRUNED)
+    study.tell(study.ask(), state=TrialState.FAIL)
+
+    assert history.update(study) == 2
+    assert np.isnan(history.values[1, 0])
+
+
+def test_picklize() -> None:
+    history = TrialHistory(search_space)
+    history.update(optuna.create_study())
+    pickle.loads(pickle.dumps(history))
+
+
+def test_update_with_another_in_memory_study() -> None:
+    history = TrialHistory(search_space)
+    study = optuna.create_study()
+    for i in range(10):
+        _tell(study, study.ask(), float(i))
+    assert history.update(study) == 10
+
+    # Every study of ``InMemoryStorage`` has the same ID.
+    other_study = optuna.create_study()
+    assert other_study._study_id == study._study_id
+    _tell(other_study, other_study.ask(), 100.0)
+    assert history.update(other_study) == 1
+    assert history.values[:, 0].tolist() == [100.0]
@@ -1,23 +1,92 @@
 from __future__ import annotations
 
+import os
+import threading
+import types
 from typing import Any
 
 import numpy as np
 import optuna
+import optunahub
+
+
+def _load_simple() -> types.ModuleType:
+    # ``samplers/simple`` provides ``TrialCursor``. It is loaded from the registry this package is
+    # loaded from if it is there, e.g., in a clone of the registry.
+    registry_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if os.path.isfile(os.path.join(registry_root, "samplers", "simple", "__init__.py")):
+        return optunahub.load_local_module("samplers/simple", registry_root=registry_root)
+    return optunahub.load_module("samplers/simple")
+
+
+TrialCursor = _load_simple().TrialCursor
+
+
+class _Chain:
+    """State of a single annealing chain."""
+
+    def __init__(self, temperature: float) -> None:
+        self.temperature = temperature  # Current temperature.
+        self.params: dict[str, Any] | None = None  # Current state.
+        self.energy = np.inf  # Objective value of the current state, which is minimized.
 
 
 class SimulatedAnnealingSampler(optuna.samplers.BaseSampler):
     """Sampler based on Simulated Annealing algorithm.
 
+    The result of each trial is received in ``after_trial``, where the intersection search space
+    is also narrowed down with the distributions of the trial. Hence, the trials of the study are
+    only read when the sampler is first used for it, e.g., to take in the trials of a previous
+    session.
+
+    When ``n_chains`` is larger than one, the sampler runs multiple annealing chains with
+    different temperatures, i.e., parallel tempering. Trials are assigned to the chains in a
+    round-robin manner based on their trial numbers, so that parallel workers can anneal
+    different chains at the same time. After each transition, the state of the chain is swapped
+    with that of a neighboring chain with the Metropolis acceptance probability.
+
     Args:
-        temperature (int):
-            Temperature for annealing.
+        temperature (float):
+            Temperature for annealing. In the parallel tempering mode, this is the temperature of
+            the coldest chain.
+        n_chains (int):
+            The number of annealing chains.
+        temperature_ratio (float):
+            The ratio of the initial temperatures of two neighboring chains.
+        seed (int | None):
+            Seed for random number generator.
     """
 
-    def __init__(self, temperature: float = 100) -> None:
-        self._rng = np.random.RandomState()
-        self._temperature = temperature  # Current temperature.
-        self._current_trial = None  # Current state.
+    def __init__(
+        self,
+        temperature: float = 100,
+        n_chains: int = 1,
+        temperature_ratio: float = 2.0,
+        seed: int | None = None,
+    ) -> None:
+        if n_chains < 1:
+            raise ValueError(f"`n_chains` must be positive, but got {n_chains}.")
+
+        self._rng = np.random.RandomState(seed)
+        self._chains = [_Chain(temperature * temperature_ratio**k) for k in range(n_chains)]
+        self._independent_sampler = optuna.samplers.RandomSampler(seed=seed)
+        self._search_space: dict[str, optuna.distributions.BaseDistribution] | None = None
+        # The cursor only identifies the study, since the results are received in ``after_trial``.
+        self._cursor = TrialCursor()
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[Any, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[Any, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def reseed_rng(self) -> None:
+        self._rng.seed()
+        self._independent_sampler.reseed_rng()
 
     def sample_relative(
         self,
@@ -28,45 +97,92 @@ class SimulatedAnnealingSampler(optuna.samplers.BaseSampler):
         if search_space == {}:
             return {}
 
-        # Simulated Annealing algorithm.
-        # 1. Calculate transition probability.
-        prev_trial = study.trials[-2]
-        if self._current_trial is None or prev_trial.value <= self._current_trial.value:
-            probability = 1.0
+        with self._lock:
+            current_params = self._chains[trial.number % len(self._chains)].params
+            if current_params is None:
+                # The chain has not accepted any state yet, so its initial state is sampled by
+                # the independent sampler.
+                return {}
+
+            # Sample parameters from the neighborhood of the current point.
+            # The sampled parameters will be used during the next execution of
+            # the objective function passed to the study.
+            params: dict[str, Any] = {}
+            for param_name, param_distribution in search_space.items():
+                if (
+                    not isinstance(param_distribution, optuna.distributions.FloatDistribution)
+                    or (param_distribution.step is not None and param_distribution.step != 1)
+                    or param_distribution.log
+                ):
+                    msg = (
+                        "Only suggest_float() with `step` `None` or 1.0 and"
+                        " `log` `False` is supported"
+                    )
+                    raise NotImplementedError(msg)
+
+                current_value = current_params[param_name]
+                width = (param_distribution.high - param_distribution.low) * 0.1
+                neighbor_low = max(current_value - width, param_distribution.low)
+                neighbor_high = min(current_value + width, param_distribution.high)
+                params[param_name] = self._rng.uniform(neighbor_low, neighbor_high)
+
+            return params
+
+    def after_trial(
+        self,
+        study: optuna.study.Study,
+        trial: optuna.trial.FrozenTrial,
+        state: optuna.trial.TrialState,
+        values: list[float] | None,
+    ) -> None:
+        if state != optuna.trial.TrialState.COMPLETE or values is None:
+            return
+
+        energy = (
+            values[0] if study.direction == optuna.study.StudyDirection.MINIMIZE else -values[0]
+        )
+        with self._lock:
+            self._update_search_space(study, trial)
+
+            chain_index = trial.number % len(self._chains)
+            chain = self._chains[chain_index]
+
+            # Simulated Annealing algorithm.
+            # 1. Calculate transition probability.
+            if chain.params is None or energy <= chain.energy:
+                probability = 1.0
+            else:
+                probability = np.exp((chain.energy - energy) / chain.temperature)
+            chain.temperature *= 0.9  # Decrease temperature.
+
+            # 2. Transit the current state if the result is accepted.
+            if self._rng.uniform(0, 1) < probability:
+                chain.params = trial.params
+                chain.energy = energy
+
+            # 3. Exchange the states of neighboring chains in the parallel tempering mode.
+            if len(self._chains) > 1:
+                self._swap(chain_index)
+
+    def _swap(self, chain_index: int) -> None:
+        if chain_index == 0:
+            other_index = 1
+        elif chain_index == len(self._chains) - 1:
+            other_index = chain_index - 1
         else:
-            probability = np.exp(
-                (self._current_trial.value - prev_trial.value) / self._temperature
-            )
-        self._temperature *= 0.9  # Decrease temperature.
-
-        # 2. Transit the current state if the previous result is accepted.
-        if self._rng.uniform(0, 1) < probability:
-            self._current_trial = prev_trial
-
-        # 3. Sample parameters from the neighborhood of the current point.
-        # The sampled parameters will be used during the next execution of
-        # the objective function passed to the study.
-        params: dict[str, Any] = {}
-        for param_name, param_distribution in search_space.items():
-            if (
-                not isinstance(param_distribution, optuna.distributions.FloatDistribution)
-                or (param_distribution.step is not None and param_distribution.step != 1)
-                or param_distribution.log
-            ):
-                msg = (
-                    "Only suggest_float() with `step` `None` or 1.0 and"
-                    " `log` `False` is supported"
-                )
-                raise NotImplementedError(msg)
-
-            assert self._current_trial is not None
-            current_value = self._current_trial.params[param_name]
-            width = (param_distribution.high - param_distribution.low) * 0.1
-            neighbor_low = max(current_value - width, param_distribution.low)
-            neighbor_high = min(current_value + width, param_distribution.high)
-            params[param_name] = self._rng.uniform(neighbor_low, neighbor_high)
-
-        return params
+            other_index = chain_index + self._rng.choice([-1, 1])
+
+        chain = self._chains[chain_index]
+        other = self._chains[other_index]
+        if chain.params is None or other.params is None:
+            return
+
+        log_probability = (chain.energy - other.energy) * (
+            1 / chain.temperature - 1 / other.temperature
+        )
+        if np.log(self._rng.uniform(0, 1)) < log_probability:
+            chain.params, other.params = other.params, chain.params
+            chain.energy, other.energy = other.energy, chain.energy
 
     # The rest are unrelated to SA algorithm: boilerplate
     def infer_relative_search_space(
@@ -74,7 +190,32 @@ class SimulatedAnnealingSampler(optuna.samplers.BaseSampler):
         study: optuna.study.Study,
         trial: optuna.trial.FrozenTrial,
     ) -> dict[str, optuna.distributions.BaseDistribution]:
-        return optuna.search_space.intersection_search_space(study.get_trials(deepcopy=False))
+        with self._lock:
+            self._update_search_space(study)
+            return dict(sorted((self._search_space or {}).items()))
+
+    def _update_search_space(
+        self, study: optuna.study.Study, trial: optuna.trial.FrozenTrial | None = None
+    ) -> None:
+        if not self._cursor.tracks(study, []):
+            # Only the first call for each study visits all the trials, e.g., those added by
+            # ``study.add_trials`` or finished in a previous session.
+            trials = study._get_trials(deepcopy=False, states=(optuna.trial.TrialState.COMPLETE,))
+            self._search_space = (
+                optuna.search_space.intersection_search_space(trials) if trials else None
+            )
+            self._cursor.reset(study)
+
+        if trial is None:
+            return
+        if self._search_space is None:
+            self._search_space = dict(trial.distributions)
+        else:
+            self._search_space = {
+                name: distribution
+                for name, distribution in self._search_space.items()
+                if trial.distributions.get(name) == distribution
+            }
 
     def sample_independent(
         self,
@@ -83,5 +224,6 @@ class SimulatedAnnealingSampler(optuna.samplers.BaseSampler):
         param_name: str,
         param_distribution: optuna.distributions.BaseDistribution,
     ) -> Any:
-        independent_sampler = optuna.samplers.RandomSampler()
-        return independent_sampler.sample_independent(study, trial, param_name, param_distribution)
+        return self._independent_sampler.sample_independent(
+            study, trial, param_name, param_distribution
+        )
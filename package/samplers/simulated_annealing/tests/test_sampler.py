@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import optuna
+import optunahub
+import pytest
+
+
+simulated_annealing = optunahub.load_local_module(
+    package="samplers/simulated_annealing", registry_root="package/"
+)
+
+
+class _ReferenceSimulatedAnnealingSampler(optuna.samplers.BaseSampler):
+    # The sampler before the state was tracked in ``after_trial``, with a seeded RNG.
+    def __init__(self, temperature: float, seed: int) -> None:
+        self._rng = np.random.RandomState(seed)
+        self._temperature = temperature
+        self._current_trial: optuna.trial.FrozenTrial | None = None
+
+    def sample_relative(
+        self,
+        study: optuna.study.Study,
+        trial: optuna.trial.FrozenTrial,
+        search_space: dict[str, optuna.distributions.BaseDistribution],
+    ) -> dict[str, Any]:
+        if search_space == {}:
+            return {}
+
+        prev_trial = study.trials[-2]
+        if self._current_trial is None or prev_trial.value <= self._current_trial.value:
+            probability = 1.0
+        else:
+            probability = np.exp(
+                (self._current_trial.value - prev_trial.value) / self._temperature
+            )
+        self._temperature *= 0.9
+
+        if self._rng.uniform(0, 1) < probability:
+            self._current_trial = prev_trial
+
+        params: dict[str, Any] = {}
+        for param_name, param_distribution in search_space.items():
+            assert self._current_trial is not None
+            current_value = self._current_trial.params[param_name]
+            width = (param_distribution.high - param_distribution.low) * 0.1
+            neighbor_low = max(current_value - width, param_distribution.low)
+            neighbor_high = min(current_value + width, param_distribution.high)
+            params[param_name] = self._rng.uniform(neighbor_low, neighbor_high)
+        return params
+
+    def infer_relative_search_space(
+        self, study: optuna.study.Study, trial: optuna.trial.FrozenTrial
+    ) -> dict[str, optuna.distributions.BaseDistribution]:
+        return optuna.search_space.intersection_search_space(study.get_trials(deepcopy=False))
+
+    def sample_independent(
+        self,
+        study: optuna.study.Study,
+        trial: optuna.trial.FrozenTrial,
+        param_name: str,
+        param_distribution: optuna.distributions.BaseDistribution,
+    ) -> Any:
+        raise AssertionError("The first trial is enqueued.")
+
+
+def _objective(trial: optuna.Trial) -> float:
+    x = trial.suggest_float("x", -10, 10)
+    y = trial.suggest_float("y", -10, 10)
+    return x**2 + np.sin(3 * y) * 10 + y**2
+
+
+def _optimize(sampler: optuna.samplers.BaseSampler, n_trials: int) -> optuna.Study:
+    study = optuna.create_study(sampler=sampler)
+    study.enqueue_trial({"x": 8.0, "y": -8.0})
+    study.optimize(_objective, n_trials=n_trials)
+    return study
+
+
+def test_single_chain_matches_reference() -> None:
+    study = _optimize(simulated_annealing.SimulatedAnnealingSampler(temperature=100, seed=0), 200)
+    expected_study = _optimize(_ReferenceSimulatedAnnealingSampler(temperature=100, seed=0), 200)
+    assert [t.params for t in study.trials] == [t.params for t in expected_study.trials]
+
+
+def test_chains_are_assigned_round_robin() -> None:
+    n_chains = 3
+    sampler = simulated_annealing.SimulatedAnnealingSampler(
+        temperature=10, n_chains=n_chains, temperature_ratio=2.0, seed=0
+    )
+    assert [chain.temperature for chain in sampler._chains] == [10.0, 20.0, 40.0]
+
+    study = optuna.create_study(sampler=sampler)
+    for x in [-8.0, 0.0, 8.0]:
+        study.enqueue_trial({"x": x, "y": 0.0})
+    study.optimize(_objective, n_trials=3)
+    assert all(chain.params is not None for chain in sampler._chains)
+
+    # Pin the chain states, and check that each trial moves around the state of its chain.
+    for k, chain in enumerate(sampler._chains):
+        chain.params = {"x": -8.0 + 8.0 * k, "y": 0.0}
+    sampler._swap = lambda chain_index: None  # type: ignore[method-assign]
+    sampler.after_trial = lambda *args: None  # type: ignore[method-assign]
+    study.optimize(_objective, n_trials=30)
+    for trial in study.trials[3:]:
+        current_x = -8.0 + 8.0 * (trial.number % n_chains)
+        assert abs(trial.params["x"] - current_x) <= 2.0
+        assert abs(trial.params["y"]) <= 2.0
+
+
+def test_temperatures_decrease_per_chain() -> None:
+    sampler = simulated_annealing.SimulatedAnnealingSampler(
+        temperature=10, n_chains=2, temperature_ratio=3.0, seed=0
+    )
+    study = optuna.create_study(sampler=sampler)
+    study.optimize(_objective, n_trials=5)
+    assert sampler._chains[0].temperature == pytest.approx(10 * 0.9**3)
+    assert sampler._chains[1].temperature == pytest.approx(30 * 0.9**2)
+
+
+@pytest.mark.parametrize("chain_index, other_index", [(0, 1), (2, 1)])
+def test_swap_with_neighbor(chain_index: int, other_index: int) -> None:
+    sampler = simulated_annealing.SimulatedAnnealingSampler(temperature=1, n_chains=3, seed=0)
+    for k, chain in enumerate(sampler._chains):
+        chain.params = {"x": float(k)}
+        chain.energy = float(k)
+    # A colder chain with a higher energy always swaps with a hotter one.
+    sampler._chains[chain_index].energy = 10.0 if chain_index < other_index else -10.0
+    energy = sampler._chains[chain_index].energy
+
+    sampler._swap(chain_index)
+    assert sampler._chains[other_index].params == {"x": float(chain_index)}
+    assert sampler._chains[other_index].energy == energy
+    assert sampler._chains[chain_index].params == {"x": float(other_index)}
+    assert sampler._chains[chain_index].energy == float(other_index)
+
+
+def test_swap_acceptance_probability() -> None:
+    sampler = simulated_annealing.SimulatedAnnealingSampler(temperature=1, n_chains=2, seed=0)
+    cold, hot = sampler._chains
+    cold.params, cold.energy = {"x": 0.0}, 0.0
+    hot.params, hot.energy = {"x": 1.0}, 2.0
+
+    # The swap is accepted with probability exp((0 - 2) * (1 / 1 - 1 / 2)) = exp(-1).
+    n_swaps = 0
+    n_trials = 10000
+    for _ in range(n_trials):
+        sampler._swap(0)
+        if cold.params == {"x": 1.0}:
+            n_swaps += 1
+            cold.params, hot.params = hot.params, cold.params
+            cold.energy, hot.energy = hot.energy, cold.energy
+        assert (cold.params, cold.energy, hot.params, hot.energy) == (
+            {"x": 0.0},
+            0.0,
+            {"x": 1.0},
+            2.0,
+        )
+    assert n_swaps / n_trials == pytest.approx(np.exp(-1), abs=0.02)
+
+
+def test_swap_skips_empty_chain() -> None:
+    sampler = simulated_annealing.SimulatedAnnealingSampler(temperature=1, n_chains=2, seed=0)
+    sampler._chains[0].params, sampler._chains[0].energy = {"x": 0.0}, 10.0
+    sampler._swap(0)
+    assert sampler._chains[0].params == {"x": 0.0}
+    assert sampler._chains[1].params is None
+
+
+def test_search_space_is_updated_incrementally(monkeypatch: pytest.MonkeyPatch) -> None:
+    sampler = simulated_annealing.SimulatedAnnealingSampler(seed=0)
+    study = optuna.create_study(sampler=sampler)
+    # The trials added before the sampler is used are read once.
+    study.add_trial(
+        optuna.trial.create_trial(
+            params={"x": 0.0, "y": 0.0, "z": 0.0},
+            distributions={
+                "x": optuna.distributions.FloatDistribution(-10, 10),
+                "y": optuna.distributions.FloatDistribution(-10, 10),
+                "z": optuna.distributions.FloatDistribution(-1, 1),
+            },
+            value=0.0,
+        )
+    )
+
+    n_scans = 0
+    intersection_search_space = optuna.search_space.intersection_search_space
+
+    def _intersection_search_space(*args: Any, **kwargs: Any) -> dict:
+        nonlocal n_scans
+        n_scans += 1
+        return intersection_search_space(*args, **kwargs)
+
+    monkeypatch.setattr(
+        optuna.search_space, "intersection_search_space", _intersection_search_space
+    )
+
+    def objective(trial: optuna.Trial) -> float:
+        value = _objective(trial)
+        if trial.number % 3 == 0:
+            value += trial.suggest_float("z", -1, 1)
+        if trial.number == 5:
+            value += trial.suggest_float("y2", -1, 1)
+        return value
+
+    for _ in range(10):
+        trial = study.ask()
+        study.tell(trial, objective(trial))
+        expected = intersection_search_space(study.get_trials(deepcopy=False))
+        assert sampler.infer_relative_search_space(study, study.trials[-1]) == expected
+    assert list(expected) == ["x", "y"]
+    assert n_scans == 1
+
+
+def test_reuse_for_another_study() -> None:
+    sampler = simulated_annealing.SimulatedAnnealingSampler(seed=0)
+    study = optuna.create_study(sampler=sampler)
+    study.optimize(lambda t: t.suggest_float("x", -10, 10) ** 2, n_trials=5)
+
+    # Every study of ``InMemoryStorage`` has the same study ID.
+    another_study = optuna.create_study(sampler=sampler)
+    another_study.optimize(lambda t: t.suggest_float("y", -10, 10) ** 2, n_trials=5)
+    trial = another_study.ask()
+    assert list(sampler.infer_relative_search_space(another_study, trial)) == ["y"]
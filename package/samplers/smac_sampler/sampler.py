@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 from collections.abc import Sequence
+import os
 from pathlib import Path
+import threading
+import types
+from typing import Any
 import warnings
 
 from ConfigSpace import Categorical
@@ -36,6 +40,17 @@ from smac.runhistory.enumerations import StatusType
 from smac.scenario import Scenario
 
 
+def _load_simple() -> types.ModuleType:
+    # ``samplers/simple`` provides ``TrialCursor``. It is loaded from the registry this package is
+    # loaded from if it is there, e.g., in a clone of the registry.
+    registry_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if os.path.isfile(os.path.join(registry_root, "samplers", "simple", "__init__.py")):
+        return optunahub.load_local_module("samplers/simple", registry_root=registry_root)
+    return optunahub.load_module("samplers/simple")
+
+
+TrialCursor = _load_simple().TrialCursor
+
 _SMAC_INSTANCE_KEY = "smac:instance"
 _SMAC_SEED_KEY = "smac:seed"
 
@@ -102,6 +117,17 @@ class SMACSampler(optunahub.samplers.SimpleBaseSampler):
             Output directory path, defaults to "smac3_output".
             The directory in which to save the output.
             The files are saved in `./output_directory/name/seed`.
+        batch_size:
+            The number of configurations reserved per surrogate model fit. SMAC3 suggests
+            ``batch_size`` configurations at once, and they are given to the next trials in this
+            process. Configurations that are reserved but not given to any trial are regarded as
+            running by SMAC3.
+
+    .. note::
+        The trials finished by other workers of the study are read from the storage and told to
+        SMAC3 before each sampling, so that every worker fits its surrogate model to the same
+        runhistory. The surrogate model itself is not shared, i.e., ``n`` workers still fit ``n``
+        models, one per worker. Use ``batch_size`` to reduce the number of fits per worker.
     """
 
     def __init__(
@@ -121,7 +147,11 @@ class SMACSampler(optunahub.samplers.SimpleBaseSampler):
         init_design_n_configs_per_hyperparameter: int = 10,
         init_design_max_ratio: float = 0.25,
         output_directory: str = "smac3_output",
+        batch_size: int = 1,
     ) -> None:
+        if batch_size < 1:
+            raise ValueError(f"`batch_size` must be positive, but got {batch_size}.")
+
         super().__init__(search_space)
         self._cs, self._hp_scale_value = self._convert_to_config_space_design_space(search_space)
         scenario = Scenario(
@@ -148,7 +178,7 @@ class SMACSampler(optunahub.samplers.SimpleBaseSampler):
             max_ratio=init_design_max_ratio,
         )
         config_selector = HyperparameterOptimizationFacade.get_config_selector(
-            scenario=scenario, retrain_after=1
+            scenario=scenario, retrain_after=batch_size
         )
 
         def _dummmy_target_func(config: Configuration, seed: int = 0) -> float:
@@ -165,6 +195,26 @@ class SMACSampler(optunahub.samplers.SimpleBaseSampler):
             overwrite=True,
         )
         self.smac = smac
+        self._batch_size = batch_size
+        self._reserved_trial_infos: list[TrialInfo] = []
+        # The trial infos of the running trials sampled in this process.
+        self._trial_infos: dict[int, TrialInfo] = {}
+
+        # The trials of the other workers that were running at the previous sync are told to
+        # SMAC3 once they complete.
+        self._cursor = TrialCursor()
+        # The trials told to SMAC3 by ``after_trial`` that are not yet visited as finished.
+        self._told: set[int] = set()
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[Any, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[Any, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
 
     def _get_surrogate_model(
         self,
@@ -235,7 +285,13 @@ class SMACSampler(optunahub.samplers.SimpleBaseSampler):
     def sample_relative(
         self, study: Study, trial: FrozenTrial, search_space: dict[str, BaseDistribution]
     ) -> dict[str, float]:
-        trial_info: TrialInfo = self.smac.ask()
+        with self._lock:
+            self._sync_runhistory(study)
+            if len(self._reserved_trial_infos) == 0:
+                self._reserved_trial_infos = [self.smac.ask() for _ in range(self._batch_size)]
+            trial_info = self._reserved_trial_infos.pop(0)
+            self._trial_infos[trial.number] = trial_info
+
         cfg = trial_info.config
         study._storage.set_trial_system_attr(
             trial._trial_id, _SMAC_INSTANCE_KEY, trial_info.instance
@@ -260,6 +316,36 @@ class SMACSampler(optunahub.samplers.SimpleBaseSampler):
         trial: FrozenTrial,
         state: TrialState,
         values: Sequence[float] | None,
+    ) -> None:
+        with self._lock:
+            # NOTE: ``after_trial`` is called before the state of the trial is stored, so that the
+            # trial is not visited as finished yet and must be skipped by ``_sync_runhistory``.
+            self._told.add(trial.number)
+            self._tell(study, trial, state, values, self._trial_infos.pop(trial.number, None))
+
+    def _sync_runhistory(self, study: Study) -> None:
+        """Tell the trials finished by the other workers to SMAC3."""
+        finished_trials, restarted = self._cursor.update(study)
+        if restarted:
+            self._told = set()
+
+        for trial in finished_trials:
+            if trial.number in self._told:
+                self._told.remove(trial.number)
+                continue
+            if (
+                trial.state == TrialState.COMPLETE
+                and trial.params.keys() == self.search_space.keys()
+            ):
+                self._tell(study, trial, trial.state, trial.values, None)
+
+    def _tell(
+        self,
+        study: Study,
+        trial: FrozenTrial,
+        state: TrialState,
+        values: Sequence[float] | None,
+        trial_info: TrialInfo | None,
     ) -> None:
         # Transform the trial info to smac.
         params = trial.params
@@ -286,8 +372,13 @@ class SMACSampler(optunahub.samplers.SimpleBaseSampler):
         trial_value = TrialValue(y, status=status)
 
         cfg = Configuration(configuration_space=self._cs, values=cfg_params)
-        instance = study._storage.get_trial_system_attrs(trial._trial_id).get(_SMAC_INSTANCE_KEY)
-        seed = study._storage.get_trial_system_attrs(trial._trial_id).get(_SMAC_SEED_KEY)
+        if trial_info is None:
+            # The trial was sampled by another worker or before this sampler was created.
+            instance = trial.system_attrs.get(_SMAC_INSTANCE_KEY)
+            seed = trial.system_attrs.get(_SMAC_SEED_KEY)
+        else:
+            instance = trial_info.instance
+            seed = trial_info.seed
         info = TrialInfo(cfg, seed=seed, instance=instance)
         self.smac.tell(info=info, value=trial_value, save=False)
 
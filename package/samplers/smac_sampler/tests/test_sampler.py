@@ -504,3 +504,51 @@ def test_reproducible(
     assert any(
         [study.trials[i].params != study_different_seed.trials[i].params for i in range(15)]
     )
+
+
+def test_batch_size() -> None:
+    search_space = {"x": FloatDistribution(-5, 5), "y": IntDistribution(-5, 5)}
+    sampler = SMACSampler_(search_space, batch_size=3, output_directory="/tmp/smac_output")
+    study = optuna.create_study(sampler=sampler)
+    study.optimize(lambda t: t.suggest_float("x", -5, 5) ** 2 + t.suggest_int("y", -5, 5), 20)
+
+    assert all(t.state == TrialState.COMPLETE for t in study.trials)
+    assert sampler.smac.runhistory.finished == 20
+    # The configurations are reserved three at a time, so one of them has not been used yet.
+    assert sampler.smac.runhistory.running == 1
+
+    with pytest.raises(ValueError):
+        SMACSampler_(search_space, batch_size=0, output_directory="/tmp/smac_output")
+
+
+def test_runhistory_shared_among_workers() -> None:
+    search_space = {"x": FloatDistribution(-5, 5)}
+    storage = optuna.storages.InMemoryStorage()
+    study = optuna.create_study(storage=storage, sampler=SMACSampler(search_space, seed=0))
+    study.optimize(lambda t: t.suggest_float("x", -5, 5) ** 2, n_trials=10)
+
+    # Another worker of the same study observes the trials of the first worker.
+    sampler = SMACSampler(search_space, seed=1)
+    other_study = optuna.load_study(study_name=study.study_name, storage=storage, sampler=sampler)
+    other_study.optimize(lambda t: t.suggest_float("x", -5, 5) ** 2, n_trials=2)
+    assert sampler.smac.runhistory.finished == 12
+
+    # The trials told in ``after_trial`` are not told again.
+    study.optimize(lambda t: t.suggest_float("x", -5, 5) ** 2, n_trials=1)
+    assert study.sampler.smac.runhistory.finished == 13
+
+
+def test_reuse_for_another_study() -> None:
+    search_space = {"x": FloatDistribution(-5, 5)}
+    sampler = SMACSampler(search_space, seed=0)
+    study = optuna.create_study(sampler=sampler)
+    study.optimize(lambda t: t.suggest_float("x", -5, 5) ** 2, n_trials=10)
+
+    # Every study of ``InMemoryStorage`` has the same study ID.
+    another_study = optuna.create_study(sampler=sampler)
+    for x in [-1.0, 0.0, 1.0]:
+        another_study.add_trial(
+            optuna.trial.create_trial(params={"x": x}, distributions=search_space, value=x**2)
+        )
+    another_study.optimize(lambda t: t.suggest_float("x", -5, 5) ** 2, n_trials=1)
+    assert sampler.smac.runhistory.finished == 14
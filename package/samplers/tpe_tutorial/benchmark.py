@@ -0,0 +1,68 @@
+"""Compare the EI threshold computation of ``CustomizableTPESampler`` with a full scan.
+
+The threshold is the minimum loss of the trials that are not in the below trials. The sampler
+keeps the losses in a sorted index, so that each lookup only skips the below trials instead of
+scanning all the trials in the study.
+
+    $ python package/samplers/tpe_tutorial/benchmark.py
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import optuna
+from optuna.distributions import FloatDistribution
+from optuna.trial import TrialState
+import optunahub
+
+
+def _create_study(n_trials: int) -> optuna.Study:
+    sampler = optunahub.load_local_module(
+        package="samplers/tpe_tutorial", registry_root="package/"
+    ).CustomizableTPESampler(seed=0)
+    study = optuna.create_study(sampler=sampler)
+    rng = np.random.RandomState(0)
+    study.add_trials(
+        [
+            optuna.trial.create_trial(
+                params={"x": x}, distributions={"x": FloatDistribution(-5, 5)}, value=x**2
+            )
+            for x in rng.uniform(-5, 5, n_trials)
+        ]
+    )
+    return study
+
+
+def _full_scan(study: optuna.Study, below_trial_numbers: set[int]) -> float:
+    # The implementation before the sorted loss index was introduced.
+    return min(
+        t.value
+        for t in study._get_trials(
+            deepcopy=False, states=(TrialState.COMPLETE, TrialState.PRUNED), use_cache=True
+        )
+        if t.number not in below_trial_numbers
+    )
+
+
+def _sorted_loss_index(study: optuna.Study, below_trial_numbers: set[int]) -> float:
+    return study.sampler._sorted_loss_index.min_loss(study, below_trial_numbers)
+
+
+if __name__ == "__main__":
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    n_trials = 20_000
+    n_repeats = 100
+    study = _create_study(n_trials)
+    below_trials = sorted(study.trials, key=lambda t: t.value)[:25]
+    below_trial_numbers = {t.number for t in below_trials}
+    # The first call builds the index from the existing trials.
+    assert _sorted_loss_index(study, below_trial_numbers) == _full_scan(study, below_trial_numbers)
+
+    for name, func in [("full scan", _full_scan), ("sorted loss index", _sorted_loss_index)]:
+        start = time.perf_counter()
+        for _ in range(n_repeats):
+            func(study, below_trial_numbers)
+        elapsed = (time.perf_counter() - start) / n_repeats
+        print(f"{name:>17}: {elapsed * 1e3:.3f} ms/call with {n_trials} trials")
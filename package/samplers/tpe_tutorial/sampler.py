@@ -1,5 +1,11 @@
 from __future__ import annotations
 
+import bisect
+import os
+import threading
+import types
+from typing import Any
+
 import numpy as np
 from optuna.distributions import BaseDistribution
 from optuna.samplers import TPESampler
@@ -8,6 +14,7 @@ from optuna.study import Study
 from optuna.study import StudyDirection
 from optuna.trial import FrozenTrial
 from optuna.trial import TrialState
+import optunahub
 
 from .components import GammaFunc
 from .components import WeightFunc
@@ -15,6 +22,71 @@ from .parzen_estimator import _CustomizableParzenEstimator
 from .parzen_estimator import _CustomizableParzenEstimatorParameters
 
 
+def _load_simple() -> types.ModuleType:
+    # ``samplers/simple`` provides ``ObservationCache`` and ``TrialCursor``. It is loaded from the
+    # registry this package is loaded from if it is there, e.g., in a clone of the registry.
+    registry_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if os.path.isfile(os.path.join(registry_root, "samplers", "simple", "__init__.py")):
+        return optunahub.load_local_module("samplers/simple", registry_root=registry_root)
+    return optunahub.load_module("samplers/simple")
+
+
+_simple = _load_simple()
+ObservationCache = _simple.ObservationCache
+TrialCursor = _simple.TrialCursor
+
+
+class _SortedLossIndex:
+    """Losses of the finished trials sorted in ascending order.
+
+    Each update inserts the losses of the trials finished since the previous update by bisection.
+    """
+
+    def __init__(self) -> None:
+        self._cursor = TrialCursor()
+        self._lock = threading.Lock()
+        self._reset()
+
+    def __getstate__(self) -> dict[Any, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[Any, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _reset(self) -> None:
+        self._losses: list[float] = []
+        self._trial_numbers: list[int] = []
+
+    def min_loss(self, study: Study, excluded_trial_numbers: set[int]) -> float:
+        """Return the minimum loss of the COMPLETE and PRUNED trials except the given ones."""
+        with self._lock:
+            self._update(study)
+            # The excluded trials are the below trials, which have the smallest losses, so that
+            # only a few entries are skipped.
+            for loss, number in zip(self._losses, self._trial_numbers):
+                if number not in excluded_trial_numbers:
+                    return loss
+            return np.inf
+
+    def _update(self, study: Study) -> None:
+        finished_trials, restarted = self._cursor.update(study)
+        if restarted:
+            self._reset()
+
+        sign = 1 if study.direction == StudyDirection.MINIMIZE else -1
+        for trial in finished_trials:
+            if trial.state not in (TrialState.COMPLETE, TrialState.PRUNED) or trial.value is None:
+                continue
+
+            loss = sign * trial.value
+            index = bisect.bisect_right(self._losses, loss)
+            self._losses.insert(index, loss)
+            self._trial_numbers.insert(index, trial.number)
+
+
 class CustomizableTPESampler(TPESampler):
     def __init__(
         self,
@@ -62,6 +134,8 @@ class CustomizableTPESampler(TPESampler):
             categorical_prior_weight=categorical_prior_weight,
         )
         self._weight_strategy = weight_strategy
+        self._observation_cache = ObservationCache()
+        self._sorted_loss_index = _SortedLossIndex()
 
     def _build_parzen_estimator(
         self,
@@ -72,24 +146,20 @@ class CustomizableTPESampler(TPESampler):
     ) -> _ParzenEstimator:
         use_ei = self._weight_strategy == "EI"
         is_multi_objective = study._is_multi_objective()
-        observations = self._get_internal_repr(trials, search_space)
-        if is_multi_objective and handle_below and not use_ei:
+        if use_ei and is_multi_objective and handle_below:
+            return super()._build_parzen_estimator(study, search_space, trials, handle_below)
+
+        observations = self._observation_cache.get(study, trials, search_space)
+        if not use_ei or not handle_below or is_multi_objective:
+            # NOTE: Multi-objective below trials without EI are also uniformly weighted.
             return self._parzen_estimator_cls(
                 observations, search_space, self._parzen_estimator_parameters
             )
-        if (not use_ei or not handle_below) or (use_ei and is_multi_objective and handle_below):
-            return super()._build_parzen_estimator(study, search_space, trials, handle_below)
 
         # Not multi-objective and EI and below.
         below_trial_numbers = set([t.number for t in trials])
         sign = 1 if study.direction == StudyDirection.MINIMIZE else -1
-        threshold = min(
-            sign * t.value
-            for t in study._get_trials(
-                deepcopy=False, states=(TrialState.COMPLETE, TrialState.PRUNED), use_cache=True
-            )
-            if t.number not in below_trial_numbers
-        )
+        threshold = self._sorted_loss_index.min_loss(study, below_trial_numbers)
         if np.isinf(threshold):
             parzen_estimator_parameters = self._parzen_estimator_parameters
             weights_below = np.ones(len(trials))
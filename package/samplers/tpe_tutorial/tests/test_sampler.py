@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import patch
+
+import numpy as np
+import optuna
+from optuna.distributions import FloatDistribution
+from optuna.distributions import IntDistribution
+from optuna.study import Study
+from optuna.study import StudyDirection
+from optuna.trial import FrozenTrial
+from optuna.trial import TrialState
+import optunahub
+import pytest
+
+
+tpe_tutorial = optunahub.load_local_module(
+    package="samplers/tpe_tutorial", registry_root="package/"
+)
+
+
+def _full_scan(study: Study, below_trial_numbers: set[int]) -> float:
+    # The implementation before the sorted loss index was introduced.
+    sign = 1 if study.direction == StudyDirection.MINIMIZE else -1
+    return min(
+        (
+            sign * t.value
+            for t in study.get_trials(
+                deepcopy=False, states=(TrialState.COMPLETE, TrialState.PRUNED)
+            )
+            if t.number not in below_trial_numbers
+        ),
+        default=np.inf,
+    )
+
+
+def _objective(trial: optuna.Trial) -> float:
+    x = trial.suggest_float("x", -5, 5)
+    y = trial.suggest_int("y", -5, 5)
+    # The rounded values have many ties.
+    value = round(x**2 + y**2, 0)
+    if trial.number % 7 == 3:
+        return float("nan")
+    if trial.number % 4 == 1:
+        trial.report(value - 1.0, step=0)
+        raise optuna.TrialPruned()
+    return value
+
+
+@pytest.mark.parametrize("direction", ["minimize", "maximize"])
+def test_threshold_and_weights_match_full_scan(direction: str) -> None:
+    sampler = tpe_tutorial.CustomizableTPESampler(seed=0, n_startup_trials=5)
+    study = optuna.create_study(direction=direction, sampler=sampler)
+    # A trial left running is ignored.
+    study.ask({"x": optuna.distributions.FloatDistribution(-5, 5)})
+
+    expected_weights: list[np.ndarray] = []
+    weights: list[np.ndarray] = []
+    build_parzen_estimator = sampler._build_parzen_estimator
+    parzen_estimator_cls = sampler._parzen_estimator_cls
+
+    def _build_parzen_estimator(
+        study: Study,
+        search_space: dict[str, Any],
+        trials: list[FrozenTrial],
+        handle_below: bool,
+    ) -> Any:
+        if handle_below:
+            sign = 1 if study.direction == StudyDirection.MINIMIZE else -1
+            threshold = _full_scan(study, {t.number for t in trials})
+            assert threshold == sampler._sorted_loss_index.min_loss(
+                study, {t.number for t in trials}
+            )
+            losses = np.asarray([sign * t.value for t in trials])
+            expected_weights.append(np.maximum(1e-12, threshold - losses))
+        return build_parzen_estimator(study, search_space, trials, handle_below)
+
+    def _parzen_estimator(*args: Any) -> Any:
+        if len(args) == 4:
+            weights.append(args[3])
+        return parzen_estimator_cls(*args)
+
+    sampler._build_parzen_estimator = _build_parzen_estimator
+    sampler._parzen_estimator_cls = _parzen_estimator
+    study.optimize(_objective, n_trials=60)
+
+    states = [t.state for t in study.trials]
+    assert TrialState.PRUNED in states and TrialState.FAIL in states
+    assert len(weights) == len(expected_weights) > 0
+    for w, expected in zip(weights, expected_weights):
+        np.testing.assert_array_equal(w, expected)
+
+
+def test_min_loss_with_ties_and_pruned_trials() -> None:
+    study = optuna.create_study()
+    index = tpe_tutorial.sampler._SortedLossIndex()
+    rng = np.random.RandomState(0)
+    running_trials = []
+    for _ in range(100):
+        if rng.rand() < 0.3:
+            running_trials.append(study.ask())
+        if len(running_trials) > 0 and rng.rand() < 0.5:
+            # The trials finish out of order, and half of them are pruned.
+            trial = running_trials.pop(rng.randint(len(running_trials)))
+            value = float(rng.randint(5))
+            if rng.rand() < 0.5:
+                trial.report(value, step=0)
+                study.tell(trial, state=TrialState.PRUNED)
+            else:
+                study.tell(trial, value)
+
+        completed_trials = study.get_trials(states=(TrialState.COMPLETE, TrialState.PRUNED))
+        sorted_trials = sorted(completed_trials, key=lambda t: (t.value, rng.rand()))
+        # The below trials are the best ones, whose ties are broken arbitrarily.
+        for n_below in [0, len(sorted_trials) // 2, len(sorted_trials)]:
+            below_trial_numbers = {t.number for t in sorted_trials[:n_below]}
+            assert index.min_loss(study, below_trial_numbers) == _full_scan(
+                study, below_trial_numbers
+            )
+
+
+def test_reuse_for_another_study() -> None:
+    sampler = tpe_tutorial.CustomizableTPESampler(seed=0, n_startup_trials=5)
+    study = optuna.create_study(sampler=sampler)
+    study.optimize(_objective, n_trials=30)
+
+    # Every study of ``InMemoryStorage`` has the same ID.
+    another_study = optuna.create_study(sampler=sampler)
+    another_study.optimize(_objective, n_trials=10)
+    assert len(another_study.trials) == 10
+    for below_trial_numbers in [set(), {0, 2}]:
+        assert sampler._sorted_loss_index.min_loss(
+            another_study, below_trial_numbers
+        ) == _full_scan(another_study, below_trial_numbers)
+
+
+@pytest.mark.parametrize("weight_strategy", ["EI", "uniform"])
+def test_observation_cache_hit(weight_strategy: str) -> None:
+    sampler = tpe_tutorial.CustomizableTPESampler(seed=0, weight_strategy=weight_strategy)
+    study = optuna.create_study(sampler=sampler)
+    study.optimize(_objective, n_trials=30)
+    search_space = {"x": FloatDistribution(-5, 5), "y": IntDistribution(-5, 5)}
+    trials = study.get_trials(deepcopy=False, states=(TrialState.COMPLETE, TrialState.PRUNED))
+    expected = tpe_tutorial.sampler.ObservationCache().get(study, trials, search_space)
+
+    with patch.object(
+        FloatDistribution, "to_internal_repr", autospec=True, side_effect=lambda _, v: float(v)
+    ) as to_internal_repr:
+        # Only the last trial is converted, since the others were converted while sampling.
+        mpe = sampler._build_parzen_estimator(study, search_space, trials, handle_below=False)
+        assert to_internal_repr.call_count == 1
+        mpe_hit = sampler._build_parzen_estimator(study, search_space, trials, handle_below=False)
+        assert to_internal_repr.call_count == 1
+
+    samples = {"x": np.linspace(-5, 5, 11), "y": np.arange(-5, 6, dtype=float)}
+    expected_mpe = sampler._parzen_estimator_cls(
+        expected, search_space, sampler._parzen_estimator_parameters
+    )
+    np.testing.assert_array_equal(mpe.log_pdf(samples), expected_mpe.log_pdf(samples))
+    np.testing.assert_array_equal(mpe_hit.log_pdf(samples), expected_mpe.log_pdf(samples))
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import optuna
+import optunahub
+
+
+woa = optunahub.load_local_module(package="samplers/whale_optimization", registry_root="package/")
+
+
+def _objective(trial: optuna.Trial) -> float:
+    x = trial.suggest_float("x", -10, 10)
+    y = trial.suggest_float("y", -10, 10)
+    return x**2 + y**2
+
+
+def test_seed_reproducibility() -> None:
+    params = []
+    for _ in range(2):
+        study = optuna.create_study(
+            sampler=woa.WhaleOptimizationSampler(population_size=5, seed=0)
+        )
+        study.optimize(_objective, n_trials=30)
+        params.append([trial.params for trial in study.trials])
+    assert params[0] == params[1]
+
+    study = optuna.create_study(sampler=woa.WhaleOptimizationSampler(population_size=5, seed=1))
+    study.optimize(_objective, n_trials=30)
+    assert [trial.params for trial in study.trials] != params[0]
+
+
+def test_last_completed_trials_with_running_trials() -> None:
+    sampler = woa.WhaleOptimizationSampler(population_size=3, seed=0)
+    study = optuna.create_study(sampler=sampler)
+    running_trial = study.ask()
+    study.optimize(_objective, n_trials=4)
+    study.tell(study.ask(), state=optuna.trial.TrialState.FAIL)
+    last_trials, n_completed = sampler._get_last_completed_trials(study)
+    assert [t.number for t in last_trials] == [2, 3, 4]
+    assert n_completed == 4
+
+    # A trial that completes late is counted but is older than the last trials.
+    study.tell(running_trial, 1.0)
+    study.optimize(_objective, n_trials=1)
+    last_trials, n_completed = sampler._get_last_completed_trials(study)
+    assert [t.number for t in last_trials] == [3, 4, 6]
+    assert n_completed == 6
+
+
+def test_reuse_for_another_study() -> None:
+    sampler = woa.WhaleOptimizationSampler(population_size=5, seed=0)
+    study = optuna.create_study(sampler=sampler)
+    study.optimize(_objective, n_trials=20)
+
+    # Every study of ``InMemoryStorage`` has the same ID.
+    another_study = optuna.create_study(sampler=sampler)
+    another_study.optimize(_objective, n_trials=3)
+    last_trials, n_completed = sampler._get_last_completed_trials(another_study)
+    assert [t.number for t in last_trials] == [0, 1, 2]
+    assert n_completed == 3
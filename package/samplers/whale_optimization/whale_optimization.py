@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import os
+import types
 from typing import Any
 
 import numpy as np
@@ -7,19 +9,37 @@ import optuna
 import optunahub
 
 
+def _load_simple() -> types.ModuleType:
+    # ``samplers/simple`` provides ``TrialCursor``. It is loaded from the registry this package is
+    # loaded from if it is there, e.g., in a clone of the registry.
+    registry_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if os.path.isfile(os.path.join(registry_root, "samplers", "simple", "__init__.py")):
+        return optunahub.load_local_module("samplers/simple", registry_root=registry_root)
+    return optunahub.load_module("samplers/simple")
+
+
+TrialCursor = _load_simple().TrialCursor
+
+
 class WhaleOptimizationSampler(optunahub.samplers.SimpleBaseSampler):
     def __init__(
         self,
         search_space: dict[str, optuna.distributions.BaseDistribution] | None = None,
         population_size: int = 10,
         max_iter: int = 40,
+        seed: int | None = None,
     ) -> None:
-        super().__init__(search_space)
-        self._rng = np.random.RandomState()
+        super().__init__(search_space, seed)
+        self._rng = np.random.default_rng(seed)
         self.population_size = population_size
         self.max_iter = max_iter
         self.dim = 0
         self.queue: list[dict[str, Any]] = []
+        # The number of completed trials decides the iteration, and the last
+        # ``population_size`` completed trials in the order of their numbers are the population.
+        self._cursor = TrialCursor()
+        self._n_completed = 0
+        self._last_trials: list[optuna.trial.FrozenTrial] = []
 
     def _lazy_init(self, search_space: dict[str, optuna.distributions.BaseDistribution]) -> None:
         assert all(
@@ -31,11 +51,12 @@ class WhaleOptimizationSampler(optunahub.samplers.SimpleBaseSampler):
         self.upper_bound = np.asarray([dist.high for dist in search_space.values()])
         self.dim = len(search_space)
         self.leader_pos = (
-            np.random.rand(self.dim) * (self.upper_bound - self.lower_bound) + self.lower_bound
+            self._rng.random(self.dim) * (self.upper_bound - self.lower_bound) + self.lower_bound
         )
         self.leader_score = np.inf
         self.positions = (
-            np.random.rand(self.population_size, self.dim) * (self.upper_bound - self.lower_bound)
+            self._rng.random((self.population_size, self.dim))
+            * (self.upper_bound - self.lower_bound)
             + self.lower_bound
         )
 
@@ -51,39 +72,42 @@ class WhaleOptimizationSampler(optunahub.samplers.SimpleBaseSampler):
             self._lazy_init(search_space)
         if len(self.queue) != 0:
             return self.queue.pop(0)
-        last_trials = study.get_trials(states=(optuna.trial.TrialState.COMPLETE,))[
-            -self.population_size :
-        ]
-        current_iter = len(study.get_trials(states=(optuna.trial.TrialState.COMPLETE,)))
-        new_positions = np.asarray([list(e.params.values()) for e in last_trials])
+        last_trials, current_iter = self._get_last_completed_trials(study)
+        new_positions = np.asarray([[e.params[k] for k in search_space] for e in last_trials])
         fitnesses = np.asarray([e.value for e in last_trials])
         if current_iter > self.population_size:
             self.tell(new_positions, fitnesses)
         a = 2 - current_iter * (2 / self.max_iter)
         a2 = -1 + current_iter * (-1 / self.max_iter)
-        new_positions = np.zeros_like(self.positions)
-
-        for i in range(self.positions.shape[0]):
-            r1, r2 = np.random.rand(), np.random.rand()
-            A = 2 * a * r1 - a
-            C = 2 * r2
-            b, L = 1, ((a2 - 1) * np.random.rand() + 1)
-            p = np.random.rand()
-
-            if p < 0.5:
-                if np.abs(A) >= 1:
-                    rand_leader_index = np.random.randint(self.population_size)
-                    X_rand = self.positions[rand_leader_index, :]
-                    D_X_rand = np.abs(C * X_rand - self.positions[i, :])
-                    new_positions[i, :] = X_rand - A * D_X_rand
-                else:
-                    D_Leader = np.abs(C * self.leader_pos - self.positions[i, :])
-                    new_positions[i, :] = self.leader_pos - A * D_Leader
-            else:
-                distance2Leader = np.abs(self.leader_pos - self.positions[i, :])
-                new_positions[i, :] = (
-                    distance2Leader * np.exp(b * L) * np.cos(L * 2 * np.pi) + self.leader_pos
-                )
+
+        # The random numbers of all the whales are drawn at once.
+        n = self.positions.shape[0]
+        r1 = self._rng.random(n)
+        r2 = self._rng.random(n)
+        A = (2 * a * r1 - a)[:, np.newaxis]
+        C = (2 * r2)[:, np.newaxis]
+        b, L = 1, ((a2 - 1) * self._rng.random(n) + 1)[:, np.newaxis]
+        p = self._rng.random(n)
+        rand_leader_index = self._rng.integers(self.population_size, size=n)
+
+        # Search for prey around a random whale.
+        X_rand = self.positions[rand_leader_index, :]
+        D_X_rand = np.abs(C * X_rand - self.positions)
+        search_positions = X_rand - A * D_X_rand
+        # Encircle the leader.
+        D_Leader = np.abs(C * self.leader_pos - self.positions)
+        encircle_positions = self.leader_pos - A * D_Leader
+        # Spiral towards the leader.
+        distance2Leader = np.abs(self.leader_pos - self.positions)
+        spiral_positions = (
+            distance2Leader * np.exp(b * L) * np.cos(L * 2 * np.pi) + self.leader_pos
+        )
+
+        new_positions = np.where(
+            (p < 0.5)[:, np.newaxis],
+            np.where(np.abs(A) >= 1, search_positions, encircle_positions),
+            spiral_positions,
+        )
 
         param_list = [
             {k: v for k, v in zip(search_space.keys(), new_pos)} for new_pos in new_positions
@@ -91,6 +115,26 @@ class WhaleOptimizationSampler(optunahub.samplers.SimpleBaseSampler):
         self.queue.extend(param_list)
         return self.queue.pop(0)
 
+    def _get_last_completed_trials(
+        self, study: optuna.study.Study
+    ) -> tuple[list[optuna.trial.FrozenTrial], int]:
+        # Return the last ``population_size`` completed trials and the number of completed trials.
+        finished_trials, restarted = self._cursor.update(study)
+        if restarted:
+            self._n_completed = 0
+            self._last_trials = []
+
+        completed_trials = [
+            t for t in finished_trials if t.state == optuna.trial.TrialState.COMPLETE
+        ]
+        if len(completed_trials) > 0:
+            self._n_completed += len(completed_trials)
+            # A trial may complete after the trials with larger numbers.
+            self._last_trials = sorted(
+                self._last_trials + completed_trials, key=lambda t: t.number
+            )[-self.population_size :]
+        return list(self._last_trials), self._n_completed
+
     def tell(self, new_positions: np.ndarray, fitnesses: np.ndarray) -> None:
         self.positions = np.clip(new_positions, self.lower_bound, self.upper_bound)
         min_index = np.argmin(fitnesses)